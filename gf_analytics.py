@@ -7,9 +7,12 @@
 #
 # Exposes:
 #   init_analytics(window, interval_ms=1500)
+#   refresh_analytics(window)
+#   METRICS / customer_metrics() / pipeline_metrics()   (cached per data version; gf_customers reads these)
 #   increment_warm_generated(n=1)
 #   increment_new_customer(n=1)
 #   log_call(source, outcome, note, company="", prospect="", email="", phone="")
+#   activity_between(start, end) / activity_for_day(d) / activity_for_month(y, m)
 #
 # "Call" definition (current):
 #   Any time a note is saved in either the Dialer tab or the Warm Leads tab.
@@ -18,10 +21,11 @@
 from __future__ import annotations
 
 import csv
+import io
 import json
-from datetime import datetime, date, timezone
+from datetime import datetime, date, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 # --- timezone handling with safe fallbacks ---
 try:
@@ -64,9 +68,15 @@ from gf_store import (
     ORDERS_PATH,
     WARM_LEADS_PATH,
     RESULTS_PATH,          # emails sent log for daily count
+    NO_INTEREST_PATH,
+    DIALER_RESULTS_PATH,
     CUSTOMER_FIELDS,
     WARM_V2_FIELDS,
+    load_results_rows_sorted,
+    sqlite_backend,
 )
+from gf_dates import parse_column, parse_date, parse_datetime
+from gf_watch import subscribe
 
 # ---------- persistent counters (in this file) ----------
 _COUNTERS_PATH = APP_DIR / "analytics_counters.json"
@@ -248,108 +258,221 @@ def _float_to_money(x: str | float) -> str:
 
 def _parse_date(s: str) -> Optional[date]:
     """Loose date-only parser (kept for compatibility)."""
-    if not s:
-        return None
-    s = s.strip()
-    fmts = (
-        "%Y-%m-%d",
-        "%m/%d/%Y",
-        "%m-%d-%Y",
-        "%Y/%m/%d",
-        "%m/%d/%y",
-        "%m-%d-%y",
-        "%Y-%m-%d %H:%M:%S",
-        "%m/%d/%Y %I:%M:%S %p",
-        "%m/%d/%Y %I:%M %p",
-    )
-    for fmt in fmts:
-        try:
-            return datetime.strptime(s, fmt).date()
-        except Exception:
-            pass
-    return None
+    return parse_date(s)
 
 
 def _parse_any_dt_local(s: str | None) -> Optional[datetime]:
     """
     Parse common datetime strings and return an *aware* datetime in local tz.
-    Handles:
+    Handles (via gf_dates):
       • ISO8601 with/without tz  (2025-10-28T09:12:00-04:00, ...Z, or no tz)
       • RFC 2822 (email-style)   (Tue, 28 Oct 2025 09:12:00 -0400)
-      • The looser formats supported by _parse_date
+      • US m/d/Y shapes, with or without time (date-only → local midnight)
     """
-    if not s:
+    return _to_local(parse_datetime(s))
+
+
+def _to_local(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None:
         return None
-    s = s.strip()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_LOCAL_TZ)
+    return dt.astimezone(_LOCAL_TZ)
 
-    # ISO8601 first (fromisoformat handles many shapes)
-    try:
-        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=_LOCAL_TZ)
-        return dt.astimezone(_LOCAL_TZ)
-    except Exception:
-        pass
 
-    # RFC 2822 / email style
-    try:
-        from email.utils import parsedate_to_datetime
-        dt = parsedate_to_datetime(s)
-        if dt is not None:
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=_LOCAL_TZ)
-            return dt.astimezone(_LOCAL_TZ)
-    except Exception:
-        pass
+def _local_days(values: List[str]) -> List[Optional[date]]:
+    """Local calendar day per cell for a whole column (gf_dates.parse_column: one format sniff)."""
+    out = []
+    for dt in parse_column(values):
+        dt = _to_local(dt)
+        out.append(dt.date() if dt else None)
+    return out
+
+
+# ==============================
+# Incremental engine (append-only logs)
+# ==============================
+class _AppendLog:
+    """
+    Tails one append-only CSV. Remembers the byte offset of the last complete
+    record and folds only newly appended rows into running day/month buckets.
+    A shrink or inode change means the file was rewritten -> full rebuild.
+    """
+
+    def __init__(self, path: Path, date_fields: Tuple[str, ...],
+                 amount_field: Optional[str] = None, group_field: Optional[str] = None,
+                 split_field: Optional[str] = None):
+        self.path = path
+        self.date_fields = date_fields
+        self.amount_field = amount_field
+        self.group_field = group_field
+        self.split_field = split_field
+        self._reset()
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.header: Optional[List[str]] = None
+        self.count = 0
+        self.total_amount = 0.0
+        self.count_by_day: Dict[date, int] = {}
+        self.count_by_month: Dict[Tuple[int, int], int] = {}
+        self.amount_by_day: Dict[date, float] = {}
+        self.amount_by_month: Dict[Tuple[int, int], float] = {}
+        self.count_by_group: Dict[str, int] = {}
+        self.count_by_day_split: Dict[Tuple[date, str], int] = {}
+
+    def sync(self) -> bool:
+        """Fold in anything appended since the last call. Returns True if buckets changed."""
+        try:
+            st = self.path.stat()
+        except Exception:
+            if self.inode is None and self.offset == 0:
+                return False
+            self._reset()
+            return True
+        rebuilt = False
+        if (self.inode is not None and st.st_ino != self.inode) or st.st_size < self.offset:
+            self._reset()
+            rebuilt = True
+        self.inode = st.st_ino
+        if st.st_size == self.offset:
+            return rebuilt
+        try:
+            with self.path.open("rb") as f:
+                f.seek(self.offset)
+                chunk = f.read(st.st_size - self.offset)
+        except Exception:
+            return rebuilt
+        end = self._last_record_end(chunk)
+        if end <= 0:
+            return rebuilt
+        self.offset += end
+        self._fold(chunk[:end].decode("utf-8", errors="replace"))
+        return True
+
+    @staticmethod
+    def _last_record_end(chunk: bytes) -> int:
+        """Byte length of the longest prefix ending on a newline outside quotes."""
+        end = pos = 0
+        quotes = 0
+        for piece in chunk.split(b"\n")[:-1]:
+            pos += len(piece) + 1
+            quotes += piece.count(b'"')
+            if quotes % 2 == 0:
+                end = pos
+        return end
+
+    def _fold(self, text: str) -> None:
+        rdr = csv.reader(io.StringIO(text))
+        if self.header is None:
+            self.header = next(rdr, None) or []
+        hdr = self.header
+        recs = [dict(zip(hdr, rec)) for rec in rdr if rec]
+        raws = []
+        for r in recs:
+            raw = ""
+            for fld in self.date_fields:
+                raw = r.get(fld) or ""
+                if raw:
+                    break
+            raws.append(raw)
+        for r, d in zip(recs, _local_days(raws)):
+            self.count += 1
+            amt = _money_to_float(r.get(self.amount_field, "")) if self.amount_field else 0.0
+            self.total_amount += amt
+            if self.group_field:
+                g = (r.get(self.group_field, "") or "").strip().lower()
+                self.count_by_group[g] = self.count_by_group.get(g, 0) + 1
+            if not d:
+                continue
+            ym = (d.year, d.month)
+            self.count_by_day[d] = self.count_by_day.get(d, 0) + 1
+            self.count_by_month[ym] = self.count_by_month.get(ym, 0) + 1
+            if self.amount_field:
+                self.amount_by_day[d] = self.amount_by_day.get(d, 0.0) + amt
+                self.amount_by_month[ym] = self.amount_by_month.get(ym, 0.0) + amt
+            if self.split_field:
+                k = (d, (r.get(self.split_field, "") or "").strip().lower())
+                self.count_by_day_split[k] = self.count_by_day_split.get(k, 0) + 1
+
+
+_LOGS: Dict[str, _AppendLog] = {
+    "calls":       _AppendLog(CALLS_LOG_PATH, ("Timestamp",)),
+    "orders":      _AppendLog(ORDERS_PATH, ("Order Date", "Date"), amount_field="Amount", group_field="Company"),
+    "dialer":      _AppendLog(DIALER_RESULTS_PATH, ("Timestamp",), split_field="Outcome"),
+    "no_interest": _AppendLog(NO_INTEREST_PATH, ("Timestamp",)),
+}
+
+
+def _sync_logs() -> Set[str]:
+    """Tail every append-only log; return the keys whose buckets changed."""
+    changed = set()
+    for key, log in _LOGS.items():
+        try:
+            if log.sync():
+                changed.add(key)
+        except Exception:
+            pass
+    return changed
 
-    # Fallback: your previous date-only parser (assume local midnight)
-    d = _parse_date(s)
-    if d:
-        return datetime(d.year, d.month, d.day, tzinfo=_LOCAL_TZ)
-    return None
 
+# Rewritten (non-append) files: cached per (mtime, size) so only the file that changed is re-read.
+_DICT_CACHE: Dict[Path, Tuple[Optional[Tuple[float, int]], List[Dict[str, str]]]] = {}
 
-def _mtime(path: Path) -> Optional[float]:
+
+def _cached_dicts(path: Path) -> List[Dict[str, str]]:
     try:
-        return path.stat().st_mtime
+        st = path.stat()
+        sig = (st.st_mtime, st.st_size)
     except Exception:
-        return None
+        sig = None
+    hit = _DICT_CACHE.get(path)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    rows = _safe_read_dicts(path) if sig is not None else []
+    _DICT_CACHE[path] = (sig, rows)
+    return rows
 
 
 # ==============================
 # Customer Analytics (right pane)
 # ==============================
 def _compute_customer_metrics() -> Dict[str, str]:
-    # Orders: total sales + per-company count
-    orders = _safe_read_dicts(ORDERS_PATH)
-    total_sales = 0.0
-    orders_by_company = {}
-    for r in orders:
-        company = (r.get("Company", "") or "").strip().lower()
-        amt = _money_to_float(r.get("Amount", ""))
-        total_sales += amt
-        orders_by_company.setdefault(company, 0)
-        orders_by_company[company] += 1
-
-    # Customers: CLTV & reorder
-    customers = _safe_read_dicts(CUSTOMERS_PATH)
-    cltvs = []
-    with_reorder = 0
-    total_customers = 0
-    for r in customers:
-        total_customers += 1
-        cltvs.append(_money_to_float(r.get("CLTV", "")))
-        company = (r.get("Company", "") or "").strip().lower()
-        explicit = (r.get("Reorder?", "") or "").strip().lower()
-        has_two_orders = orders_by_company.get(company, 0) >= 2
-        if explicit in ("yes", "y", "true", "1") or has_two_orders:
-            with_reorder += 1
-
-    avg_ltv = (sum(cltvs) / len(cltvs)) if cltvs else 0.0
+    db = sqlite_backend()
+    if db is not None:
+        # SQLite backend: totals and the customers x orders reorder join are SQL aggregates
+        total_sales = db.order_totals()["total"]
+        summary = db.customer_summary()
+        total_customers = summary["customers"]
+        with_reorder = summary["with_reorder"]
+        cltv_total = summary["cltv_total"]
+    else:
+        # Orders: total sales + per-company count (running totals from the tailed log)
+        orders_log = _LOGS["orders"]
+        orders_log.sync()
+        total_sales = orders_log.total_amount
+        orders_by_company = orders_log.count_by_group
+
+        # Customers: CLTV & reorder
+        customers = _cached_dicts(CUSTOMERS_PATH)
+        cltv_total = 0.0
+        with_reorder = 0
+        total_customers = 0
+        for r in customers:
+            total_customers += 1
+            cltv_total += _money_to_float(r.get("CLTV", ""))
+            company = (r.get("Company", "") or "").strip().lower()
+            explicit = (r.get("Reorder?", "") or "").strip().lower()
+            has_two_orders = orders_by_company.get(company, 0) >= 2
+            if explicit in ("yes", "y", "true", "1") or has_two_orders:
+                with_reorder += 1
+
+    avg_ltv = (cltv_total / total_customers) if total_customers else 0.0
     reorder_rate = (with_reorder / total_customers * 100.0) if total_customers > 0 else 0.0
 
     # CAC: sum of warm costs / customers
-    warm_rows = _safe_read_dicts(WARM_LEADS_PATH)
+    warm_rows = _cached_dicts(WARM_LEADS_PATH)
     total_cost = 0.0
     for r in warm_rows:
         total_cost += _money_to_float(r.get("Cost ($)", ""))
@@ -383,234 +506,319 @@ def _compute_pipeline_metrics() -> Dict[str, str]:
 
 
 # ==============================
-# Daily Activity & Monthly Results (top-left)
+# Activity buckets (one pass per source file)
 # ==============================
-def _calls_count_for_day(day: date) -> int:
-    _ensure_calls_log()
-    rows = _safe_read_dicts(CALLS_LOG_PATH)
-    if not rows:
-        return 0
-    count = 0
-    for r in rows:
-        ts = (r.get("Timestamp", "") or "").strip()
-        dt = _parse_any_dt_local(ts)
-        if dt and dt.date() == day:
-            count += 1
-    return count
-
-
-def _calls_count_for_month(year: int, month: int) -> int:
-    _ensure_calls_log()
-    rows = _safe_read_dicts(CALLS_LOG_PATH)
-    if not rows:
-        return 0
-    count = 0
-    for r in rows:
-        ts = (r.get("Timestamp", "") or "").strip()
-        dt = _parse_any_dt_local(ts)
-        if dt and dt.year == year and dt.month == month:
-            count += 1
-    return count
+# Every source is folded once into per-day buckets; day / month / any date range is then a
+# sum over those buckets. Shared by the Daily Activity + Monthly panels and
+# gf_helpers.compute_daily_activity (Daily Activity popup).
+#   calls            calls_log.csv (notes saved in Dialer / Warm)
+#   dialer_*         dialer_results.csv, total + by Outcome (green / gray / red)
+#   emails           results.csv + its journal DateSent, de-duped by (To, Subject, day)
+#   warms            warm_leads.csv First Contact (or Timestamp)
+#   newcus           customers.csv Customer Since / First Order
+#   orders, sales    orders.csv Order Date (count, Amount sum)
+_BUCKETS: Dict[str, Tuple[Optional[Tuple[float, int]], Dict[date, int]]] = {}
 
 
-def _compute_daily_metrics() -> Dict[str, str]:
-    # “Today” is based on the local business timezone
-    today_local = datetime.now(_LOCAL_TZ).date()
+# results.csv is fronted by gf_store's append-only journal; drafts and sync updates land there
+# until compaction, so the emails buckets read the journal's merged view and watch both files
+RESULTS_JOURNAL_PATH = RESULTS_PATH.with_suffix(".journal")
+
+
+def _path_sig(path: Path) -> Optional[Tuple[float, int]]:
+    try:
+        st = path.stat()
+        return (st.st_mtime, st.st_size)
+    except Exception:
+        return None
+
+
+def _file_buckets(key: str, path: Path, build) -> Dict[date, int]:
+    """build(rows) -> {day: n}, recomputed only when the file's (mtime, size) changes."""
+    sig = _path_sig(path)
+    hit = _BUCKETS.get(key)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    days = build(_cached_dicts(path)) if sig is not None else {}
+    _BUCKETS[key] = (sig, days)
+    return days
 
-    # Emails sent today (robust parse + local tz + de-dupe by {To, Subject, date})
-    emails = 0
-    rows_results = _safe_read_dicts(RESULTS_PATH)
+
+def _results_buckets() -> Dict[date, int]:
+    """_emails_by_day over results.csv with pending journal rows applied (gf_store's view)."""
+    sig = (_path_sig(RESULTS_PATH), _path_sig(RESULTS_JOURNAL_PATH))
+    hit = _BUCKETS.get("emails")
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    days = _emails_by_day(load_results_rows_sorted()) if sig != (None, None) else {}
+    _BUCKETS["emails"] = (sig, days)
+    return days
+
+
+def _count_days(raws: List[str]) -> Dict[date, int]:
+    days: Dict[date, int] = {}
+    for d in _local_days(raws):
+        if d:
+            days[d] = days.get(d, 0) + 1
+    return days
+
+
+def _emails_by_day(rows: List[Dict[str, str]]) -> Dict[date, int]:
+    days: Dict[date, int] = {}
     seen = set()
-    for r in rows_results:
-        dt = _parse_any_dt_local(r.get("DateSent") or r.get("Date") or "")
-        if not dt:
+    for r, d in zip(rows, _local_days([r.get("DateSent") or r.get("Date") or "" for r in rows])):
+        if not d:
             continue
-        if dt.date() == today_local:
-            key = (
-                (r.get("To") or "").strip().lower(),
-                (r.get("Subject") or "").strip(),
-                dt.date().isoformat(),
-            )
-            if key in seen:
-                continue
-            seen.add(key)
-            emails += 1
-
-    # Sales today
-    sales_today = 0.0
-    for r in _safe_read_dicts(ORDERS_PATH):
-        dt = _parse_any_dt_local(r.get("Order Date") or r.get("Date") or "")
-        if dt and dt.date() == today_local:
-            sales_today += _money_to_float(r.get("Amount", ""))
-
-    # New warm leads today
-    warms_today = 0
-    warm_rows = _safe_read_dicts(WARM_LEADS_PATH)
-    ts_field = "First Contact" if warm_rows and "First Contact" in (warm_rows[0].keys()) else "Timestamp"
-    for r in warm_rows:
-        dt = _parse_any_dt_local(r.get(ts_field, ""))
-        if dt and dt.date() == today_local:
-            warms_today += 1
+        key = ((r.get("To") or "").strip().lower(), (r.get("Subject") or "").strip(), d)
+        if key in seen:
+            continue
+        seen.add(key)
+        days[d] = days.get(d, 0) + 1
+    return days
+
+
+def _warms_by_day(rows: List[Dict[str, str]]) -> Dict[date, int]:
+    ts_field = "First Contact" if rows and "First Contact" in rows[0].keys() else "Timestamp"
+    return _count_days([r.get(ts_field, "") for r in rows])
+
+
+def _newcus_by_day(rows: List[Dict[str, str]]) -> Dict[date, int]:
+    return _count_days([r.get("Customer Since") or r.get("First Order Date") or r.get("First Order") or ""
+                        for r in rows])
+
 
-    # New accounts (customers) today
-    newcus_today = 0
-    for r in _safe_read_dicts(CUSTOMERS_PATH):
-        cs = _parse_any_dt_local(r.get("Customer Since") or r.get("First Order") or "")
-        if cs and cs.date() == today_local:
-            newcus_today += 1
+def _range_sum(days: Dict, start: date, end: date):
+    return sum(v for d, v in days.items() if start <= d <= end)
 
-    # Calls today (from calls_log.csv)
-    calls_today = _calls_count_for_day(today_local)
 
+def activity_between(start: date, end: date) -> Dict[str, float]:
+    """Every activity metric summed over start..end (inclusive local dates)."""
+    _ensure_calls_log()
+    _sync_logs()
+    calls, dialer = _LOGS["calls"], _LOGS["dialer"]
+    out: Dict[str, float] = {
+        "calls": _range_sum(calls.count_by_day, start, end),
+        "dialer_calls": _range_sum(dialer.count_by_day, start, end),
+    }
+    for oc in ("green", "gray", "red"):
+        out[f"dialer_{oc}"] = sum(n for (d, o), n in dialer.count_by_day_split.items()
+                                  if o == oc and start <= d <= end)
+
+    db = sqlite_backend()
+    if db is not None:
+        # SQLite backend: one GROUP BY per table instead of reading the CSV mirrors
+        emails = db.emails_by_day()
+        orders = db.orders_by_day()
+        out["emails"] = _range_sum(emails, start, end)
+        out["orders"] = sum(n for d, (n, _a) in orders.items() if start <= d <= end)
+        out["sales"] = sum(a for d, (_n, a) in orders.items() if start <= d <= end)
+    else:
+        orders_log = _LOGS["orders"]
+        out["emails"] = _range_sum(_results_buckets(), start, end)
+        out["orders"] = _range_sum(orders_log.count_by_day, start, end)
+        out["sales"] = _range_sum(orders_log.amount_by_day, start, end)
+
+    out["warms"] = _range_sum(_file_buckets("warms", WARM_LEADS_PATH, _warms_by_day), start, end)
+    out["newcus"] = _range_sum(_file_buckets("newcus", CUSTOMERS_PATH, _newcus_by_day), start, end)
+    return out
+
+
+def activity_for_day(day: date) -> Dict[str, float]:
+    return activity_between(day, day)
+
+
+def activity_for_month(year: int, month: int) -> Dict[str, float]:
+    first = date(year, month, 1)
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return activity_between(first, last)
+
+
+# ==============================
+# Daily Activity & Monthly Results (top-left)
+# ==============================
+def _compute_daily_metrics() -> Dict[str, str]:
+    # “Today” is based on the local business timezone
+    a = activity_for_day(datetime.now(_LOCAL_TZ).date())
     return {
-        "calls": str(calls_today),
-        "emails": str(emails),
-        "warms": str(warms_today),
-        "newcus": str(newcus_today),
-        "sales": f"${_float_to_money(sales_today)}",
+        "calls": str(a["calls"]),
+        "emails": str(a["emails"]),
+        "warms": str(a["warms"]),
+        "newcus": str(a["newcus"]),
+        "sales": f"${_float_to_money(a['sales'])}",
     }
 
 
 def _compute_monthly_metrics() -> Dict[str, str]:
     now = datetime.now(_LOCAL_TZ)
-    month_warms = 0
-    month_newcus = 0
-    month_sales = 0.0
+    a = activity_for_month(now.year, now.month)
+    return {
+        "warms": str(a["warms"]),
+        "newcus": str(a["newcus"]),
+        "sales": f"${_float_to_money(a['sales'])}",
+        "calls": str(a["calls"]),  # available if you add a UI label
+    }
 
-    # Warm leads this month
-    warm_rows = _safe_read_dicts(WARM_LEADS_PATH)
-    ts_field = "First Contact" if warm_rows and "First Contact" in (warm_rows[0].keys()) else "Timestamp"
-    for r in warm_rows:
-        dt = _parse_any_dt_local(r.get(ts_field, ""))
-        if dt and dt.year == now.year and dt.month == now.month:
-            month_warms += 1
 
-    # New customers this month
-    for r in _safe_read_dicts(CUSTOMERS_PATH):
-        cs = _parse_any_dt_local(r.get("Customer Since") or r.get("First Order") or "")
-        if cs and cs.year == now.year and cs.month == now.month:
-            month_newcus += 1
+# ==============================
+# Metrics service (one computation per data version)
+# ==============================
+# Every panel is computed once per "data version" -- the (mtime, size) of the files it reads
+# (plus the SQLite change counter and, for the activity panels, the current day) -- and the
+# result is cached. gf_analytics and gf_customers both read the panels from METRICS, so a
+# burst of refresh requests between two writes costs one computation.
+_ACTIVITY_SOURCES = (CALLS_LOG_PATH, DIALER_RESULTS_PATH, RESULTS_PATH, RESULTS_JOURNAL_PATH,
+                     ORDERS_PATH, WARM_LEADS_PATH, CUSTOMERS_PATH)
+
+
+class MetricsService:
+    def __init__(self):
+        self._panels: Dict[str, Tuple[Callable[[], Dict[str, str]], Tuple[Path, ...], Callable[[], object]]] = {}
+        self._cache: Dict[str, Tuple[object, Dict[str, str]]] = {}
+
+    def register(self, name: str, compute: Callable[[], Dict[str, str]], sources: Tuple[Path, ...],
+                 period: Callable[[], object] = lambda: None) -> None:
+        """compute() -> labels; re-run only when a source file, the DB or period() changes."""
+        self._panels[name] = (compute, tuple(sources), period)
+
+    def version(self, name: str) -> object:
+        _compute, sources, period = self._panels[name]
+        sigs = []
+        for p in sources:
+            try:
+                st = p.stat()
+                sigs.append((st.st_mtime_ns, st.st_size))
+            except Exception:
+                sigs.append(None)
+        db = sqlite_backend()
+        return (tuple(sigs), db.data_version() if db is not None else None, period())
 
-    # Sales this month
-    for r in _safe_read_dicts(ORDERS_PATH):
-        dt = _parse_any_dt_local(r.get("Order Date") or r.get("Date") or "")
-        if dt and dt.year == now.year and dt.month == now.month:
-            month_sales += _money_to_float(r.get("Amount", ""))
+    def get(self, name: str) -> Dict[str, str]:
+        version = self.version(name)
+        hit = self._cache.get(name)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        m = self._panels[name][0]()
+        self._cache[name] = (version, m)
+        return m
 
-    # Calls this month (from calls_log.csv) – available if you add a UI label
-    calls_this_month = _calls_count_for_month(now.year, now.month)
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
 
-    return {
-        "warms": str(month_warms),
-        "newcus": str(month_newcus),
-        "sales": f"${_float_to_money(month_sales)}",
-        "calls": str(calls_this_month),
-    }
+
+def _today_local() -> date:
+    return datetime.now(_LOCAL_TZ).date()
+
+
+METRICS = MetricsService()
+METRICS.register("customer", _compute_customer_metrics, (CUSTOMERS_PATH, ORDERS_PATH, WARM_LEADS_PATH))
+METRICS.register("pipeline", _compute_pipeline_metrics, (_COUNTERS_PATH,))
+METRICS.register("daily", _compute_daily_metrics, _ACTIVITY_SOURCES, period=_today_local)
+METRICS.register("monthly", _compute_monthly_metrics, _ACTIVITY_SOURCES,
+                 period=lambda: _today_local().replace(day=1))
+
+
+def customer_metrics() -> Dict[str, str]:
+    return METRICS.get("customer")
+
+
+def pipeline_metrics() -> Dict[str, str]:
+    return METRICS.get("pipeline")
 
 
 # ==============================
 # Apply to window
 # ==============================
+# Last text written to each label: unchanged values are not pushed again (no redraw/flicker)
+_SHOWN: Dict[Tuple[int, str], str] = {}
+
+
+def _show(window, key: str, value: str) -> None:
+    slot = (id(window), key)
+    if _SHOWN.get(slot) == value:
+        return
+    try:
+        window[key].update(value)
+        _SHOWN[slot] = value
+    except Exception:
+        pass
+
+
 def _apply_customer_metrics_to_window(window, m: Dict[str, str]) -> None:
-    try: window["-AN_TOTALSALES-"].update(m.get("total_sales", "0.00"))
-    except Exception: pass
-    try: window["-AN_CAC-"].update(m.get("cac", "0.00"))
-    except Exception: pass
-    try: window["-AN_LTV-"].update(m.get("ltv", "0.00"))
-    except Exception: pass
-    try: window["-AN_CACLTV-"].update(m.get("ratio", "0.0"))
-    except Exception: pass
-    try: window["-AN_REORDER-"].update(m.get("reorder", "0%"))
-    except Exception: pass
+    _show(window, "-AN_TOTALSALES-", m.get("total_sales", "0.00"))
+    _show(window, "-AN_CAC-", m.get("cac", "0.00"))
+    _show(window, "-AN_LTV-", m.get("ltv", "0.00"))
+    _show(window, "-AN_CACLTV-", m.get("ratio", "0.0"))
+    _show(window, "-AN_REORDER-", m.get("reorder", "0%"))
 
 
 def _apply_pipeline_metrics_to_window(window, m: Dict[str, str]) -> None:
-    try: window["-AN_WARMS-"].update(m.get("warms", "0"))
-    except Exception: pass
-    try: window["-AN_NEWCUS-"].update(m.get("new_customers", "0"))
-    except Exception: pass
-    try: window["-AN_CLOSERATE-"].update(m.get("close_rate", "0%"))
-    except Exception: pass
+    _show(window, "-AN_WARMS-", m.get("warms", "0"))
+    _show(window, "-AN_NEWCUS-", m.get("new_customers", "0"))
+    _show(window, "-AN_CLOSERATE-", m.get("close_rate", "0%"))
 
 
 def _apply_daily_to_window(window, m: Dict[str, str]) -> None:
-    try: window["-DA_CALLS-"].update(m.get("calls", "0"))
-    except Exception: pass
-    try: window["-DA_EMAILS-"].update(m.get("emails", "0"))
-    except Exception: pass
-    try: window["-DA_WARMS-"].update(m.get("warms", "0"))
-    except Exception: pass
-    try: window["-DA_NEWCUS-"].update(m.get("newcus", "0"))
-    except Exception: pass
-    try: window["-DA_SALES-"].update(m.get("sales", "$0.00"))
-    except Exception: pass
+    _show(window, "-DA_CALLS-", m.get("calls", "0"))
+    _show(window, "-DA_EMAILS-", m.get("emails", "0"))
+    _show(window, "-DA_WARMS-", m.get("warms", "0"))
+    _show(window, "-DA_NEWCUS-", m.get("newcus", "0"))
+    _show(window, "-DA_SALES-", m.get("sales", "$0.00"))
 
 
 def _apply_monthly_to_window(window, m: Dict[str, str]) -> None:
-    try: window["-MO_WARMS-"].update(m.get("warms", "0"))
-    except Exception: pass
-    try: window["-MO_NEWCUS-"].update(m.get("newcus", "0"))
-    except Exception: pass
-    try: window["-MO_SALES-"].update(m.get("sales", "$0.00"))
-    except Exception: pass
+    _show(window, "-MO_WARMS-", m.get("warms", "0"))
+    _show(window, "-MO_NEWCUS-", m.get("newcus", "0"))
+    _show(window, "-MO_SALES-", m.get("sales", "$0.00"))
     # If you add a Monthly Calls label later (e.g., key "-MO_CALLS-"), uncomment:
-    # try: window["-MO_CALLS-"].update(m.get("calls", "0"))
-    # except Exception: pass
+    # _show(window, "-MO_CALLS-", m.get("calls", "0"))
 
 
 # ==============================
 # Watcher / entry point
 # ==============================
-_LAST_MTIMES = {"warm": None, "cust": None, "orders": None, "results": None, "calls": None}
-
 def _refresh_all(window) -> None:
     try:
-        _apply_customer_metrics_to_window(window, _compute_customer_metrics())
-        _apply_pipeline_metrics_to_window(window, _compute_pipeline_metrics())
-        _apply_daily_to_window(window, _compute_daily_metrics())
-        _apply_monthly_to_window(window, _compute_monthly_metrics())
+        _apply_customer_metrics_to_window(window, METRICS.get("customer"))
+        _apply_pipeline_metrics_to_window(window, METRICS.get("pipeline"))
+        _apply_daily_to_window(window, METRICS.get("daily"))
+        _apply_monthly_to_window(window, METRICS.get("monthly"))
     except Exception:
         pass
 
 
-def _files_changed() -> bool:
-    changed = False
-    for key, path in (
-        ("warm", WARM_LEADS_PATH),
-        ("cust", CUSTOMERS_PATH),
-        ("orders", ORDERS_PATH),
-        ("results", RESULTS_PATH),
-        ("calls", CALLS_LOG_PATH),
-    ):
-        mt = _mtime(path)
-        global _LAST_MTIMES
-        if _LAST_MTIMES[key] is None:
-            _LAST_MTIMES[key] = mt
-        elif mt != _LAST_MTIMES[key]:
-            _LAST_MTIMES[key] = mt
-            changed = True
-    return changed
+def refresh_analytics(window) -> None:
+    """Bring every analytics label up to date (cached metrics; only changed labels are written)."""
+    _refresh_all(window)
 
 
-def init_analytics(window, interval_ms: int = 1500) -> None:
-    ensure_seeded()
-    _refresh_all(window)
+_WATCH_TOKEN: Optional[int] = None
 
-    def _tick():
-        try:
-            if _files_changed():
-                _refresh_all(window)
-            else:
-                # Even if files haven't changed, pipeline counters may have been bumped.
-                _apply_pipeline_metrics_to_window(window, _compute_pipeline_metrics())
-        finally:
-            try:
-                window.TKroot.after(interval_ms, _tick)
-            except Exception:
-                pass
 
-    try:
-        window.TKroot.after(interval_ms, _tick)
-    except Exception:
-        pass
+def _on_files_changed(window, changed: Set[Path]) -> None:
+    if changed == {_COUNTERS_PATH}:
+        # Only the pipeline counters were bumped
+        _apply_pipeline_metrics_to_window(window, METRICS.get("pipeline"))
+        return
+    _refresh_all(window)
+
 
+def init_analytics(window, interval_ms: int = 1500) -> None:
+    """
+    Refresh every panel now. Later refreshes are driven by the shared gf_watch service
+    (one debounced event per write to a source file, our own writes included);
+    interval_ms is kept for callers, the watcher owns the timing.
+    """
+    global _WATCH_TOKEN
+    ensure_seeded()
+    _refresh_all(window)
+    if _WATCH_TOKEN is None:
+        _WATCH_TOKEN = subscribe(
+            window,
+            [WARM_LEADS_PATH, CUSTOMERS_PATH, RESULTS_PATH, RESULTS_JOURNAL_PATH, ORDERS_PATH,
+             CALLS_LOG_PATH, DIALER_RESULTS_PATH, NO_INTEREST_PATH, _COUNTERS_PATH],
+            lambda changed: _on_files_changed(window, changed),
+            include_own=True,
+        )
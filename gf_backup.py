@@ -0,0 +1,212 @@
+# gf_backup.py
+# Content-addressed, compressed backup store for APP_DIR/_backups.
+# - snapshot(path) reads the file once (the caller is about to overwrite it) and hands the
+#   bytes to a background thread: hashing, gzip and the disk write never block the UI
+# - Objects are stored once per content hash (objects/ab/<sha256>.gz); saving identical
+#   content again adds nothing
+# - index.jsonl: one line per snapshot  {"file", "ts", "hash", "size"}
+# - Retention (per file): every snapshot from the last hour, then newest per hour for a
+#   day, newest per day for a month; always the newest KEEP_LATEST. Unreferenced objects
+#   are deleted.
+# - Restore: list_snapshots(name) / read_snapshot(hash) / restore(path, hash=None)
+#
+# Pure stdlib, no app imports: gf_store owns the instance (gf_store.BACKUPS).
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+KEEP_LATEST = 10
+RETENTION = (
+    (timedelta(hours=1), None),                  # keep everything
+    (timedelta(days=1), "%Y%m%d%H"),             # newest per hour
+    (timedelta(days=30), "%Y%m%d"),              # newest per day
+)
+PRUNE_EVERY = 25                                 # snapshots between retention passes
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+class BackupStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.index_path = self.root / "index.jsonl"
+        self._lock = threading.RLock()
+        self._last: Optional[Dict[str, str]] = None   # file name -> hash of its newest snapshot
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._since_prune = 0
+        atexit.register(self.flush)
+
+    # ---- public ----
+    def snapshot(self, path: Path, wait: bool = False) -> None:
+        """Queue a backup of `path` as it is right now (best effort, never raises)."""
+        try:
+            path = Path(path)
+            if not (path.exists() and path.is_file()):
+                return
+            data = path.read_bytes()
+        except Exception:
+            return
+        if wait:
+            self._store(path.name, data, datetime.now())
+            return
+        self._start()
+        self._jobs.put((path.name, data, datetime.now()))
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """Wait until queued snapshots are on disk."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._jobs.put(("", None, done))
+        done.wait(timeout)
+
+    def list_snapshots(self, name) -> List[Dict[str, object]]:
+        """Snapshots of one file (name or path), newest first: {"file", "ts", "hash", "size"}."""
+        name = Path(name).name
+        with self._lock:
+            return [e for e in reversed(self._read_index()) if e.get("file") == name]
+
+    def read_snapshot(self, digest: str) -> bytes:
+        with gzip.open(self._obj_path(digest), "rb") as f:
+            return f.read()
+
+    def restore(self, path: Path, digest: Optional[str] = None) -> bool:
+        """
+        Put a snapshot back at `path` (default: the newest one). The current content is
+        snapshotted first, so a restore can itself be undone.
+        """
+        path = Path(path)
+        self.flush()
+        snaps = self.list_snapshots(path.name)
+        if digest:
+            snaps = [e for e in snaps if e["hash"] == digest]
+        if not snaps:
+            return False
+        try:
+            data = self.read_snapshot(snaps[0]["hash"])
+        except Exception:
+            return False
+        self.snapshot(path, wait=True)
+        tmp = path.with_suffix(path.suffix + ".restore")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return True
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Apply the retention policy; returns the number of index entries dropped."""
+        now = now or datetime.now()
+        with self._lock:
+            entries = self._read_index()
+            by_file: Dict[str, List[dict]] = {}
+            for e in entries:
+                by_file.setdefault(e.get("file", ""), []).append(e)
+            keep = []
+            for items in by_file.values():
+                items.sort(key=lambda e: e.get("ts", ""), reverse=True)
+                buckets = set()
+                for i, e in enumerate(items):
+                    try:
+                        ts = datetime.strptime(e["ts"], _TS_FMT)
+                    except Exception:
+                        continue
+                    age = now - ts
+                    ok = i < KEEP_LATEST
+                    for span, fmt in RETENTION:
+                        if age <= span:
+                            if fmt is None:
+                                ok = True
+                            else:
+                                b = (span, ts.strftime(fmt))
+                                if b not in buckets:
+                                    buckets.add(b)
+                                    ok = True
+                            break
+                    if ok:
+                        keep.append(e)
+            keep.sort(key=lambda e: e.get("ts", ""))
+            dropped = len(entries) - len(keep)
+            if dropped:
+                self._write_index(keep)
+                live = {e["hash"] for e in keep}
+                for obj in self.objects.glob("*/*.gz"):
+                    if obj.stem not in live:
+                        try:
+                            obj.unlink()
+                        except Exception:
+                            pass
+            return dropped
+
+    # ---- internals ----
+    def _obj_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.gz"
+
+    def _read_index(self) -> List[dict]:
+        out = []
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            out.append(json.loads(line))
+                        except Exception:
+                            pass
+        except FileNotFoundError:
+            pass
+        return out
+
+    def _write_index(self, entries: List[dict]) -> None:
+        tmp = self.index_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e) + "\n" for e in entries))
+        os.replace(tmp, self.index_path)
+
+    def _store(self, name: str, data: bytes, when: datetime) -> None:
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if self._last is None:
+                self._last = {e["file"]: e["hash"] for e in self._read_index() if "file" in e}
+            if self._last.get(name) == digest:
+                return                      # unchanged since the previous snapshot
+            obj = self._obj_path(digest)
+            if not obj.exists():
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                tmp = obj.with_suffix(".tmp")
+                with gzip.open(tmp, "wb", compresslevel=6) as f:
+                    f.write(data)
+                os.replace(tmp, obj)
+            entry = {"file": name, "ts": when.strftime(_TS_FMT), "hash": digest, "size": len(data)}
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._last[name] = digest
+            self._since_prune += 1
+            if self._since_prune >= PRUNE_EVERY:
+                self._since_prune = 0
+                self.prune()
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="gf-backup", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            name, data, when = self._jobs.get()
+            if data is None:
+                when.set()                  # flush marker
+                continue
+            try:
+                self._store(name, data, when)
+            except Exception:
+                pass
@@ -1,23 +1,26 @@
 # gf_campaigns.py
 from __future__ import annotations
-import json, csv, os
+import json, csv, io, os, re, threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 # Store paths we already have
 from gf_store import (
     APP_DIR,
     RESULTS_PATH,
+    CAMPAIGNS_PATH,
     HEADER_FIELDS,
     load_results_rows_sorted,
+    sqlite_backend,
+    _read_campaign_rows,
 )
 
 # Helpers from your toolkit
 from gf_helpers import (
     apply_placeholders,    # fills {First Name}, {Company}, etc.
     blocks_to_html,        # text->HTML blocks (preserves newlines)
-    pick_store,            # select Outlook store
+    outlook_session,       # cached Application / Namespace / folders (per thread)
     require_pywin32,       # True if pywin32 available/usable
     upsert_result,         # cache into results.csv
     _lead_row_from_email_company,
@@ -31,6 +34,9 @@ GROWTHFARM_SUBFOLDER = "GrowthFarm"   # Draft subfolder name under Outlook Draft
 CAMPAIGNS_DIR = APP_DIR / "campaigns"
 CAMPAIGNS_DIR.mkdir(parents=True, exist_ok=True)
 
+# results.csv journal (gf_store.ResultsJournal): rows appended here are counted incrementally
+_RESULTS_JOURNAL = RESULTS_PATH.with_suffix(".journal")
+
 # Small prefs file (remembers last chosen campaign)
 _PREFS_PATH = CAMPAIGNS_DIR / "_prefs.json"
 
@@ -121,22 +127,234 @@ def summarize_campaign_for_table(key: str) -> List[str]:
     hourly = "—"
     return [key, str(enabled), delays, to_dialer, auto_sync, hourly]
 
+# ---------- Campaign stats (one pass over results for every campaign) ----------
+_REF_TAG_RE = re.compile(r"\s*\[ref:[^\]]*\]\s*$", re.I)
+_PLACEHOLDER_RE = re.compile(r"\{[^{}]+\}")
+_TAIL_BYTES = 64     # bytes remembered from the end of results.csv to recognise a pure append
+
+
+def _norm_subject(s: str) -> str:
+    s = (s or "").strip()
+    return _REF_TAG_RE.sub("", s).strip() if "[ref:" in s.lower() else s
+
+
+def _stat_sig(path: Path):
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except Exception:
+        return None
+
+
+class CampaignStats:
+    """
+    Sent / replied per campaign for every campaign at once.
+    A results row counts for: its Campaign column (log_email_sent; gf_schedule stamps it when a
+    ref is drafted or leaves campaigns.csv), else the campaign its Ref is enrolled in
+    (campaigns.csv), else every campaign with a step subject matching its Subject
+    ({placeholders} match any text, a trailing [ref:...] tag is ignored).
+    Rows appended to results.csv or to its journal are added incrementally; any other change
+    (Outlook sync rewrite, campaign edits, SQLite writes) costs one pass over the results.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._defs_sig = None
+
+    # ---- subject index ----
+    def _build_index(self) -> None:
+        self._exact: Dict[str, Tuple[str, ...]] = {}
+        patterns: Dict[str, List[str]] = {}
+        for key in list_campaign_keys():
+            for subj in set(_campaign_subjects(key)):
+                subj = _norm_subject(subj)
+                if "{" in subj and _PLACEHOLDER_RE.search(subj):
+                    patterns.setdefault(subj, []).append(key)
+                else:
+                    self._exact[subj] = self._exact.get(subj, ()) + (key,)
+        self._patterns = []
+        for subj, keys in patterns.items():
+            parts = _PLACEHOLDER_RE.split(subj)
+            rx = re.compile(".+?".join(re.escape(x) for x in parts) + r"\Z", re.S)
+            self._patterns.append((rx, tuple(keys)))
+        self._enrolled = {(r.get("Ref", "") or "").strip().lower(): (r.get("CampaignKey") or "default")
+                          for r in _read_campaign_rows()}
+
+    def _keys_for(self, r: Dict[str, str], subj: str) -> Tuple[str, ...]:
+        camp = (r.get("Campaign") or "").strip()
+        if camp:
+            return (camp,)
+        key = self._enrolled.get((r.get("Ref", "") or "").strip().lower())
+        if key:
+            return (key,)
+        keys = self._exact.get(subj)
+        if keys is None and subj:
+            keys = ()
+            for rx, ks in self._patterns:
+                if rx.match(subj):
+                    keys += ks
+            self._exact[subj] = keys           # rendered subjects repeat: remember the match
+        return keys or ()
+
+    # ---- counters ----
+    def _add(self, r: Dict[str, str], sign: int = 1):
+        subj = _norm_subject(r.get("Subject", ""))
+        sent = 1 if (r.get("DateSent") or "").strip() else 0
+        replied = 1 if (r.get("DateReplied") or "").strip() else 0
+        c = (self._keys_for(r, subj), subj, sent, replied)
+        self._count(c, sign)
+        return c
+
+    def _count(self, c, sign: int) -> None:
+        keys, subj, sent, replied = c
+        if not (sent or replied):
+            return
+        sent, replied = sign * sent, sign * replied
+        for k in keys:
+            bucket = self._totals.setdefault(k, [0, 0])
+            bucket[0] += sent
+            bucket[1] += replied
+        bucket = self._by_subject.setdefault(subj, [0, 0])
+        bucket[0] += sent
+        bucket[1] += replied
+
+    def _full_pass(self) -> None:
+        self._build_index()
+        self._totals: Dict[str, List[int]] = {}
+        self._by_subject: Dict[str, List[int]] = {}
+        self._by_ref: Dict[str, tuple] = {}     # Ref -> counted contribution of its current row
+        try:
+            rows = load_results_rows_sorted()
+        except Exception:
+            rows = []
+        for r in rows:                           # newest first: the row a journal upsert replaces
+            c = self._add(r)
+            ref = (r.get("Ref", "") or "").lower()
+            if ref:
+                self._by_ref.setdefault(ref, c)
+        self._csv_sig = _stat_sig(RESULTS_PATH)
+        self._csv_end = self._csv_sig[1] if self._csv_sig else 0
+        self._csv_tail = self._read_bytes(RESULTS_PATH, max(0, self._csv_end - _TAIL_BYTES), self._csv_end)
+        self._csv_header = self._header()
+        jr = _stat_sig(_RESULTS_JOURNAL)
+        self._jr_end = jr[1] if jr else 0
+        self._built = True
+
+    # ---- incremental ----
+    @staticmethod
+    def _read_bytes(path: Path, start: int, end: Optional[int] = None) -> bytes:
+        try:
+            with path.open("rb") as f:
+                f.seek(start)
+                return f.read() if end is None else f.read(max(0, end - start))
+        except Exception:
+            return b""
+
+    @staticmethod
+    def _header() -> List[str]:
+        try:
+            with RESULTS_PATH.open("r", encoding="utf-8-sig", newline="") as f:
+                return next(csv.reader(f), [])
+        except Exception:
+            return []
+
+    def _apply_tails(self, csv_sig, jr_size: int) -> bool:
+        """Count rows appended since the last look; False if the files were rewritten instead."""
+        if csv_sig != self._csv_sig:
+            if (csv_sig is None or csv_sig[1] <= self._csv_end or not self._csv_header
+                    or self._read_bytes(RESULTS_PATH, self._csv_end - len(self._csv_tail), self._csv_end) != self._csv_tail):
+                return False
+        if jr_size < self._jr_end:
+            return False
+        if csv_sig != self._csv_sig:
+            data = self._read_bytes(RESULTS_PATH, self._csv_end, csv_sig[1])
+            cut = data.rfind(b"\n") + 1         # complete lines only
+            for row in csv.reader(io.StringIO(data[:cut].decode("utf-8", "replace"))):
+                if row:
+                    d = dict(zip(self._csv_header, row))
+                    c = self._add(d)
+                    ref = (d.get("Ref", "") or "").lower()
+                    if ref:
+                        self._by_ref.setdefault(ref, c)
+            self._csv_end += cut
+            self._csv_tail = self._read_bytes(RESULTS_PATH, max(0, self._csv_end - _TAIL_BYTES), self._csv_end)
+            self._csv_sig = csv_sig if cut == len(data) else None
+        if jr_size > self._jr_end:
+            data = self._read_bytes(_RESULTS_JOURNAL, self._jr_end, jr_size)
+            cut = data.rfind(b"\n") + 1
+            for line in data[:cut].splitlines():
+                try:
+                    d = json.loads(line)
+                except Exception:
+                    continue
+                ref = (d.get("Ref", "") or "").lower()
+                old = self._by_ref.get(ref) if ref else None
+                if old is not None:
+                    self._count(old, -1)         # an upsert replaces that ref's row
+                c = self._add(d)
+                if ref:
+                    self._by_ref[ref] = c
+            self._jr_end += cut
+        return True
+
+    def refresh(self) -> None:
+        with self._lock:
+            defs_sig = (_stat_sig(CAMPAIGNS_DIR), _stat_sig(CAMPAIGNS_PATH))
+            db = sqlite_backend()
+            if db is not None:
+                ver = (defs_sig, db.data_version())
+                if not self._built or ver != self._defs_sig:
+                    self._full_pass()
+                    self._defs_sig = (defs_sig, db.data_version())
+                return
+            if not self._built or defs_sig != self._defs_sig:
+                self._full_pass()
+                self._defs_sig = defs_sig
+                return
+            csv_sig = _stat_sig(RESULTS_PATH)
+            jr = _stat_sig(_RESULTS_JOURNAL)
+            jr_size = jr[1] if jr else 0
+            if csv_sig == self._csv_sig and jr_size == self._jr_end:
+                return
+            if not self._apply_tails(csv_sig, jr_size):
+                self._full_pass()
+
+    # ---- public ----
+    def all(self) -> Dict[str, Tuple[int, int, float]]:
+        """{campaign key: (sent, replied, resp_pct)} for every key seen in the results."""
+        with self._lock:
+            self.refresh()
+            return {k: (s, r, 0.0 if s == 0 else (r / s) * 100.0) for k, (s, r) in self._totals.items()}
+
+    def get(self, key: str) -> Tuple[int, int, float]:
+        return self.all().get(key, (0, 0, 0.0))
+
+    def by_subjects(self, subjects) -> Tuple[int, int]:
+        with self._lock:
+            self.refresh()
+            sent = replied = 0
+            for subj in {_norm_subject(x) for x in subjects}:
+                s, r = self._by_subject.get(subj, (0, 0))
+                sent += s
+                replied += r
+            return sent, replied
+
+
+CAMPAIGN_STATS = CampaignStats()
+
+
+def campaign_stats_all() -> Dict[str, Tuple[int, int, float]]:
+    return CAMPAIGN_STATS.all()
+
+
 # ---------- Response-rate helper used by UI (optional) ----------
 def _response_rate_by_subjects(subjects_set) -> str:
     if not subjects_set:
         return ""
     try:
-        rows = load_results_rows_sorted()
+        sent, replied = CAMPAIGN_STATS.by_subjects(subjects_set)
     except Exception:
         return ""
-    sent = replied = 0
-    for r in rows:
-        subj = (r.get("Subject", "") or "").strip()
-        if subj in subjects_set:
-            if r.get("DateSent"):
-                sent += 1
-            if r.get("DateReplied"):
-                replied += 1
     return "0.0%" if sent == 0 else f"{(replied / sent) * 100:.1f}%"
 
 # ---------- Campaign enrollment CSV (simple queue) ----------
@@ -211,21 +429,12 @@ def campaigns_bulk_enroll_from_status(status="gray", campaign_key="default", div
 
 # ---------- Outlook draft helpers ----------
 def _ensure_outlook_folder_drafts_sub(session, name: str):
-    """Returns/creates a subfolder under Drafts."""
-    store = pick_store(session)
-    drafts_root = store.GetDefaultFolder(16)  # olFolderDrafts
-    for i in range(1, drafts_root.Folders.Count + 1):
-        f = drafts_root.Folders.Item(i)
-        if (f.Name or "").lower() == (name or "").strip().lower():
-            return f
-    return drafts_root.Folders.Add(name or GROWTHFARM_SUBFOLDER)
+    """Returns/creates a subfolder under Drafts (cached on the shared Outlook session)."""
+    return outlook_session().drafts_subfolder((name or "").strip() or GROWTHFARM_SUBFOLDER)
 
 def _draft_one_outlook(ref_short: str, email: str, subj_text: str, body_text: str):
     """Create a single Outlook draft under the GrowthFarm subfolder."""
-    import win32com.client as win32
-    outlook = win32.Dispatch("Outlook.Application")
-    session = outlook.GetNamespace("MAPI")
-    target_folder = _ensure_outlook_folder_drafts_sub(session, GROWTHFARM_SUBFOLDER)
+    sess = outlook_session()
     body_html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head>
     <body style="margin:0;padding:0;">
       <div style="font-family:Segoe UI, Arial, sans-serif; font-size:14px; line-height:1.5; color:#111;">
@@ -233,12 +442,17 @@ def _draft_one_outlook(ref_short: str, email: str, subj_text: str, body_text: st
         <!-- ref:{ref_short} -->
       </div>
     </body></html>"""
-    msg = target_folder.Items.Add("IPM.Note")
-    msg.To = email or ""
-    msg.Subject = f"{subj_text} [ref:{ref_short}]"
-    msg.BodyFormat = 2
-    msg.HTMLBody = body_html
-    msg.Save()
+    def _new(s):
+        # first COM call inside run(): a stale session (Outlook restarted) reconnects and retries
+        msg = s.drafts_subfolder(GROWTHFARM_SUBFOLDER).Items.Add("IPM.Note")
+        msg.To = email or ""
+        msg.Subject = f"{subj_text} [ref:{ref_short}]"
+        msg.BodyFormat = 2
+        msg.HTMLBody = body_html
+        return msg
+    msg = sess.run("draft.create", _new)
+    with sess.guard("draft.save"):
+        msg.Save()
     # Update results.csv cache for visibility in the grid
     try:
         upsert_result(ref_short, email or "", "", "", subj_text)
@@ -370,20 +584,6 @@ def draft_next_stage_from_config(ref: str, email: str, company: str,
 # NEW: Outlook SEND + results logging (updates analytics)
 # ============================================================
 
-# Cached Outlook COM app instance
-_OUTLOOK_APP = None
-
-def _get_outlook_app():
-    """Start or reuse the Outlook COM Application."""
-    global _OUTLOOK_APP
-    if _OUTLOOK_APP is not None:
-        return _OUTLOOK_APP
-    if not require_pywin32():
-        raise RuntimeError("pywin32 not installed. Run: pip install pywin32")
-    import win32com.client as win32
-    _OUTLOOK_APP = win32.Dispatch("Outlook.Application")
-    return _OUTLOOK_APP
-
 def send_email_via_outlook(
     to_email: str,
     subject: str,
@@ -396,9 +596,11 @@ def send_email_via_outlook(
     Returns True if .Send() succeeded, False otherwise.
     """
     try:
-        app = _get_outlook_app()
-        # 0 = olMailItem
-        mail = app.CreateItem(0)
+        if not require_pywin32():
+            raise RuntimeError("pywin32 not installed. Run: pip install pywin32")
+        sess = outlook_session()
+        # 0 = olMailItem; CreateItem runs inside run(), so a stale session reconnects and retries
+        mail = sess.run("send.create", lambda s: s.app().CreateItem(0))
         mail.To = to_email or ""
         mail.Subject = subject or ""
         if body_html:
@@ -415,7 +617,8 @@ def send_email_via_outlook(
             except Exception:
                 pass
 
-        mail.Send()
+        with sess.guard("send.send"):   # no retry: never send twice
+            mail.Send()
         return True
     except Exception as e:
         print(f"[campaigns] Outlook send failed: {e}")
@@ -570,27 +773,11 @@ def _campaign_subjects(key: str) -> List[str]:
     return [(s.get("subject") or "").strip() for s in steps if (s.get("subject") or "").strip()]
 
 def _campaign_stats(key: str) -> Tuple[int, int, float]:
-    """
-    Compute (sent, replies, resp_pct) for a campaign by matching Subject to any
-    of the campaign's step subjects.
-    """
-    subjects = set(_campaign_subjects(key))
-    if not subjects:
-        return (0, 0, 0.0)
+    """(sent, replies, resp_pct) for a campaign, from the shared single-pass CAMPAIGN_STATS."""
     try:
-        rows = load_results_rows_sorted()
+        return CAMPAIGN_STATS.get(key)
     except Exception:
-        rows = []
-    sent = replied = 0
-    for r in rows:
-        subj = (r.get("Subject","") or "").strip()
-        if subj in subjects:
-            if (r.get("DateSent") or "").strip():
-                sent += 1
-            if (r.get("DateReplied") or "").strip():
-                replied += 1
-    pct = 0.0 if sent == 0 else (replied / sent) * 100.0
-    return (sent, replied, pct)
+        return (0, 0, 0.0)
 
 def _load_last_selected() -> str:
     try:
@@ -1,19 +1,16 @@
 # gf_customers.py
 # Customers tab grid + persistence + simple "Add Order" helper
-# + live analytics (customer + pipeline) with a small file-change watcher.
+# + live analytics (customer + pipeline), read from the shared gf_analytics metrics service.
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Tuple
-from datetime import datetime, date
-import csv
+from typing import Optional
+from datetime import datetime
 import re
-from pathlib import Path
+
+from gf_sheet_utils import sync_sheet_rows
 
 from gf_store import (
     CUSTOMER_FIELDS,
-    CUSTOMERS_PATH,
-    ORDERS_PATH,
-    WARM_LEADS_PATH,
     load_customers_matrix,
     save_customers_matrix,
     append_order_row,
@@ -79,222 +76,21 @@ def _unbind_default_paste_and_rc(sheet: Sheet) -> None:
         pass
 
 # -----------------------------
-# Analytics core
+# Analytics (shared metrics service in gf_analytics)
 # -----------------------------
-def _parse_date(s: str) -> Optional[date]:
-    s = (s or "").strip()
-    if not s:
-        return None
-    fmts = ("%Y-%m-%d","%m/%d/%Y","%m-%d-%Y","%Y/%m/%d","%m/%d/%y","%m-%d-%y")
-    for fmt in fmts:
-        try:
-            return datetime.strptime(s, fmt).date()
-        except Exception:
-            pass
-    return None
-
-def _money_to_float(val: str) -> float:
-    s = (val or "").strip().replace(",", "").replace("$","")
-    try:
-        return float(s) if s else 0.0
-    except Exception:
-        return 0.0
-
-def _float_to_money(x) -> str:
-    try:
-        return f"{float(x):.2f}"
-    except Exception:
-        return "0.00"
-
-def _orders_by_company() -> Dict[str, List[Tuple[date, float]]]:
-    out: Dict[str, List[Tuple[date, float]]] = {}
-    if ORDERS_PATH.exists():
-        with ORDERS_PATH.open("r", encoding="utf-8", newline="") as f:
-            rdr = csv.DictReader(f)
-            for r in rdr:
-                comp = (r.get("Company","") or "").strip()
-                d = _parse_date(r.get("Order Date",""))
-                amt = _money_to_float(r.get("Amount",""))
-                if comp and d:
-                    out.setdefault(comp, []).append((d, amt))
-    return out
-
-def _warm_cost_by_company() -> Dict[str, float]:
-    """Sum Cost ($) from warm_leads.csv grouped by Company."""
-    out: Dict[str, float] = {}
-    if WARM_LEADS_PATH.exists():
-        with WARM_LEADS_PATH.open("r", encoding="utf-8", newline="") as f:
-            rdr = csv.DictReader(f)
-            for r in rdr:
-                comp = (r.get("Company","") or "").strip()
-                cost = _money_to_float(r.get("Cost ($)",""))
-                if comp and cost > 0:
-                    out[comp] = out.get(comp, 0.0) + cost
-    return out
-
-def _load_customers_rows() -> List[Dict[str,str]]:
-    rows: List[Dict[str,str]] = []
-    if CUSTOMERS_PATH.exists():
-        with CUSTOMERS_PATH.open("r", encoding="utf-8", newline="") as f:
-            rdr = csv.DictReader(f)
-            for r in rdr:
-                rows.append(r)
-    return rows
-
-def _month_bounds(today: date) -> Tuple[date, date]:
-    start = today.replace(day=1)
-    if start.month == 12:
-        nxt = start.replace(year=start.year+1, month=1, day=1)
-    else:
-        nxt = start.replace(month=start.month+1, day=1)
-    end = nxt  # exclusive
-    return start, end
-
-def _in_month(d: Optional[date], start: date, end: date) -> bool:
-    return (d is not None) and (start <= d < end)
-
-def _compute_customer_analytics() -> Dict[str,str]:
-    customers = _load_customers_rows()
-    orders_map = _orders_by_company()
-    warm_cost = _warm_cost_by_company()
-
-    total_sales = 0.0
-    for comp, orders in orders_map.items():
-        for _d, amt in orders:
-            total_sales += (amt or 0.0)
-
-    cltvs = [ _money_to_float(r.get("CLTV","")) for r in customers ]
-    avg_ltv = (sum(cltvs) / len(cltvs)) if cltvs else 0.0
-
-    cost_vals = []
-    cust_companies = {(r.get("Company","") or "").strip() for r in customers if (r.get("Company","") or "").strip()}
-    for comp in cust_companies:
-        if warm_cost.get(comp, 0.0) > 0:
-            cost_vals.append(warm_cost[comp])
-    avg_cac = (sum(cost_vals) / len(cost_vals)) if cost_vals else 0.0
-
-    ratio_str = "1 : 0"
-    if avg_cac > 0:
-        ratio = avg_ltv / avg_cac
-        ratio_str = f"1 : {ratio:.1f}"
-
-    reorder_count = 0
-    cust_count = 0
-    for comp in cust_companies:
-        cnt = len(orders_map.get(comp, []))
-        if cnt >= 2:
-            reorder_count += 1
-        if cnt >= 1 or comp:
-            cust_count += 1
-    reorder_rate = (reorder_count / cust_count * 100.0) if cust_count > 0 else 0.0
-
-    return {
-        "total_sales": f"{total_sales:,.2f}",
-        "avg_cac": f"{avg_cac:,.2f}",
-        "avg_ltv": f"{avg_ltv:,.2f}",
-        "ratio": ratio_str,
-        "reorder": f"{reorder_rate:.0f}%",
-    }
-
-def _compute_pipeline_analytics() -> Dict[str,str]:
-    warm_total = 0
-    if WARM_LEADS_PATH.exists():
-        with WARM_LEADS_PATH.open("r", encoding="utf-8", newline="") as f:
-            rdr = csv.DictReader(f)
-            for r in rdr:
-                if (r.get("Company","") or "").strip():
-                    warm_total += 1
-
-    customers = _load_customers_rows()
-    orders_map = _orders_by_company()
-
-    today = datetime.now().date()
-    m_start, m_end = _month_bounds(today)
-    new_this_month = 0
-    for r in customers:
-        comp = (r.get("Company","") or "").strip()
-        ords = orders_map.get(comp, [])
-        first_date = min([d for (d, _amt) in ords], default=None)
-        if _in_month(first_date, m_start, m_end):
-            new_this_month += 1
-
-    total_customers = len({(r.get("Company","") or "").strip() for r in customers if (r.get("Company","") or "").strip()})
-    close_rate = (total_customers / warm_total * 100.0) if warm_total > 0 else 0.0
-
-    return {
-        "warms": str(warm_total),
-        "newcus": str(new_this_month),
-        "close": f"{close_rate:.0f}%",
-    }
-
 def update_customer_analytics_in_ui(window) -> None:
-    an = _compute_customer_analytics()
-    try: window["-AN_TOTALSALES-"].update(an["total_sales"])
-    except Exception: pass
-    try: window["-AN_CAC-"].update(an["avg_cac"])
-    except Exception: pass
-    try: window["-AN_LTV-"].update(an["avg_ltv"])
-    except Exception: pass
-    try: window["-AN_CACLTV-"].update(an["ratio"])
-    except Exception: pass
-    try: window["-AN_REORDER-"].update(an["reorder"])
-    except Exception: pass
-
-    pl = _compute_pipeline_analytics()
-    try: window["-AN_WARMS-"].update(pl["warms"])
-    except Exception: pass
-    try: window["-AN_NEWCUS-"].update(pl["newcus"])
-    except Exception: pass
-    try: window["-AN_CLOSERATE-"].update(pl["close"])
-    except Exception: pass
-
-# -----------------------------
-# Lightweight watcher (recompute analytics)
-# -----------------------------
-_LAST_MTIMES = {"customers": None, "orders": None, "warm": None}
-_WATCH_STARTED = False
-_WATCH_INTERVAL_MS = 2000
-
-def _mtime_or_none(p: Path) -> Optional[float]:
+    """Customer + pipeline labels come from gf_analytics.METRICS (same formulas, one cache)."""
     try:
-        return p.stat().st_mtime
+        from gf_analytics import refresh_analytics
+        refresh_analytics(window)
     except Exception:
-        return None
-
-def _changed() -> bool:
-    changed = False
-    for key, path in (("customers", CUSTOMERS_PATH), ("orders", ORDERS_PATH), ("warm", WARM_LEADS_PATH)):
-        mt = _mtime_or_none(path)
-        prev = _LAST_MTIMES.get(key)
-        if prev is None:
-            _LAST_MTIMES[key] = mt
-        else:
-            if mt is not None and mt != prev:
-                _LAST_MTIMES[key] = mt
-                changed = True
-    return changed
+        pass
 
 def _start_watch(window):
-    global _WATCH_STARTED
-    if _WATCH_STARTED:
-        return
-    _WATCH_STARTED = True
-
-    for key, path in (("customers", CUSTOMERS_PATH), ("orders", ORDERS_PATH), ("warm", WARM_LEADS_PATH)):
-        _LAST_MTIMES[key] = _mtime_or_none(path)
-
-    def _tick():
-        try:
-            if _changed():
-                update_customer_analytics_in_ui(window)
-        finally:
-            try:
-                window.TKroot.after(_WATCH_INTERVAL_MS, _tick)
-            except Exception:
-                pass
-
+    """gf_analytics owns the file watch for the -AN_* labels (subscribes once per process)."""
     try:
-        window.TKroot.after(_WATCH_INTERVAL_MS, _tick)
+        from gf_analytics import init_analytics
+        init_analytics(window)
     except Exception:
         pass
 
@@ -389,9 +185,7 @@ def handle_customers_events(window, event, values):
     elif event == "-CUST_RELOAD-":
         mtx = load_customers_matrix()
         if mtx:
-            _SHEET_CUSTOMERS.set_sheet_data(mtx, reset_col_positions=True, reset_row_positions=True)
-            _SHEET_CUSTOMERS.headers(list(CUSTOMER_FIELDS))
-            _SHEET_CUSTOMERS.refresh()
+            sync_sheet_rows(_SHEET_CUSTOMERS, mtx, len(CUSTOMER_FIELDS))
             window["-CUST_STATUS-"].update("Reloaded.")
         else:
             window["-CUST_STATUS-"].update("No data found.")
@@ -0,0 +1,509 @@
+# gf_db.py
+# Optional SQLite backend for gf_store (enable with  [app] storage=sqlite  in app.ini).
+# - One WAL-mode database next to the CSVs (growthfarm.db)
+# - results / campaigns / customers / orders tables keyed on Ref or Company, with
+#   Email/Company indexes: a single-row update is a B-tree lookup, not a file rewrite
+# - The CSVs stay as export mirrors (other modules still read them); flush() re-exports
+#   only the tables that changed, gf_ui_logic calls it when idle and on exit
+# - First use of a table imports its CSV. A mirror edited outside gf_store (Excel, the
+#   append-only writers in gf_campaigns/gf_helpers) is re-imported before the next
+#   read/write -- only the new tail when the file was appended to.
+#
+# Only gf_store should import this module (lazily, via gf_store.sqlite_backend()).
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from gf_dates import parse_datetime
+from gf_store import (
+    APP_DIR,
+    RESULTS_PATH,
+    CAMPAIGNS_PATH,
+    CUSTOMERS_PATH,
+    ORDERS_PATH,
+    RESULTS_FIELDS,
+    RESULTS_EXTRA_FIELDS,
+    CAMPAIGNS_HEADERS,
+    CUSTOMER_FIELDS,
+    ORDER_FIELDS,
+    _atomic_write_csv,
+    _backup,
+    _file_sig,
+    _company_key,
+    _money_to_float,
+)
+
+DB_PATH = APP_DIR / "growthfarm.db"
+
+_TAIL_BYTES = 64     # bytes remembered from the end of a mirror to recognise a pure append
+_ALL = "*"           # dirty marker: the whole table was replaced locally
+
+
+def _q(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def _ref_key(ref) -> str:
+    return (ref or "").strip().lower()
+
+
+def _local_day(s) -> Optional[str]:
+    dt = parse_datetime(s)
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone()
+    return dt.date().isoformat()
+
+
+class _Table:
+    def __init__(self, name: str, path: Path, fields: List[str], key_field: str,
+                 key_fn: Callable[[str], str], *, extra_fields: Iterable[str] = (),
+                 indexes: Iterable[str] = (), day_field: Optional[str] = None,
+                 amount_field: Optional[str] = None, backup: bool = False):
+        self.name = name
+        self.path = path
+        self.fields = list(fields)
+        self.extra_fields = [f for f in extra_fields if f not in self.fields]
+        self.columns = self.fields + self.extra_fields
+        self.key_field = key_field
+        self.key_fn = key_fn
+        self.indexes = tuple(indexes)
+        self.day_field = day_field
+        self.amount_field = amount_field
+        self.backup = backup
+
+    def key_of(self, row: Dict[str, str]) -> str:
+        return self.key_fn(row.get(self.key_field, ""))
+
+    def values(self, row: Dict[str, str]) -> List[object]:
+        day = _local_day(row.get(self.day_field, "")) if self.day_field else None
+        amt = _money_to_float(row.get(self.amount_field, "")) if self.amount_field else None
+        return [self.key_of(row), day, amt] + [str(row.get(c, "") or "") for c in self.columns]
+
+    def as_dict(self, rec) -> Dict[str, str]:
+        return {c: rec[c] for c in self.columns}
+
+
+_TABLES: Dict[str, _Table] = {
+    "results": _Table("results", RESULTS_PATH, RESULTS_FIELDS, "Ref", _ref_key,
+                      extra_fields=RESULTS_EXTRA_FIELDS, indexes=("Email", "Company"),
+                      day_field="DateSent"),
+    "campaigns": _Table("campaigns", CAMPAIGNS_PATH, CAMPAIGNS_HEADERS, "Ref", _ref_key,
+                        indexes=("Email", "Company"), backup=True),
+    "customers": _Table("customers", CUSTOMERS_PATH, CUSTOMER_FIELDS, "Company", _company_key,
+                        indexes=("Email",), backup=True),
+    "orders": _Table("orders", ORDERS_PATH, ORDER_FIELDS, "Company", _company_key,
+                     day_field="Order Date", amount_field="Amount"),
+}
+
+# results keep gf_store's "newest first" order; everything else keeps file order
+_ORDER_BY = {"results": f'{_q("DateReplied")} DESC, {_q("DateSent")} DESC, _pos'}
+
+_LOCK = threading.RLock()
+_CONN: Optional[sqlite3.Connection] = None
+
+
+# ----------------------------
+# Connection / schema
+# ----------------------------
+def _create_schema(c: sqlite3.Connection) -> None:
+    c.execute("CREATE TABLE IF NOT EXISTS _mirror (tbl TEXT PRIMARY KEY, mtime REAL, size INTEGER, header TEXT, tail BLOB)")
+    c.execute("CREATE TABLE IF NOT EXISTS _dirty (tbl TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tbl, key)) WITHOUT ROWID")
+    for t in _TABLES.values():
+        cols = ", ".join(f"{_q(col)} TEXT NOT NULL DEFAULT ''" for col in t.columns)
+        c.execute(f"CREATE TABLE IF NOT EXISTS {t.name} (_pos INTEGER NOT NULL, _key TEXT NOT NULL, _day TEXT, _amount REAL, {cols})")
+        c.execute(f"CREATE INDEX IF NOT EXISTS ix_{t.name}_key ON {t.name} (_key, _pos)")
+        for col in t.indexes:
+            c.execute(f"CREATE INDEX IF NOT EXISTS ix_{t.name}_{col.lower()} ON {t.name} ({_q(col)} COLLATE NOCASE)")
+        if t.day_field:
+            c.execute(f"CREATE INDEX IF NOT EXISTS ix_{t.name}_day ON {t.name} (_day)")
+
+
+def _conn() -> sqlite3.Connection:
+    global _CONN
+    if _CONN is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        c = sqlite3.connect(str(DB_PATH), check_same_thread=False, isolation_level=None, timeout=10)
+        c.row_factory = sqlite3.Row
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        _create_schema(c)
+        _CONN = c
+    return _CONN
+
+
+@contextmanager
+def _tx():
+    with _LOCK:
+        c = _conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            yield c
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        c.execute("COMMIT")
+
+
+def close() -> None:
+    global _CONN
+    with _LOCK:
+        if _CONN is not None:
+            try:
+                _CONN.close()
+            finally:
+                _CONN = None
+
+
+# ----------------------------
+# CSV mirror bookkeeping
+# ----------------------------
+def _read_tail(path: Path, size: int) -> bytes:
+    try:
+        with path.open("rb") as f:
+            f.seek(max(0, size - _TAIL_BYTES))
+            return f.read(min(size, _TAIL_BYTES))
+    except Exception:
+        return b""
+
+
+def _set_mirror(c: sqlite3.Connection, t: _Table, header: Optional[List[str]]) -> None:
+    sig = _file_sig(t.path)
+    mtime, size = sig if sig else (None, None)
+    tail = _read_tail(t.path, size) if size else b""
+    c.execute("INSERT OR REPLACE INTO _mirror (tbl, mtime, size, header, tail) VALUES (?,?,?,?,?)",
+              (t.name, mtime, size, json.dumps(header) if header else None, tail))
+
+
+def _dirty_keys(c: sqlite3.Connection, t: _Table) -> Set[str]:
+    return {r[0] for r in c.execute("SELECT key FROM _dirty WHERE tbl=?", (t.name,))}
+
+
+def _mark_dirty(c: sqlite3.Connection, t: _Table, *keys: str) -> None:
+    c.executemany("INSERT OR IGNORE INTO _dirty (tbl, key) VALUES (?,?)", [(t.name, k) for k in keys])
+
+
+def _insert_rows(c: sqlite3.Connection, t: _Table, rows: Iterable[Dict[str, str]], skip: Set[str]) -> None:
+    base = c.execute(f"SELECT COALESCE(MAX(_pos), -1) + 1 FROM {t.name}").fetchone()[0]
+    marks = ",".join("?" * (4 + len(t.columns)))
+    batch = []
+    for r in rows:
+        vals = t.values(r)
+        if vals[0] in skip:
+            continue
+        batch.append([base + len(batch)] + vals)
+    if batch:
+        c.executemany(f"INSERT INTO {t.name} VALUES ({marks})", batch)
+
+
+def _import_full(c: sqlite3.Connection, t: _Table) -> None:
+    with t.path.open("r", encoding="utf-8", newline="") as f:
+        rdr = csv.DictReader(f)
+        rows = list(rdr)
+        header = list(rdr.fieldnames or [])
+    dirty = _dirty_keys(c, t)
+    if _ALL not in dirty:
+        # rows changed locally since the last export win; everything else comes from the file
+        if dirty:
+            stale = [(rid,) for rid, k in c.execute(f"SELECT rowid, _key FROM {t.name}") if k not in dirty]
+            c.executemany(f"DELETE FROM {t.name} WHERE rowid=?", stale)
+        else:
+            c.execute(f"DELETE FROM {t.name}")
+        _insert_rows(c, t, rows, dirty)
+    _set_mirror(c, t, header)
+
+
+def _import_tail(c: sqlite3.Connection, t: _Table, offset: int, header: List[str]) -> bool:
+    try:
+        with t.path.open("rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except Exception:
+        return False
+    if not chunk.endswith(b"\n"):
+        return False
+    rows = [dict(zip(header, rec)) for rec in csv.reader(io.StringIO(chunk.decode("utf-8", "replace"))) if rec]
+    dirty = _dirty_keys(c, t)
+    if _ALL not in dirty:
+        _insert_rows(c, t, rows, dirty)
+    _set_mirror(c, t, header)
+    return True
+
+
+def _sync(c: sqlite3.Connection, t: _Table) -> None:
+    """Bring the table in line with its CSV mirror if the file changed behind our back."""
+    sig = _file_sig(t.path)
+    m = c.execute("SELECT mtime, size, header, tail FROM _mirror WHERE tbl=?", (t.name,)).fetchone()
+    if sig is None:
+        if m is None:
+            _set_mirror(c, t, None)
+        elif m["size"] is not None:
+            _mark_dirty(c, t, _ALL)  # mirror deleted: recreate it on the next flush
+        return
+    if m is not None and (m["mtime"], m["size"]) == sig:
+        return
+    if (m is not None and m["size"] and m["header"] and sig[1] > m["size"]
+            and _read_tail(t.path, m["size"]) == (m["tail"] or b"")):
+        if _import_tail(c, t, m["size"], json.loads(m["header"])):
+            return
+    _import_full(c, t)
+
+
+def _mirror_header(c: sqlite3.Connection, t: _Table, grow: bool = False) -> List[str]:
+    """The mirror's columns; grow=True (full export) also adds extra columns some row filled in."""
+    m = c.execute("SELECT header FROM _mirror WHERE tbl=?", (t.name,)).fetchone()
+    old = json.loads(m["header"]) if m and m["header"] else []
+    return t.fields + [x for x in t.extra_fields if x in old or (grow and
+                       c.execute(f"SELECT 1 FROM {t.name} WHERE {_q(x)} != '' LIMIT 1").fetchone())]
+
+
+def _export(c: sqlite3.Connection, t: _Table, path: Path) -> List[str]:
+    header = _mirror_header(c, t, grow=True)
+    cols = ", ".join(_q(h) for h in header)
+    order = _ORDER_BY.get(t.name, "_pos")
+    rows = c.execute(f"SELECT {cols} FROM {t.name} ORDER BY {order}")
+    if t.backup and path == t.path:
+        _backup(path)
+    _atomic_write_csv(path, header, (tuple(r) for r in rows))
+    return header
+
+
+# ----------------------------
+# Row API (used by gf_store)
+# ----------------------------
+def _find(c: sqlite3.Connection, t: _Table, key: str):
+    order = _ORDER_BY.get(t.name, "_pos")
+    return c.execute(f"SELECT rowid, * FROM {t.name} WHERE _key=? ORDER BY {order} LIMIT 1", (key,)).fetchone()
+
+
+def rows(name: str) -> List[Dict[str, str]]:
+    t = _TABLES[name]
+    with _tx() as c:
+        _sync(c, t)
+        order = _ORDER_BY.get(t.name, "_pos")
+        return [t.as_dict(r) for r in c.execute(f"SELECT * FROM {t.name} ORDER BY {order}")]
+
+
+def find(name: str, key: str) -> Optional[Dict[str, str]]:
+    t = _TABLES[name]
+    with _tx() as c:
+        _sync(c, t)
+        rec = _find(c, t, t.key_fn(key))
+        return t.as_dict(rec) if rec else None
+
+
+def update(name: str, key: str, fn: Callable[[Optional[Dict[str, str]]], Optional[Dict[str, str]]]) -> None:
+    """
+    Read-modify-write one row by key. `fn` gets the current row (or None) and returns the
+    new row, or None to leave the table untouched.
+    """
+    t = _TABLES[name]
+    k = t.key_fn(key)
+    with _tx() as c:
+        _sync(c, t)
+        rec = _find(c, t, k)
+        new = fn(t.as_dict(rec) if rec else None)
+        if new is None:
+            return
+        vals = t.values(new)
+        if rec is not None:
+            sets = ", ".join(["_key=?", "_day=?", "_amount=?"] + [f"{_q(col)}=?" for col in t.columns])
+            c.execute(f"UPDATE {t.name} SET {sets} WHERE rowid=?", vals + [rec["rowid"]])
+        else:
+            _insert_rows(c, t, [new], set())
+        _mark_dirty(c, t, k, vals[0])
+
+
+def delete(name: str, key: str) -> None:
+    t = _TABLES[name]
+    k = t.key_fn(key)
+    with _tx() as c:
+        _sync(c, t)
+        if c.execute(f"DELETE FROM {t.name} WHERE _key=?", (k,)).rowcount:
+            _mark_dirty(c, t, k)
+
+
+def replace_all(name: str, new_rows: Iterable[Dict[str, str]], *, export: bool = True) -> None:
+    """Swap the whole table (grid saves). Exported straight away unless export=False."""
+    t = _TABLES[name]
+    with _tx() as c:
+        _sync(c, t)
+        c.execute(f"DELETE FROM {t.name}")
+        _insert_rows(c, t, new_rows, set())
+        if export:
+            _set_mirror(c, t, _export(c, t, t.path))
+            c.execute("DELETE FROM _dirty WHERE tbl=?", (t.name,))
+        else:
+            _mark_dirty(c, t, _ALL)
+
+
+def count(name: str) -> int:
+    t = _TABLES[name]
+    with _tx() as c:
+        _sync(c, t)
+        return c.execute(f"SELECT COUNT(*) FROM {t.name}").fetchone()[0]
+
+
+def page(name: str, offset: int, limit: int) -> List[Dict[str, str]]:
+    """Rows [offset, offset + limit) in table order (paged grids)."""
+    t = _TABLES[name]
+    with _tx() as c:
+        _sync(c, t)
+        order = _ORDER_BY.get(t.name, "_pos")
+        cur = c.execute(f"SELECT * FROM {t.name} ORDER BY {order} LIMIT ? OFFSET ?", (limit, offset))
+        return [t.as_dict(r) for r in cur]
+
+
+def replace_range(name: str, offset: int, old_n: int, new_rows: Iterable[Dict[str, str]]) -> None:
+    """
+    Swap the rows [offset, offset + old_n) of a _pos-ordered table for `new_rows` (a grid
+    page save). Later rows are moved up/down by shifting their _pos; exported on flush().
+    """
+    t = _TABLES[name]
+    with _tx() as c:
+        _sync(c, t)
+        old = c.execute(f"SELECT rowid, _pos, _key FROM {t.name} ORDER BY _pos LIMIT ? OFFSET ?",
+                        (old_n, offset)).fetchall() if old_n > 0 else []
+        nxt = c.execute(f"SELECT _pos FROM {t.name} ORDER BY _pos LIMIT 1 OFFSET ?",
+                        (offset + len(old),)).fetchone()
+        if old:
+            base = old[0]["_pos"]
+        elif nxt is not None:
+            base = nxt[0]
+        else:
+            base = c.execute(f"SELECT COALESCE(MAX(_pos), -1) + 1 FROM {t.name}").fetchone()[0]
+        c.executemany(f"DELETE FROM {t.name} WHERE rowid=?", [(r["rowid"],) for r in old])
+        batch = [[base + i] + t.values(r) for i, r in enumerate(new_rows)]
+        if nxt is not None and base + len(batch) > nxt[0]:
+            c.execute(f"UPDATE {t.name} SET _pos = _pos + ? WHERE _pos >= ?", (base + len(batch) - nxt[0], nxt[0]))
+        if batch:
+            marks = ",".join("?" * (4 + len(t.columns)))
+            c.executemany(f"INSERT INTO {t.name} VALUES ({marks})", batch)
+        _mark_dirty(c, t, *({r["_key"] for r in old} | {b[1] for b in batch}))
+
+
+def append(name: str, row: Dict[str, str]) -> None:
+    """Append-through for log-style tables: one CSV line + one row, mirror stays in sync."""
+    t = _TABLES[name]
+    with _tx() as c:
+        _sync(c, t)
+        header = _mirror_header(c, t)
+        if not t.path.exists():
+            _atomic_write_csv(t.path, header, [])
+        with t.path.open("a", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerow([row.get(h, "") for h in header])
+        _insert_rows(c, t, [row], set())
+        _set_mirror(c, t, header)
+
+
+def flush() -> List[str]:
+    """Export every table with local changes to its CSV mirror. Returns the tables written."""
+    written = []
+    with _LOCK:
+        for t in _TABLES.values():
+            with _tx() as c:
+                if not c.execute("SELECT 1 FROM _dirty WHERE tbl=? LIMIT 1", (t.name,)).fetchone():
+                    continue
+                _sync(c, t)
+                _set_mirror(c, t, _export(c, t, t.path))
+                c.execute("DELETE FROM _dirty WHERE tbl=?", (t.name,))
+                written.append(t.name)
+    return written
+
+
+def export_csv(name: str, path: Path) -> Path:
+    """Write a CSV copy of a table anywhere (compatibility / hand-off to other tools)."""
+    t = _TABLES[name]
+    path = Path(path)
+    with _tx() as c:
+        _sync(c, t)
+        _export(c, t, path)
+    return path
+
+
+# ----------------------------
+# Aggregates (used by gf_analytics)
+# ----------------------------
+def data_version() -> int:
+    """Rows changed through this connection so far (cache key for gf_analytics.METRICS)."""
+    with _LOCK:
+        return _conn().total_changes
+
+
+def order_totals() -> Dict[str, object]:
+    """Total sales plus order count per company key."""
+    t = _TABLES["orders"]
+    with _tx() as c:
+        _sync(c, t)
+        total = c.execute("SELECT COALESCE(SUM(_amount), 0) FROM orders").fetchone()[0]
+        by_company = {k: n for k, n in c.execute("SELECT _key, COUNT(*) FROM orders GROUP BY _key")}
+    return {"total": float(total or 0.0), "count_by_company": by_company}
+
+
+def sales_between(start: date, end: date) -> float:
+    """Sum of order amounts with start <= order date <= end."""
+    t = _TABLES["orders"]
+    with _tx() as c:
+        _sync(c, t)
+        v = c.execute("SELECT COALESCE(SUM(_amount), 0) FROM orders WHERE _day BETWEEN ? AND ?",
+                      (start.isoformat(), end.isoformat())).fetchone()[0]
+    return float(v or 0.0)
+
+
+def emails_sent_on(day: date) -> int:
+    """Distinct (To, Subject) sends dated `day` -- same de-dupe as the CSV analytics."""
+    t = _TABLES["results"]
+    with _tx() as c:
+        _sync(c, t)
+        return int(c.execute(
+            f"SELECT COUNT(DISTINCT lower(trim({_q('To')})) || char(31) || trim({_q('Subject')})) "
+            f"FROM results WHERE _day=?", (day.isoformat(),)).fetchone()[0] or 0)
+
+
+def emails_by_day() -> Dict[date, int]:
+    """emails_sent_on() for every day at once: {day: distinct (To, Subject) sends}."""
+    t = _TABLES["results"]
+    with _tx() as c:
+        _sync(c, t)
+        cur = c.execute(
+            f"SELECT _day, COUNT(DISTINCT lower(trim({_q('To')})) || char(31) || trim({_q('Subject')})) "
+            f"FROM results WHERE _day IS NOT NULL GROUP BY _day")
+        return {date.fromisoformat(d): int(n) for d, n in cur}
+
+
+def orders_by_day() -> Dict[date, Tuple[int, float]]:
+    """{order day: (order count, amount sum)}."""
+    t = _TABLES["orders"]
+    with _tx() as c:
+        _sync(c, t)
+        cur = c.execute("SELECT _day, COUNT(*), COALESCE(SUM(_amount), 0) FROM orders "
+                        "WHERE _day IS NOT NULL GROUP BY _day")
+        return {date.fromisoformat(d): (int(n), float(a or 0.0)) for d, n, a in cur}
+
+
+def customer_summary() -> Dict[str, float]:
+    """Customer count, CLTV sum, and how many reorder (flagged Yes or 2+ orders)."""
+    with _tx() as c:
+        _sync(c, _TABLES["customers"])
+        _sync(c, _TABLES["orders"])
+        n, cltv, reorder = c.execute(
+            f"""
+            SELECT COUNT(*),
+                   COALESCE(SUM(CAST(REPLACE(REPLACE(trim(cu.{_q('CLTV')}), ',', ''), '$', '') AS REAL)), 0),
+                   COALESCE(SUM(CASE WHEN lower(trim(cu.{_q('Reorder?')})) IN ('yes','y','true','1')
+                                       OR COALESCE(o.n, 0) >= 2 THEN 1 ELSE 0 END), 0)
+            FROM customers cu
+            LEFT JOIN (SELECT _key, COUNT(*) AS n FROM orders GROUP BY _key) o ON o._key = cu._key
+            """
+        ).fetchone()
+    return {"customers": int(n or 0), "cltv_total": float(cltv or 0.0), "with_reorder": int(reorder or 0)}
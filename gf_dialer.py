@@ -1,6 +1,7 @@
 # gf_dialer.py
 from __future__ import annotations
 import csv
+import math
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict
@@ -25,6 +26,9 @@ from gf_store import (
 
 # Warm module: live-append & UI update when green call is confirmed
 from gf_warm import add_warm_lead_from_dialer
+from gf_sheet_utils import insert_sheet_rows
+from gf_pager import CsvPager, column_mapper
+from gf_watch import note_own_write
 
 # --------------------------------
 # Small file helpers (no duplicates)
@@ -118,6 +122,15 @@ def save_dialer_leads_matrix(matrix: List[List[str]]) -> None:
     headers = HEADER_FIELDS + [EMOJI_GREEN, EMOJI_GRAY, EMOJI_RED] + [f"Note{i}" for i in range(1, 9)]
     _atomic_write_csv(DIALER_LEADS_PATH, headers, matrix)
 
+# Paged access for the dialer grid (see gf_pager): same column mapping as the loader above
+DIALER_HEADERS = HEADER_FIELDS + [EMOJI_GREEN, EMOJI_GRAY, EMOJI_RED] + [f"Note{i}" for i in range(1, 9)]
+DIALER_PAGER = CsvPager(
+    DIALER_LEADS_PATH, DIALER_HEADERS,
+    mapper=column_mapper(DIALER_HEADERS, aliases={EMOJI_RED: [EMOJI_RED_LEGACY]},
+                         defaults={EMOJI_GREEN: "○", EMOJI_GRAY: "○", EMOJI_RED: "○"}),
+    on_write=note_own_write,
+)
+
 # --------------------------------
 # Call persistence + warm / no-interest
 # --------------------------------
@@ -184,10 +197,17 @@ class DialerController:
 
     SOFT_BLUE = "#CCE5FF"  # tksheet shows selection blue; we don't paint blue ourselves
 
-    def __init__(self, window, sheet, header_fields=None):
+    # row tints are painted for the visible rows only (+ overscan), lazily on scroll
+    PAINT_OVERSCAN = 30
+    PAINT_FALLBACK_ROWS = 200   # when the viewport can't be read
+    PAINT_DELAY_MS = 40         # coalesces a burst of scroll events into one paint
+
+    def __init__(self, window, sheet, header_fields=None, save_matrix=None):
         self.window = window
         self.sheet = sheet
         self.header_fields = header_fields or HEADER_FIELDS
+        # grid -> CSV writer; the paged grid passes its page save (the sheet holds one page)
+        self.save_matrix = save_matrix or save_dialer_leads_matrix
         self.cols = self._cols_info()
         self.state = {
             "row": None,
@@ -197,10 +217,16 @@ class DialerController:
             "gray_rows": set(),         # rows persisted as gray (confirmed)
             "row_preview_outcome": {},  # row -> preview intent (no row tint)
         }
+        # row-state index: "gray" / "" per row, from the confirmed middle ● dot
+        self.row_state: List[str] = []
+        self._painted: Dict[int, str] = {}   # row -> tint currently applied in the sheet
+        self._painted_range = None
+        self._paint_job = None
         # initialize outcome button visuals as "none selected"
         self._style_outcome_buttons(active=None)
         # paint any previously gray rows
         self.repaint_all_rows()
+        self._bind_viewport_paint()
 
     # ---------- layout helpers ----------
     def _cols_info(self):
@@ -295,23 +321,108 @@ class DialerController:
         except Exception:
             pass
 
+    # ----- row-state index + viewport painting -----
+    def _state_of(self, row) -> str:
+        # only a confirmed middle (gray) dot tints a row; green/red rows are removed on confirm
+        c = self.cols["first_dot"] + 1
+        return "gray" if c < len(row) and (row[c] or "").strip() == "●" else ""
+
+    def _reindex(self) -> None:
+        """Rebuild the per-row state index from the sheet data (one data read, no Tk paint calls)."""
+        try:
+            data = self.sheet.get_sheet_data() or []
+        except Exception:
+            data = []
+        self.row_state = [self._state_of(row) for row in data]
+        self.state["gray_rows"] = {r for r, st in enumerate(self.row_state) if st == "gray"}
+
+    def _set_row_state(self, r: int, st: str) -> None:
+        while len(self.row_state) <= r:
+            self.row_state.append("")
+        self.row_state[r] = st
+        if st == "gray":
+            self.state["gray_rows"].add(r)
+        else:
+            self.state["gray_rows"].discard(r)
+
+    def _visible_range(self):
+        total = len(self.row_state)
+        if total <= 0:
+            return (0, 0)
+        try:
+            top, bottom = self.sheet.MT.yview()
+            first = max(0, int(top * total) - self.PAINT_OVERSCAN)
+            last = min(total, int(math.ceil(bottom * total)) + self.PAINT_OVERSCAN)
+        except Exception:
+            first, last = 0, min(total, self.PAINT_FALLBACK_ROWS)
+        return (first, last)
+
+    def _paint_rows(self, rows) -> bool:
+        """Bring the tint of `rows` in line with the index: one highlight call per state."""
+        groups: Dict[str, List[int]] = {}
+        for r in rows:
+            st = self.row_state[r] if r < len(self.row_state) else ""
+            if self._painted.get(r, "") != st:
+                groups.setdefault(st, []).append(r)
+        for st, rs in groups.items():
+            try:
+                if st:
+                    self.sheet.highlight_rows(rows=rs, bg=self.ROW_BG[st], fg=self.ROW_FG[st])
+                else:
+                    self.sheet.highlight_rows(rows=rs, bg=None, fg=None)
+            except Exception:
+                continue
+            for r in rs:
+                if st:
+                    self._painted[r] = st
+                else:
+                    self._painted.pop(r, None)
+        return bool(groups)
+
+    def _paint_viewport(self, force: bool = False) -> None:
+        rng = self._visible_range()
+        if not force and rng == self._painted_range:
+            return
+        self._painted_range = rng
+        if self._paint_rows(range(*rng)):
+            try:
+                self.sheet.refresh()
+            except Exception:
+                pass
+
+    def _schedule_paint(self, _evt=None) -> None:
+        if self._paint_job is not None:
+            return
+        def _run():
+            self._paint_job = None
+            self._paint_viewport()
+        try:
+            self._paint_job = self.sheet.after(self.PAINT_DELAY_MS, _run)
+        except Exception:
+            self._paint_job = None
+
+    def _bind_viewport_paint(self) -> None:
+        """Repaint lazily when the viewport moves (wheel, drag, keys, resize); tick() is the backstop."""
+        targets = (getattr(self.sheet, "MT", None), getattr(self.sheet, "RI", None),
+                   getattr(self.sheet, "yscroll", None))
+        for w in filter(None, targets):
+            for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Configure>",
+                        "<KeyRelease>", "<B1-Motion>", "<ButtonRelease-1>"):
+                try:
+                    w.bind(seq, self._schedule_paint, add="+")
+                except Exception:
+                    pass
+
     # ----- base paint helper (white or persisted gray) -----
     def _apply_base_row_paint(self, r: int) -> None:
         """Apply the correct non-preview paint for a row."""
         try:
-            middle_dot = (self.sheet.get_cell_data(r, self.cols["first_dot"] + 1) or "").strip()
-        except Exception:
-            middle_dot = ""
-        is_gray = (middle_dot == "●")
-        try:
-            if is_gray:
-                self.sheet.highlight_rows(rows=[r], bg=self.ROW_BG["gray"], fg=self.ROW_FG["gray"])
-                self.state["gray_rows"].add(r)
-            else:
-                self.sheet.highlight_rows(rows=[r], bg=None, fg=None)
-                self.state["gray_rows"].discard(r)
+            row = self.sheet.get_row_data(r) or []
         except Exception:
-            pass
+            row = []
+        self._set_row_state(r, self._state_of(row))
+        self._painted.pop(r, None)   # force: the preview may have touched this row
+        self._paint_rows([r])
 
     # ----- outcome button visuals -----
     def _style_outcome_buttons(self, active: Optional[str]) -> None:
@@ -396,20 +507,29 @@ class DialerController:
         self.state["last_focus_row"] = r  # blue selection is handled by tksheet
 
     def repaint_all_rows(self) -> None:
+        """
+        Re-index row states from the data, drop every highlight (lingering dot previews
+        included) in one call, then paint only the rows in view.
+        """
+        self._reindex()
         try:
-            total = self.sheet.get_total_rows()
+            self.sheet.dehighlight_all()
         except Exception:
-            total = 0
-
-        self.state["gray_rows"].clear()
-        for r in range(total):
-            # clear lingering dot bg highlights
-            for i in range(3):
+            # older tksheet: clear what we know we painted (+ preview dots)
+            base = self.cols["first_dot"]
+            for r in list(self._painted) + list(self.state["row_preview_outcome"]):
+                for i in range(3):
+                    try:
+                        self.sheet.highlight_cells(row=r, column=base + i, bg=None, fg=None)
+                    except Exception:
+                        pass
+            if self._painted:
                 try:
-                    self.sheet.highlight_cells(row=r, column=self.cols["first_dot"] + i, bg=None, fg=None)
+                    self.sheet.highlight_rows(rows=list(self._painted), bg=None, fg=None)
                 except Exception:
                     pass
-            self._apply_base_row_paint(r)
+        self._painted = {}
+        self._paint_viewport(force=True)
 
         # No preview row tint at all (by design)
         try:
@@ -477,7 +597,7 @@ class DialerController:
                 if not (r[i] or "").strip():
                     r[i] = "○"
             matrix.append(r)
-        save_dialer_leads_matrix(matrix)
+        self.save_matrix(matrix)
         self.repaint_all_rows()
 
     def _current_note_text(self) -> str:
@@ -508,6 +628,7 @@ class DialerController:
 
     # ---------- public: selection follower ----------
     def tick(self):
+        self._paint_viewport()  # backstop for scrolls no binding saw (one yview read)
         r = self._row_selected()
         if r is not None and r != self.state["row"]:
             self._set_working_row(r)
@@ -613,11 +734,8 @@ class DialerController:
 
             # Persist gray row tint; green/red rows will be deleted so no need to tint
             if outcome == "gray":
-                try:
-                    self.sheet.highlight_rows(rows=[r], bg=self.ROW_BG["gray"], fg=self.ROW_FG["gray"])
-                except Exception:
-                    pass
-                self.state["gray_rows"].add(r)
+                self._set_row_state(r, "gray")
+                self._paint_rows([r])
 
             # Finalize the preview note into the row
             c = self.state["note_col_by_row"].get(r)
@@ -737,11 +855,7 @@ class DialerController:
         if event == "-DIAL_ADD100-":
             try:
                 add = [[""] * len(self.header_fields) + ["○", "○", "○"] + (([""] * 8)) for _ in range(100)]
-                try:
-                    cur = self.sheet.get_sheet_data() or []
-                except Exception:
-                    cur = []
-                self.sheet.set_sheet_data((cur or []) + add)
+                insert_sheet_rows(self.sheet, self.sheet.get_total_rows(), add)
                 self.sheet.refresh()
                 self._save_grid_csv()
                 self.repaint_all_rows()
@@ -804,7 +918,7 @@ def _wire_tksheet_selection(sheet, controller: "DialerController") -> None:
                 controller._set_working_row(r)
             else:
                 controller._set_working_row(None)
-            controller.repaint_all_rows()
+            controller._paint_viewport()
         sheet.MT.bind("<Button-1>", _on_click, add="+")
     except Exception:
         pass
@@ -812,10 +926,10 @@ def _wire_tksheet_selection(sheet, controller: "DialerController") -> None:
 # ---------------
 # Simple factory
 # ---------------
-def attach_dialer(window, dial_sheet) -> DialerController:
+def attach_dialer(window, dial_sheet, save_matrix=None) -> DialerController:
     ensure_dialer_files()
     ensure_dialer_leads_file()
-    ctrl = DialerController(window, dial_sheet, HEADER_FIELDS)
+    ctrl = DialerController(window, dial_sheet, HEADER_FIELDS, save_matrix=save_matrix)
     _wire_tksheet_selection(dial_sheet, ctrl)
     try:
         ctrl.repaint_all_rows()
@@ -0,0 +1,467 @@
+# gf_fpindex.py
+# On-disk "already drafted" fingerprint index (replaces the ever-growing state.txt set).
+# - <base>.fpx   : sorted 20-byte SHA-1 digests (16-byte header); membership = binary search
+#                  over an mmap, the file is never loaded whole
+# - <base>.fplog : append-only 20-byte records added since the last compaction (O(1) add);
+#                  replayed into a small in-memory set on open
+# - <base>.bloom : Bloom filter over both, so most "new lead" lookups never touch the .fpx
+# - compact()    : streams .fpx + .fplog into a new sorted .fpx (dedupes), resizes the Bloom
+#                  filter and empties the log. Runs automatically once the log holds
+#                  COMPACT_AT records (and from gf_store.flush_storage at exit).
+# - Migration    : a legacy state.txt (one hex digest per line) is imported and renamed to
+#                  state.txt.migrated -- by migrate() on a background thread (the app queues
+#                  it on the Outlook worker at startup, after defer_migration()), otherwise
+#                  on first open. The Bloom filter is built outside the lock; lookups only
+#                  wait for the final merge.
+#
+# Set-like API so existing callers keep working:  fp in idx / idx.add(fp) / idx.update(fps) / len(idx)
+#
+# Pure stdlib, no app imports: gf_store owns the instance (gf_store.SEEN).
+# Maintenance: python gf_fpindex.py compact|stats [APP_DIR]   (bench: python gf_fpindex.py bench)
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Set
+
+DIGEST = 20
+COMPACT_AT = 20000                       # log records before an automatic compaction
+BLOOM_BITS_PER_KEY = 16                  # ~0.05% false positives at the sized capacity
+BLOOM_K = 11
+
+_FPX_HDR = struct.Struct("<8sQ")         # magic, count
+_FPX_MAGIC = b"GFFPX001"
+_BLOOM_HDR = struct.Struct("<8sQIQ")     # magic, bits, k, keys covered (.fpx count)
+_BLOOM_MAGIC = b"GFBLM001"
+
+
+def _to_digest(fp) -> Optional[bytes]:
+    if isinstance(fp, (bytes, bytearray)):
+        return bytes(fp) if len(fp) == DIGEST else None
+    try:
+        d = bytes.fromhex((fp or "").strip())
+    except Exception:
+        return None
+    return d if len(d) == DIGEST else None
+
+
+class _Bloom:
+    def __init__(self, nbits: int, k: int = BLOOM_K, bits: Optional[bytearray] = None):
+        self.nbits = max(64, nbits)
+        self.k = k
+        self.bits = bits if bits is not None else bytearray((self.nbits + 7) // 8)
+
+    @classmethod
+    def sized_for(cls, keys: int) -> "_Bloom":
+        return cls(max(keys, 1024) * 2 * BLOOM_BITS_PER_KEY)   # 2x headroom: rebuilt rarely
+
+    def capacity(self) -> int:
+        return self.nbits // BLOOM_BITS_PER_KEY
+
+    def _probes(self, d: bytes) -> Iterator[int]:
+        # SHA-1 output is already uniform: double hashing straight from the digest bytes
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:16], "little") | 1
+        n = self.nbits
+        for i in range(self.k):
+            yield (h1 + i * h2) % n
+
+    def add(self, d: bytes) -> None:
+        bits = self.bits
+        for p in self._probes(d):
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, d: bytes) -> bool:
+        bits = self.bits
+        for p in self._probes(d):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+
+class FingerprintIndex:
+    def __init__(self, base: Path, legacy: Optional[Path] = None):
+        base = Path(base)
+        self.fpx_path = base.with_suffix(".fpx")
+        self.log_path = base.with_suffix(".fplog")
+        self.bloom_path = base.with_suffix(".bloom")
+        self.legacy = Path(legacy) if legacy else None
+        self._lock = threading.RLock()
+        self._opened = False
+        self._mm: Optional[mmap.mmap] = None
+        self._fpx_file = None
+        self._count = 0                   # records in .fpx
+        self._recent: Set[bytes] = set()  # records in .fplog
+        self._bloom: Optional[_Bloom] = None
+        self._defer = False               # legacy import left to an explicit migrate() call
+
+    # ---- set-like API ----
+    def __contains__(self, fp) -> bool:
+        d = _to_digest(fp)
+        if d is None:
+            return False
+        with self._lock:
+            self._open()
+            if d not in self._bloom:
+                return False
+            return d in self._recent or self._search(d)
+
+    def add(self, fp) -> None:
+        self.update([fp])
+
+    def update(self, fps: Iterable, sync: bool = True) -> int:
+        """Append the fingerprints not already present; returns how many were new."""
+        with self._lock:
+            self._open()
+            new = []
+            for fp in fps:
+                d = _to_digest(fp)
+                if d is not None and d not in self._recent and not (d in self._bloom and self._search(d)):
+                    self._recent.add(d)
+                    self._bloom.add(d)
+                    new.append(d)
+            if new:
+                with self.log_path.open("ab") as f:
+                    f.write(b"".join(new))
+                    if sync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                if len(self._recent) >= COMPACT_AT:
+                    self.compact()
+            return len(new)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._open()
+            return self._count + len(self._recent)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._open()
+            return iter(sorted(d.hex() for d in self._iter_merged()))
+
+    # ---- maintenance ----
+    def compact(self) -> int:
+        """Merge the log into the sorted file and rebuild the Bloom filter; returns the record count."""
+        with self._lock:
+            self._open()
+            return self._compact(sorted(self._recent))
+
+    def _compact(self, recent: list) -> int:
+        """compact() with the log records already sorted (migrate() sorts off the lock)."""
+        with self._lock:
+            merged = self._iter_merged(recent)
+            tmp = self.fpx_path.with_suffix(".fpx.tmp")
+            keys = self._count + len(recent)
+            # The live filter already covers every key; only rebuild it when it outgrew its size
+            bloom = self._bloom if keys + COMPACT_AT <= self._bloom.capacity() else _Bloom.sized_for(keys + COMPACT_AT)
+            fresh = bloom is not self._bloom
+            n = 0
+            with tmp.open("wb") as f:
+                f.write(_FPX_HDR.pack(_FPX_MAGIC, 0))
+                buf = []
+                for d in merged:
+                    buf.append(d)
+                    if fresh:
+                        bloom.add(d)
+                    n += 1
+                    if len(buf) >= 4096:
+                        f.write(b"".join(buf))
+                        buf.clear()
+                f.write(b"".join(buf))
+                f.seek(0)
+                f.write(_FPX_HDR.pack(_FPX_MAGIC, n))
+                f.flush()
+                os.fsync(f.fileno())
+            self._unmap()                 # Windows cannot replace a mapped file
+            os.replace(tmp, self.fpx_path)
+            self._write_bloom(bloom, n)
+            self.log_path.write_bytes(b"")
+            self._recent.clear()
+            self._bloom = bloom
+            self._map()
+            return n
+
+    def maybe_compact(self, min_log: int = 1000) -> None:
+        """Compact if the log holds at least `min_log` records (cheap no-op otherwise)."""
+        with self._lock:
+            if self._opened and len(self._recent) >= min_log:
+                self.compact()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._open()
+            return {
+                "sorted": self._count,
+                "log": len(self._recent),
+                "bloom_bytes": len(self._bloom.bits),
+                "disk_bytes": sum(p.stat().st_size for p in (self.fpx_path, self.log_path, self.bloom_path) if p.exists()),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._unmap()
+            self._opened = False
+
+    # ---- internals ----
+    def _open(self) -> None:
+        if self._opened:
+            return
+        self.fpx_path.parent.mkdir(parents=True, exist_ok=True)
+        self._map()
+        self._recent = set(self._read_log())
+        self._bloom = self._load_bloom()
+        for d in self._recent:
+            self._bloom.add(d)
+        self._opened = True
+        if not self._defer:
+            self.migrate()
+
+    def _map(self) -> None:
+        self._count = 0
+        if not self.fpx_path.exists():
+            return
+        f = self.fpx_path.open("rb")
+        try:
+            magic, count = _FPX_HDR.unpack(f.read(_FPX_HDR.size))
+            size = os.fstat(f.fileno()).st_size
+            if magic != _FPX_MAGIC or size < _FPX_HDR.size + count * DIGEST:
+                raise ValueError("bad fingerprint index")
+            if count:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._fpx_file = f
+            self._count = count
+        except Exception:
+            f.close()
+            self._mm = self._fpx_file = None
+            self._count = 0
+
+    def _unmap(self) -> None:
+        for h in (self._mm, self._fpx_file):
+            try:
+                if h is not None:
+                    h.close()
+            except Exception:
+                pass
+        self._mm = self._fpx_file = None
+        self._count = 0
+
+    def _search(self, d: bytes) -> bool:
+        mm = self._mm
+        if mm is None:
+            return False
+        lo, hi = 0, self._count
+        base = _FPX_HDR.size
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            off = base + mid * DIGEST
+            cur = mm[off:off + DIGEST]
+            if cur < d:
+                lo = mid + 1
+            elif cur > d:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def _iter_sorted(self) -> Iterator[bytes]:
+        mm = self._mm
+        if mm is None:
+            return
+        step = 4096 * DIGEST
+        end = _FPX_HDR.size + self._count * DIGEST
+        for start in range(_FPX_HDR.size, end, step):
+            chunk = mm[start:min(start + step, end)]
+            for off in range(0, len(chunk), DIGEST):
+                yield chunk[off:off + DIGEST]
+
+    def _iter_merged(self, recent: Optional[list] = None) -> Iterator[bytes]:
+        """Sorted .fpx records and the log, merged and deduplicated (streaming)."""
+        recent = sorted(self._recent) if recent is None else recent
+        i, prev = 0, None
+        for d in self._iter_sorted():
+            while i < len(recent) and recent[i] <= d:
+                if recent[i] != prev:
+                    prev = recent[i]
+                    yield prev
+                i += 1
+            if d != prev:
+                prev = d
+                yield d
+        for d in recent[i:]:
+            if d != prev:
+                prev = d
+                yield d
+
+    def _read_log(self) -> Iterator[bytes]:
+        try:
+            data = self.log_path.read_bytes()
+        except FileNotFoundError:
+            return
+        whole = len(data) - len(data) % DIGEST
+        if whole != len(data):
+            # torn trailing record from a crash mid-append: drop it
+            with self.log_path.open("r+b") as f:
+                f.truncate(whole)
+        for off in range(0, whole, DIGEST):
+            yield data[off:off + DIGEST]
+
+    def _load_bloom(self) -> _Bloom:
+        try:
+            raw = self.bloom_path.read_bytes()
+            magic, nbits, k, covered = _BLOOM_HDR.unpack_from(raw)
+            bits = bytearray(raw[_BLOOM_HDR.size:])
+            if magic == _BLOOM_MAGIC and covered == self._count and len(bits) == (nbits + 7) // 8:
+                return _Bloom(nbits, k, bits)
+        except Exception:
+            pass
+        # missing / stale: rebuild from the sorted file (one streaming pass)
+        bloom = _Bloom.sized_for(self._count + COMPACT_AT)
+        for d in self._iter_sorted():
+            bloom.add(d)
+        self._write_bloom(bloom, self._count)
+        return bloom
+
+    def _write_bloom(self, bloom: _Bloom, covered: int) -> None:
+        try:
+            tmp = self.bloom_path.with_suffix(".bloom.tmp")
+            with tmp.open("wb") as f:
+                f.write(_BLOOM_HDR.pack(_BLOOM_MAGIC, bloom.nbits, bloom.k, covered))
+                f.write(bloom.bits)
+            os.replace(tmp, self.bloom_path)
+        except Exception:
+            pass
+
+    # ---- legacy state.txt ----
+    def needs_migration(self) -> bool:
+        return self.legacy is not None and self.legacy.exists()
+
+    def defer_migration(self) -> None:
+        """Keep first use from importing state.txt inline; the caller runs migrate() elsewhere."""
+        self._defer = True
+
+    def migrate(self, progress: Optional[Callable[[int, int], None]] = None,
+                chunk: int = 20000) -> int:
+        """
+        Import the legacy state.txt and rename it to state.txt.migrated; returns the records
+        read. Parsing and the new Bloom filter happen without holding the index lock (until
+        the merge, lookups see the index as it was); progress(done, total) after each chunk.
+        """
+        legacy = self.legacy
+        if legacy is None or not legacy.exists():
+            return 0
+        try:
+            with legacy.open("r", encoding="utf-8", errors="ignore") as f:
+                batch = sorted({d for d in map(_to_digest, f) if d is not None})
+            with self._lock:
+                self._open()
+                existing = self._count + len(self._recent)
+            total = len(batch)
+            bloom = _Bloom.sized_for(existing + total + COMPACT_AT)
+            for start in range(0, total, chunk):
+                for d in batch[start:start + chunk]:
+                    bloom.add(d)
+                if callable(progress):
+                    progress(min(start + chunk, total), total)
+            with self._lock:
+                if not legacy.exists():
+                    return 0                      # another caller finished it meanwhile
+                for d in self._iter_sorted():
+                    bloom.add(d)
+                for d in self._recent:
+                    bloom.add(d)
+                self._bloom = bloom               # already covers everything: compact() keeps it
+                self._compact(sorted(sorted(self._recent) + batch))   # two sorted runs: a linear merge
+                os.replace(legacy, legacy.with_name(legacy.name + ".migrated"))
+            return total
+        except Exception:
+            return 0
+
+
+# ----------------------------
+# Maintenance / benchmark
+# ----------------------------
+def _bench(n: int = 300000) -> None:
+    import hashlib
+    import tempfile
+    import time
+    import tracemalloc
+
+    root = Path(tempfile.mkdtemp(prefix="gf_fpindex_"))
+    legacy = root / "state.txt"
+    fps = [hashlib.sha1(str(i).encode()).hexdigest() for i in range(n)]
+    legacy.write_text("".join(fp + "\n" for fp in fps), encoding="utf-8")
+
+    t0 = time.perf_counter()
+    old = {line.strip() for line in legacy.read_text(encoding="utf-8").splitlines() if line.strip()}
+    t_set = time.perf_counter() - t0
+    tracemalloc.start()
+    old = {line.strip() for line in legacy.read_text(encoding="utf-8").splitlines() if line.strip()}
+    set_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del old
+
+    idx = FingerprintIndex(root / "state", legacy=legacy)
+    idx.defer_migration()
+    t0 = time.perf_counter()
+    worker = threading.Thread(target=idx.migrate)
+    worker.start()
+    waits = []
+    while worker.is_alive():                  # a UI thread polling the index meanwhile
+        t1 = time.perf_counter()
+        _ = fps[0] in idx
+        waits.append(time.perf_counter() - t1)
+        time.sleep(0.01)
+    worker.join()
+    print(f"migrate {n} (background): {time.perf_counter() - t0:.2f}s   "
+          f"longest lookup meanwhile {max(waits or [0]) * 1000:.0f} ms   {idx.stats()}")
+    assert fps[0] in idx and len(idx) == n
+    idx.close()
+
+    idx = FingerprintIndex(root / "state", legacy=legacy)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    len(idx)
+    t_open = time.perf_counter() - t0
+    idx_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"open: legacy set {t_set * 1000:.0f} ms / {set_mem / 1e6:.1f} MB"
+          f"   index {t_open * 1000:.1f} ms / {idx_mem / 1e6:.2f} MB")
+
+    fresh = [hashlib.sha1(f"new{i}".encode()).hexdigest() for i in range(5000)]
+    probes = fps[::97] + fresh
+    t0 = time.perf_counter()
+    hits = sum(1 for fp in probes if fp in idx)
+    dt = time.perf_counter() - t0
+    print(f"lookups: {len(probes)} in {dt * 1000:.0f} ms ({dt / len(probes) * 1e6:.1f} us each), hits={hits}")
+    assert hits == len(fps[::97])
+
+    t0 = time.perf_counter()
+    for i in range(0, 5000, 50):
+        idx.update(fresh[i:i + 50])
+    print(f"append 5000 in batches of 50: {(time.perf_counter() - t0) * 1000:.0f} ms")
+    assert all(fp in idx for fp in probes) and len(idx) == n + 5000
+    t0 = time.perf_counter()
+    idx.compact()
+    print(f"compact: {(time.perf_counter() - t0):.2f}s   {idx.stats()}")
+    assert all(fp in idx for fp in probes) and len(idx) == n + 5000
+
+
+if __name__ == "__main__":
+    import sys
+
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if cmd == "bench":
+        _bench()
+    else:
+        app_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+        if app_dir is None:
+            from gf_store import APP_DIR as app_dir
+        idx = FingerprintIndex(app_dir / "state", legacy=app_dir / "state.txt")
+        if cmd == "compact":
+            idx.compact()
+        print(idx.stats())
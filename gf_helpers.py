@@ -2,54 +2,40 @@
 # Consolidated helpers from Chunks 3 + 4 (non-UI only)
 
 from __future__ import annotations
-import csv, re, html, hashlib, time, os
+import csv, re, hashlib, json, time, os
 from datetime import datetime, timedelta
 from pathlib import Path
 
-# -----------------------------------------------------------------------------------
-# Safe fallbacks for globals that are usually defined in your bootstrap / chunk 1
-# -----------------------------------------------------------------------------------
-if "APP_DIR" not in globals():
-    APP_DIR = Path.cwd() / "GrowthFarmData"
-APP_DIR.mkdir(parents=True, exist_ok=True)
-
-if "CSV_PATH" not in globals():
-    CSV_PATH = APP_DIR / "kybercrystals.csv"
-
-if "WARM_LEADS_PATH" not in globals():
-    WARM_LEADS_PATH = APP_DIR / "warm_leads.csv"
-
-if "CUSTOMERS_PATH" not in globals():
-    CUSTOMERS_PATH = APP_DIR / "customers.csv"
-
-if "ORDERS_PATH" not in globals():
-    ORDERS_PATH = APP_DIR / "orders.csv"
-
-if "RESULTS_PATH" not in globals():
-    RESULTS_PATH = APP_DIR / "results.csv"
-
-if "STATE_PATH" not in globals():
-    STATE_PATH = APP_DIR / "state.txt"
-
-if "DIALER_RESULTS_PATH" not in globals():
-    DIALER_RESULTS_PATH = APP_DIR / "dialer_results.csv"
-
-if "HEADER_FIELDS" not in globals():
-    # Minimal safe header set – your real list should override this at import time
-    HEADER_FIELDS = ["Company","First Name","Last Name","Email","Industry","Phone","City","State","Website"]
+from gf_dates import parse_date, parse_datetime
+from gf_store import BACKUPS
+from gf_outlook import get_session, com_timer, pick_store as _pick_store
+from gf_analytics import activity_for_day
+from gf_template import compile_template, blocks_to_html
+from gf_industry import compile_industry_map
+
+# Bind the "usually defined in your bootstrap" globals to the app's real data folder and
+# schemas (gf_store), so drafts / sync / the fingerprint index land next to the grids.
+from gf_store import (
+    APP_DIR,
+    EMAIL_LEADS_PATH as CSV_PATH,
+    WARM_LEADS_PATH,
+    CUSTOMERS_PATH,
+    ORDERS_PATH,
+    SEEN,
+    LEAD_INDEX,
+    update_results,
+    load_results_rows_sorted as _store_results_rows,
+    upsert_result as _store_upsert_result,
+    _merge_result,
+    HEADER_FIELDS,
+    CUSTOMER_FIELDS,
+    load_templates_ini,
+)
 
-if "CUSTOMER_FIELDS" not in globals():
-    CUSTOMER_FIELDS = [
-        "Company","Prospect Name","Phone #","Email","Location","Industry","Google Reviews","Rep",
-        "Samples?","Timestamp","Customer Since","First Order","Last Order","CLTV","Days","Sales/Day",
-        "Reorder?","Lat","Lon","Notes","Opening Order $"
-    ]
-
-if "TARGET_MAILBOX_HINT" not in globals():
-    TARGET_MAILBOX_HINT = ""  # optional string to pick Outlook store
+APP_DIR.mkdir(parents=True, exist_ok=True)
 
-if "DEATHSTAR_SUBFOLDER" not in globals():
-    DEATHSTAR_SUBFOLDER = "Death Star"
+TARGET_MAILBOX_HINT = ""  # optional string to pick Outlook store
+DEATHSTAR_SUBFOLDER = "Death Star"
 
 if "DEFAULT_SUBJECT" not in globals():
     DEFAULT_SUBJECT = "Quick hello"
@@ -81,20 +67,9 @@ def save_matrix_to_csv(matrix):
 # -----------------------------------------------------------------------------------
 BACKUP_DIR = APP_DIR / "_backups"
 
-def _ts():
-    from datetime import datetime as _dt
-    return _dt.now().strftime("%Y%m%d-%H%M%S")
-
 def _backup(path: Path):
-    """Best-effort backup (binary copy) to APP_DIR/_backups with timestamp."""
-    try:
-        if path.exists() and path.is_file():
-            BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-            bak = BACKUP_DIR / f"{path.stem}.{_ts()}{path.suffix}.bak"
-            with path.open("rb") as s, bak.open("wb") as d:
-                d.write(s.read())
-    except Exception:
-        pass
+    """Best-effort snapshot into the shared backup store (gf_store.BACKUPS, async + deduplicated)."""
+    BACKUPS.snapshot(path)
 
 def _atomic_write_csv(path: Path, headers: list, rows: list):
     """Write CSV to a temporary file, then replace target atomically."""
@@ -220,21 +195,7 @@ def ensure_customers_file():
         _atomic_write_csv(CUSTOMERS_PATH, CUSTOMER_FIELDS, migrated)
 
 def _parse_date_mmddyyyy(s):
-    s = (s or "").strip()
-    if not s:
-        return None
-    for fmt in ("%Y-%m-%d","%m/%d/%Y","%m-%d-%Y","%Y/%m/%d"):
-        try:
-            return datetime.strptime(s, fmt).date()
-        except Exception:
-            pass
-    for fmt in ("%m/%d","%m-%d"):
-        try:
-            d = datetime.strptime(s, fmt)
-            return d.replace(year=datetime.now().year).date()
-        except Exception:
-            pass
-    return None
+    return parse_date(s, yearless=True)
 
 def _money_to_float(val):
     s = (val or "").strip().replace(",", "").replace("$","")
@@ -435,20 +396,10 @@ def normalize_header_map(row_dict):
 PLACEHOLDER_RE = re.compile(r"\{([^}]+)\}")
 
 def apply_placeholders(text, row_dict, profile=None):
+    # compiled once per template text (gf_template), fields resolved against HEADER_FIELDS
     if not text:
         return ""
-    values = normalize_header_map(row_dict)
-    def repl(m):
-        token = m.group(1).strip()
-        cands = [token, token.lower(), token.replace(" ","_").lower()]
-        token_norm = token.replace("_"," ").strip().lower()
-        for c in cands:
-            if c in values and values[c] != "":
-                return values[c]
-        if token_norm in ("first name","firstname","first"):
-            return "there"
-        return "{"+token+"}"
-    return PLACEHOLDER_RE.sub(repl, text)
+    return compile_template(text, HEADER_FIELDS).render(row_dict)
 
 def dict_from_row(row):
     return {HEADER_FIELDS[i]: (row[i] if i < len(HEADER_FIELDS) else "") for i in range(len(HEADER_FIELDS))}
@@ -460,30 +411,29 @@ def get_val(d, name):
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 def valid_email(addr): return bool(addr and EMAIL_RE.match(addr))
 
-def row_fingerprint_from_dict(d):
-    key = "|".join([
-        (get_val(d,"Email") or "").lower(),
-        (get_val(d,"First Name") or "").lower(),
-        (get_val(d,"Company") or "").lower(),
-        (get_val(d,"Industry") or "").lower(),
-    ])
+def row_fingerprint(email, first_name, company, industry):
+    key = "|".join((email or "", first_name or "", company or "", industry or "")).lower()
     return hashlib.sha1(key.encode("utf-8")).hexdigest()
 
+def row_fingerprint_from_dict(d):
+    lower = { (k or "").lower(): v for k,v in d.items() }   # one case-folded view, not one per field
+    return row_fingerprint(lower.get("email"), lower.get("first name"), lower.get("company"), lower.get("industry"))
+
 def choose_template_key(industry_value, mapping):
-    ind = (industry_value or "").lower()
-    for needle, key in mapping.items():
-        if needle.lower() in ind:
-            return key
-    return "default"
-
-def blocks_to_html(text):
-    text = text.replace("\r\n","\n")
-    parts = [p for p in text.split("\n\n") if p.strip()!=""]
-    out = []
-    for p in parts:
-        esc = html.escape(p).replace("\n","<br>")
-        out.append(f'<p style="margin:0 0 12px 0;">{esc}</p>')
-    return "\n".join(out) if out else "<p></p>"
+    # first [map] needle contained in the industry wins; the map is compiled once (gf_industry)
+    return compile_industry_map(mapping).match(industry_value)
+
+def classify_industries(rows, mapping=None):
+    """
+    Template key for every lead in one pass (Fire, dialer): rows are lead dicts or
+    HEADER_FIELDS-ordered lists. mapping defaults to the [map] section of templates.ini.
+    """
+    if mapping is None:
+        mapping = load_templates_ini()[2]
+    ix = HEADER_FIELDS.index("Industry")
+    return compile_industry_map(mapping).classify(
+        r.get("Industry", "") if isinstance(r, dict) else (r[ix] if ix < len(r) else "")
+        for r in rows)
 
 # -----------------------------------------------------------------------------------
 # Campaigns helpers (per-ref state via campaigns.csv)
@@ -568,113 +518,139 @@ def require_pywin32():
         return False
 
 def pick_store(session):
-    store = session.DefaultStore
-    if TARGET_MAILBOX_HINT:
-        hint = TARGET_MAILBOX_HINT.lower()
-        for i in range(1, session.Accounts.Count + 1):
-            acc = session.Accounts.Item(i)
-            smtp = (getattr(acc, "SmtpAddress", "") or "").lower()
-            disp = (acc.DisplayName or "").lower()
-            if hint in smtp or hint in disp:
-                try:
-                    store = acc.DeliveryStore
-                    return store
-                except Exception:
-                    pass
-        for i in range(1, session.Stores.Count + 1):
-            st = session.Stores.Item(i)
-            if hint in (st.DisplayName or "").lower():
-                store = st
-                break
-    return store
+    return _pick_store(session, TARGET_MAILBOX_HINT)
+
+def outlook_session():
+    """This thread's cached Outlook session (Application / Namespace / store / folders)."""
+    return get_session(TARGET_MAILBOX_HINT)
+
+def _create_draft(sess, to, subject, html):
+    """
+    Draft in Drafts, then moved to the DeathStar subfolder. Items.Add runs inside sess.run(),
+    so a stale session (Outlook restarted) reconnects and retries; a failed Save / Move drops
+    the session for the next call instead of retrying (no duplicate drafts).
+    """
+    def _new(s):
+        msg = s.drafts().Items.Add("IPM.Note")
+        msg.To = to
+        msg.Subject = subject
+        msg.BodyFormat = 2
+        msg.HTMLBody = html
+        return msg, s.drafts_subfolder(DEATHSTAR_SUBFOLDER)
+    msg, target_folder = sess.run("draft.create", _new)
+    with sess.guard("draft.save"):
+        msg.Save()
+    with sess.guard("draft.move"):
+        msg.Move(target_folder)
 
 def outlook_draft_one(row_dict, subject_text, body_text, ref_short):
-    import win32com.client as win32
-    outlook = win32.Dispatch("Outlook.Application")
-    session = outlook.GetNamespace("MAPI")
-    store = pick_store(session)
-    drafts_root = store.GetDefaultFolder(16)  # olFolderDrafts
-    target_folder = None
-    for i in range(1, drafts_root.Folders.Count + 1):
-        f = drafts_root.Folders.Item(i)
-        if (f.Name or "").lower() == DEATHSTAR_SUBFOLDER.lower():
-            target_folder = f; break
-    if target_folder is None:
-        target_folder = drafts_root.Folders.Add(DEATHSTAR_SUBFOLDER)
-
-    body_html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head>
-    <body style="margin:0;padding:0;"><div style="font-family:Segoe UI, Arial, sans-serif; font-size:14px; line-height:1.5; color:#111;">
-    {blocks_to_html(body_text)}<!-- ref:{ref_short} --></div></body></html>"""
-    msg = drafts_root.Items.Add("IPM.Note")
-    msg.To = row_dict.get("Email","")
-    msg.Subject = f"{subject_text} [ref:{ref_short}]"
-    msg.BodyFormat = 2
-    msg.HTMLBody = body_html
-    msg.Save()
-    msg.Move(target_folder)
-
-def outlook_draft_many(rows_matrix, seen_set, templates, subjects, mapping):
-    import win32com.client as win32
-    outlook = win32.Dispatch("Outlook.Application")
-    session = outlook.GetNamespace("MAPI")
-    store = pick_store(session)
-    drafts_root = store.GetDefaultFolder(16)  # olFolderDrafts
-    target_folder = None
-    for i in range(1, drafts_root.Folders.Count + 1):
-        f = drafts_root.Folders.Item(i)
-        if (f.Name or "").lower() == DEATHSTAR_SUBFOLDER.lower():
-            target_folder = f; break
-    if target_folder is None:
-        target_folder = drafts_root.Folders.Add(DEATHSTAR_SUBFOLDER)
-    made = 0
-    new_fps = []
+    _create_draft(outlook_session(), row_dict.get("Email",""),
+                  f"{subject_text} [ref:{ref_short}]", _draft_html(body_text, ref_short))
+
+def _draft_html(body_text, ref_short, body_html=None):
+    """body_html: blocks_to_html(body_text) when the caller already has it (compiled templates)."""
+    if body_html is None:
+        body_html = blocks_to_html(body_text)
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head>
+        <body style="margin:0;padding:0;"><div style="font-family:Segoe UI, Arial, sans-serif; font-size:14px; line-height:1.5; color:#111;">
+        {body_html}<!-- ref:{ref_short} --></div></body></html>"""
+
+def render_drafts(rows_matrix, seen_set, templates, subjects, mapping):
+    """
+    Pre-render every NEW lead (valid email, fingerprint not in seen_set) up front.
+    Returns a list of dicts: fp, ref, lead (row dict), to, subject (plain), html.
+    """
+    out = []
+    queued = set()
+    pick_template = compile_industry_map(mapping).match
     for row in rows_matrix:
         d = dict_from_row(row)
         if not valid_email(d.get("Email","")):
             continue
         fp = row_fingerprint_from_dict(d)
-        if fp in seen_set:
+        if fp in seen_set or fp in queued:
             continue
+        queued.add(fp)
         ref_short = fp[:8]
-        tpl_key = choose_template_key(d.get("Industry",""), mapping)
+        tpl_key = pick_template(d.get("Industry",""))
         body_tpl = templates.get(tpl_key, templates.get("default",""))
         subj_tpl = subjects.get(tpl_key) or subjects.get("default") or DEFAULT_SUBJECT
-        subj_text = apply_placeholders(subj_tpl, d)
-        body_text = apply_placeholders(body_tpl, d)
-        body_html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head>
-        <body style="margin:0;padding:0;"><div style="font-family:Segoe UI, Arial, sans-serif; font-size:14px; line-height:1.5; color:#111;">
-        {blocks_to_html(body_text)}<!-- ref:{ref_short} --></div></body></html>"""
-        msg = drafts_root.Items.Add("IPM.Note")
-        msg.To = d.get("Email","")
-        msg.Subject = f"{subj_text} [ref:{ref_short}]"
-        msg.BodyFormat = 2
-        msg.HTMLBody = body_html
-        msg.Save()
-        msg.Move(target_folder)
-        upsert_result(ref_short, d.get("Email",""), d.get("Company",""), d.get("Industry",""), subj_text)
-        made += 1
-        new_fps.append(fp)
-        time.sleep(0.02)
-    with STATE_PATH.open("a", encoding="utf-8") as f:
-        for fp in new_fps:
-            f.write(fp+"\n")
+        body_text, body_html = compile_template(body_tpl, HEADER_FIELDS).render_both(d)
+        out.append({
+            "fp": fp,
+            "ref": ref_short,
+            "lead": d,
+            "to": d.get("Email",""),
+            "subject": apply_placeholders(subj_tpl, d),
+            "html": _draft_html(body_text, ref_short, body_html),
+        })
+    return out
+
+DRAFT_COMMIT_EVERY = 50
+
+def outlook_draft_many(rows_matrix, seen_set, templates, subjects, mapping,
+                       progress=None, commit_every=DRAFT_COMMIT_EVERY, cancel=None):
+    """
+    Batch drafting pipeline:
+      1) pre-render all subjects/bodies (no COM work yet)
+      2) create drafts in Outlook
+      3) every `commit_every` drafts, commit results rows + fingerprints (SEEN index) together,
+         so a crash mid-batch only loses dedupe state for the last partial chunk
+    progress(done, total, drafts_per_sec) is called after each commit (and once at the end).
+    cancel() is polled before each draft; returning True stops after committing what was made.
+    Returns the number of drafts created; seen_set is updated in place as chunks commit.
+    """
+    jobs = render_drafts(rows_matrix, seen_set, templates, subjects, mapping)
+    if not jobs:
+        return 0
+    sess = outlook_session()
+
+    total = len(jobs)
+    made = 0
+    pending = []
+    t0 = time.perf_counter()
+
+    def _commit():
+        if not pending:
+            return
+        update_results({
+            j["ref"]: (lambda cur, j=j: _merge_result(
+                cur, j["ref"], j["lead"].get("Email",""), j["lead"].get("Company",""),
+                j["lead"].get("Industry",""), j["subject"], "", ""))
+            for j in pending
+        })
+        SEEN.update(j["fp"] for j in pending)     # appended + fsync'd
+        if seen_set is not SEEN:
+            seen_set.update(j["fp"] for j in pending)
+        pending.clear()
+        if callable(progress):
+            elapsed = time.perf_counter() - t0
+            progress(made, total, made / elapsed if elapsed > 0 else 0.0)
+
+    try:
+        for job in jobs:
+            if callable(cancel) and cancel():
+                break
+            _create_draft(sess, job["to"], f"{job['subject']} [ref:{job['ref']}]", job["html"])
+            made += 1
+            pending.append(job)
+            if len(pending) >= max(1, int(commit_every or 1)):
+                _commit()
+    finally:
+        _commit()
     return made
 
 REF_RE = re.compile(r"\[ref:([0-9a-f]{6,12})\]", re.IGNORECASE)
 
 def load_state_set():
-    if not STATE_PATH.exists():
-        return set()
-    return {line.strip() for line in STATE_PATH.read_text(encoding="utf-8").splitlines() if line.strip()}
+    """Drafted-lead fingerprints: the on-disk SEEN index (set-like: `fp in seen`), not a loaded set."""
+    return SEEN
+
+# results go through gf_store (SQLite when storage=sqlite, else the append-only results
+# journal that gf_store.flush_storage() compacts into results.csv)
 
 def load_results_rows_sorted():
-    rows = []
-    if RESULTS_PATH.exists():
-        with RESULTS_PATH.open("r", encoding="utf-8", newline="") as f:
-            rows = list(csv.DictReader(f))
-    def sk(r): return (r.get("DateReplied",""), r.get("DateSent",""))
-    rows.sort(key=sk, reverse=True)
-    return rows
+    return _store_results_rows()
 
 def _results_lookup_by_ref():
     return { (r.get("Ref","") or "").lower(): r for r in load_results_rows_sorted() }
@@ -682,120 +658,150 @@ def _results_lookup_by_ref():
 def _results_dates_for_ref(ref_short):
     """Return (sent_dt, replied_dt) as datetime or (None,None)."""
     r = _results_lookup_by_ref().get((ref_short or "").lower())
-    def _p(s):
-        s = (s or "").strip()
-        if not s: return None
-        for fmt in ("%Y-%m-%d %H:%M:%S","%Y-%m-%d",
-                    "%m/%d/%Y %I:%M:%S %p","%m/%d/%Y %I:%M %p","%m/%d/%Y"):
-            try:
-                return datetime.strptime(s, fmt)
-            except Exception:
-                pass
-        alt = s.replace("-", "/")
-        for fmt in ("%m/%d/%Y %I:%M:%S %p","%m/%d/%Y %I:%M %p","%m/%d/%Y"):
-            try:
-                return datetime.strptime(alt, fmt)
-            except Exception:
-                pass
-        return None
     if not r:
         return (None, None)
-    return (_p(r.get("DateSent","")), _p(r.get("DateReplied","")))
+    return (_parse_any_datetime(r.get("DateSent","")), _parse_any_datetime(r.get("DateReplied","")))
 
 def _lead_row_from_email_company(email, company):
-    """Try to find the original lead row for placeholders."""
-    if not CSV_PATH.exists():
-        return None
-    email_l = (email or "").strip().lower()
-    comp_l  = (company or "").strip().lower()
-    with CSV_PATH.open("r", encoding="utf-8", newline="") as f:
-        rdr = csv.DictReader(f)
-        for r in rdr:
-            if email_l and (r.get("Email","").strip().lower() == email_l):
-                return r
-        if comp_l:
-            f.seek(0); next(rdr, None)
-            for r in rdr:
-                if (r.get("Company","").strip().lower() == comp_l):
-                    return r
-    return None
+    """Try to find the original lead row for placeholders (email first, then company)."""
+    return LEAD_INDEX.find(email, company)
+
+# Incremental sync state (sidecar of last_outlook_sync.txt):
+#   {"sent": {"hw": "YYYY-MM-DD HH:MM:SS", "ids": {EntryID: ts}}, "inbox": {...}}
+# hw = newest SentOn / ReceivedTime processed; ids = EntryIDs seen inside the overlap window
+# (Restrict only compares to the minute, so each run re-reads a short overlap and skips those ids).
+SYNC_OVERLAP = timedelta(minutes=2)
+
+def _load_sync_state():
+    try:
+        return json.loads(SYNC_STATE_PATH.read_text(encoding="utf-8")) or {}
+    except Exception:
+        return {}
+
+def _save_sync_state(state):
+    try:
+        tmp = SYNC_STATE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=1), encoding="utf-8")
+        os.replace(tmp, SYNC_STATE_PATH)
+    except Exception:
+        pass
+
+def _com_wall_time(value):
+    # pywin32 hands back Outlook's local wall-clock time tagged as UTC; keep the wall clock
+    dt = parse_datetime(str(value or ""))
+    return dt.replace(tzinfo=None, microsecond=0) if dt else None
 
-def outlook_sync_results(lookback_days=60):
-    import win32com.client as win32
-    outlook = win32.Dispatch("Outlook.Application")
-    session = outlook.GetNamespace("MAPI")
-    store = pick_store(session)
-    sent = store.GetDefaultFolder(5)  # Sent Items
-    inbox = store.GetDefaultFolder(6) # Inbox
-    since = (datetime.now() - timedelta(days=lookback_days)).strftime("%m/%d/%Y %I:%M %p")
-    sent_items = sent.Items; sent_items.IncludeRecurrences = True; sent_items.Sort("[SentOn]", True)
-    inbox_items = inbox.Items; inbox_items.IncludeRecurrences = True; inbox_items.Sort("[ReceivedTime]", True)
-    sent_recent = sent_items.Restrict(f"[SentOn] >= '{since}'")
-    inbox_recent = inbox_items.Restrict(f"[ReceivedTime] >= '{since}'")
-    sent_map, reply_map = {}, {}
-    for i in range(1, min(2000, sent_recent.Count)+1):
+def _sync_folder(sess, get_folder, prop, mark, lookback_days, on_ref, cancel=None, tick=None):
+    """
+    Walk get_folder(sess) oldest -> newest from the high-water mark in `mark` (first run: the last
+    `lookback_days`), calling on_ref(ref, when_str) for every "[ref:xxxx]" subject. No item cap.
+    `mark` is advanced in place as items are processed, so a cancelled walk keeps its progress.
+    Returns False if cancelled.
+    """
+    hw = parse_datetime(mark.get("hw", "")) if mark.get("hw") else None
+    seen = dict(mark.get("ids") or {})
+    since = (hw - SYNC_OVERLAP) if hw else (datetime.now() - timedelta(days=lookback_days))
+    def _restrict(s):
+        items = get_folder(s).Items
+        items.Sort(f"[{prop}]", False)
+        recent = items.Restrict(f"[{prop}] >= '{since.strftime('%m/%d/%Y %I:%M %p')}'")
+        return recent, recent.GetFirst()
+    recent, m = sess.run("sync.restrict", _restrict)   # reconnects once if the session is stale
+    ok = True
+    while m is not None:
+        if callable(cancel) and cancel():
+            ok = False
+            break
         try:
-            m = sent_recent.Item(i)
-            subj = str(getattr(m,"Subject","") or "")
-            rm = REF_RE.search(subj)
-            if rm:
-                sent_map[rm.group(1).lower()] = str(getattr(m,"SentOn","") or "")
+            with com_timer("sync.item"):
+                eid = str(getattr(m, "EntryID", "") or "")
+                when = getattr(m, prop, "")
+                subj = str(getattr(m, "Subject", "") or "")
+            when_dt = _com_wall_time(when)
+            if not eid or eid not in seen:
+                rm = REF_RE.search(subj)
+                if rm:
+                    on_ref(rm.group(1).lower(), str(when or ""))
+                if when_dt is not None:
+                    if eid:
+                        seen[eid] = when_dt.strftime("%Y-%m-%d %H:%M:%S")
+                    if hw is None or when_dt > hw:
+                        hw = when_dt
         except Exception:
-            continue
-    for i in range(1, min(2000, inbox_recent.Count)+1):
+            pass
+        if callable(tick):
+            tick()
+        with sess.guard("sync.next"):
+            m = recent.GetNext()
+    if hw is not None:
+        floor = (hw - SYNC_OVERLAP).strftime("%Y-%m-%d %H:%M:%S")
+        mark["hw"] = hw.strftime("%Y-%m-%d %H:%M:%S")
+        mark["ids"] = {k: v for k, v in seen.items() if v >= floor}
+    return ok
+
+def outlook_sync_results(lookback_days=60, progress=None, cancel=None, full=False):
+    """
+    Incremental results sync: only Sent Items / Inbox mail newer than the stored high-water
+    marks is read (first run, or full=True: the last `lookback_days`). "[ref:]" hits are merged
+    into results by Ref -- the first DateSent / DateReplied recorded for a ref is kept. The marks
+    are saved only after the merge has been written to the active store (gf_store).
+    Returns (sent refs found, reply refs found) for this run.
+    """
+    sess = outlook_session()
+    state = {} if full else _load_sync_state()
+    marks = {"sent": dict(state.get("sent") or {}), "inbox": dict(state.get("inbox") or {})}
+    updates = {}
+    found = {"DateSent": set(), "DateReplied": set()}
+    scanned = [0]
+
+    def _merge(field):
+        def _on_ref(ref, when):
+            found[field].add(ref)
+            updates.setdefault(ref, {}).setdefault(field, when)   # oldest hit in this run wins
+        return _on_ref
+
+    def _fill(ref, dates):
+        def _fn(cur):
+            r = dict(cur or {"Ref": ref, "Email": "", "Company": "", "Industry": "",
+                             "DateSent": "", "DateReplied": "", "Status": "", "Subject": ""})
+            todo = {f: w for f, w in dates.items() if not (r.get(f) or "").strip()}
+            if not todo:
+                return None
+            r.update(todo)
+            return r
+        return _fn
+
+    def _tick():
+        scanned[0] += 1
+        if callable(progress) and scanned[0] % 100 == 0:
+            progress(scanned[0], None)
+
+    done = (_sync_folder(sess, lambda s: s.sent(), "SentOn", marks["sent"], lookback_days,
+                         _merge("DateSent"), cancel, _tick)
+            and _sync_folder(sess, lambda s: s.inbox(), "ReceivedTime", marks["inbox"], lookback_days,
+                             _merge("DateReplied"), cancel, _tick))
+    # marks only move once the merged dates are in the store: a failed write leaves the old
+    # marks, so the next run re-reads those messages
+    update_results({ref: _fill(ref, dates) for ref, dates in updates.items()})
+    _save_sync_state(marks)
+    if done:  # a partial scan is merged (and its marks kept), but does not count as a completed sync
         try:
-            m = inbox_recent.Item(i)
-            subj = str(getattr(m,"Subject","") or "")
-            rm = REF_RE.search(subj)
-            if rm:
-                reply_map[rm.group(1).lower()] = str(getattr(m,"ReceivedTime","") or "")
+            LAST_SYNC_PATH.write_text(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), encoding="utf-8")
         except Exception:
-            continue
-    rows = load_results_rows_sorted()
-    byref = {r["Ref"].lower(): r for r in rows}
-    for ref, dt in sent_map.items():
-        if ref in byref:
-            byref[ref]["DateSent"] = dt
-        else:
-            byref[ref] = {"Ref":ref,"Email":"","Company":"","Industry":"","DateSent":dt,"DateReplied":"","Status":"","Subject":""}
-    for ref, dt in reply_map.items():
-        if ref in byref:
-            byref[ref]["DateReplied"] = dt
-        else:
-            byref[ref] = {"Ref":ref,"Email":"","Company":"","Industry":"","DateSent":"","DateReplied":dt,"Status":"","Subject":""}
-    out = list(byref.values())
-    with RESULTS_PATH.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"])
-        w.writeheader(); w.writerows(out)
-    try:
-        LAST_SYNC_PATH.write_text(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), encoding="utf-8")
-    except Exception:
-        pass
-    return len(sent_map), len(reply_map)
+            pass
+    if callable(progress):
+        progress(scanned[0], scanned[0])
+    return len(found["DateSent"]), len(found["DateReplied"])
 
 def upsert_result(ref_short, email, company, industry, subject):
     """Convenience updater for results cache when drafting."""
-    rows = load_results_rows_sorted()
-    byref = { (r.get("Ref","") or "").lower(): r for r in rows }
-    key = (ref_short or "").lower()
-    r = byref.get(key)
-    if not r:
-        r = {"Ref": ref_short, "Email": email, "Company": company, "Industry": industry,
-             "DateSent": "", "DateReplied": "", "Status": "", "Subject": subject or ""}
-        rows.append(r)
-    else:
-        r["Email"] = email or r.get("Email","")
-        r["Company"] = company or r.get("Company","")
-        r["Industry"] = industry or r.get("Industry","")
-        r["Subject"] = subject or r.get("Subject","")
-    with RESULTS_PATH.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"])
-        w.writeheader(); w.writerows(rows)
+    _store_upsert_result(ref_short, email, company, industry, subject)
 
 # -----------------------------------------------------------------------------------
 # Chunk 4: shared time parsing + daily activity (non-UI)
 # -----------------------------------------------------------------------------------
 LAST_SYNC_PATH = APP_DIR / "last_outlook_sync.txt"
+SYNC_STATE_PATH = APP_DIR / "last_outlook_sync.json"
 
 def _today_date():
     return datetime.now().date()
@@ -807,29 +813,11 @@ def _fmt_money(x):
         return "0.00"
 
 def _parse_any_datetime(s):
-    s = (s or "").strip()
-    if not s:
-        return None
-    fmts = [
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-        "%m/%d/%Y %I:%M:%S %p",
-        "%m/%d/%Y %I:%M %p",
-        "%m/%d/%Y",
-    ]
-    for fmt in fmts:
-        try:
-            return datetime.strptime(s, fmt)
-        except Exception:
-            pass
-    alt = s.replace("-", "/")
-    if alt != s:
-        for fmt in ("%m/%d/%Y %I:%M:%S %p", "%m/%d/%Y %I:%M %p", "%m/%d/%Y"):
-            try:
-                return datetime.strptime(alt, fmt)
-            except Exception:
-                pass
-    return None
+    """Naive datetime (local wall clock) or None; offsets are converted to local time."""
+    dt = parse_datetime(s)
+    if dt is not None and dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
 
 def _read_last_sync_str():
     try:
@@ -842,103 +830,23 @@ def _read_last_sync_str():
 def compute_daily_activity(target_date=None):
     """Return dict with metrics for the given date (default: today)."""
     d = target_date or _today_date()
-
-    # Calls (dialer_results.csv)
-    calls_total = calls_green = calls_gray = calls_red = 0
-    try:
-        if DIALER_RESULTS_PATH.exists():
-            with DIALER_RESULTS_PATH.open("r", encoding="utf-8", newline="") as f:
-                rdr = csv.DictReader(f)
-                for r in rdr:
-                    ts = _parse_any_datetime(r.get("Timestamp",""))
-                    if ts and ts.date() == d:
-                        calls_total += 1
-                        oc = (r.get("Outcome","") or "").strip().lower()
-                        if oc == "green": calls_green += 1
-                        elif oc == "gray": calls_gray += 1
-                        elif oc == "red":  calls_red  += 1
-    except Exception:
-        pass
-
-    # Emails sent (results.csv)
-    emails_sent = 0
-    try:
-        if RESULTS_PATH.exists():
-            with RESULTS_PATH.open("r", encoding="utf-8", newline="") as f:
-                rdr = csv.DictReader(f)
-                for r in rdr:
-                    ds = _parse_any_datetime(r.get("DateSent",""))
-                    if ds and ds.date() == d:
-                        emails_sent += 1
-    except Exception:
-        pass
-
-    # New Warm Leads
-    new_warm = 0
-    try:
-        if WARM_LEADS_PATH.exists():
-            with WARM_LEADS_PATH.open("r", encoding="utf-8", newline="") as f:
-                rdr = csv.DictReader(f)
-                fc_field = "First Contact" if "First Contact" in (rdr.fieldnames or []) else "Timestamp"
-                for r in rdr:
-                    fc_val = r.get(fc_field, "")
-                    dt = _parse_any_datetime(fc_val)
-                    if dt and dt.date() == d:
-                        new_warm += 1
-    except Exception:
-        pass
-
-    # New Accounts (customers.csv)
-    new_accounts = 0
-    try:
-        if CUSTOMERS_PATH.exists():
-            with CUSTOMERS_PATH.open("r", encoding="utf-8", newline="") as f:
-                rdr = csv.DictReader(f)
-                for r in rdr:
-                    cs = (r.get("Customer Since","") or "").strip()
-                    fo = (r.get("First Order Date","") or "").strip()
-                    ok = False
-                    if cs:
-                        dt = _parse_any_datetime(cs)
-                        ok = (dt and dt.date() == d)
-                    if not ok and fo:
-                        dt = _parse_any_datetime(fo)
-                        ok = (dt and dt.date() == d)
-                    if ok:
-                        new_accounts += 1
-    except Exception:
-        pass
-
-    # Daily Sales (orders.csv)
-    orders_count = 0
-    sales_sum = 0.0
     try:
         ensure_orders_file()
-        if ORDERS_PATH.exists():
-            with ORDERS_PATH.open("r", encoding="utf-8", newline="") as f:
-                rdr = csv.DictReader(f)
-                for r in rdr:
-                    od = _parse_any_datetime(r.get("Order Date",""))
-                    if od and od.date() == d:
-                        orders_count += 1
-                        try:
-                            sales_sum += float(str(r.get("Amount","") or "0").replace(",",""))
-                        except Exception:
-                            pass
     except Exception:
         pass
-
+    # Same single-pass day buckets the analytics panels use
+    a = activity_for_day(d)
     return {
         "date": d.strftime("%Y-%m-%d"),
-        "calls_total": calls_total,
-        "calls_green": calls_green,
-        "calls_gray": calls_gray,
-        "calls_red":  calls_red,
-        "emails_sent": emails_sent,
-        "new_warm": new_warm,
-        "new_accounts": new_accounts,
-        "orders_count": orders_count,
-        "sales_sum": sales_sum,
+        "calls_total": a["dialer_calls"],
+        "calls_green": a["dialer_green"],
+        "calls_gray": a["dialer_gray"],
+        "calls_red":  a["dialer_red"],
+        "emails_sent": a["emails"],
+        "new_warm": a["warms"],
+        "new_accounts": a["newcus"],
+        "orders_count": a["orders"],
+        "sales_sum": a["sales"],
         "last_sync": _read_last_sync_str(),
     }
 
@@ -953,118 +861,13 @@ def _campaign_get_lead_row_for_ref(crow):
         enr["Company"] = crow.get("Company","")
     return enr
 
-def _campaign_stage_from_results_if_needed(ref_short, cur_stage):
-    try:
-        if int(cur_stage or 0) > 0:
-            return int(cur_stage)
-    except Exception:
-        pass
-    try:
-        res_map = _read_results_by_ref()
-        r = res_map.get((ref_short or "").strip().lower())
-        sent_dt = _results_sent_dt(r) if r else None  # defined in campaigns chunk normally
-        return 1 if sent_dt else 0
-    except Exception:
-        return int(cur_stage or 0)
-
 def process_campaign_queue():
     """
-    - If a ref has DateReplied -> remove from campaigns.
-    - If stage==0 and DateSent exists -> set stage=1.
-    - If stage==1 and due and no reply -> draft E2 via _draft_next_stage_stub, stage=2.
-    - If stage==2 and due and no reply -> draft E3 via _draft_next_stage_stub, stage=3.
-    - If stage==3 and no reply and divert flag -> push to Dialer & remove.
+    Run the campaign follow-ups that are due (gf_schedule keeps a due-date heap next to
+    campaigns.csv, so refs that are not due are not looked at):
+    - replied -> removed; stage 0 with DateSent -> stage 1
+    - stage 1/2 whose delay has passed -> draft E2/E3, stage 2/3
+    - stage 3 without a reply -> pushed to the Dialer (divert flag) and removed
     """
-    ensure_campaigns_file()
-    rows = _read_campaign_rows()
-    changed = False
-
-    try:
-        # These helpers live in campaigns config module; import at runtime if needed
-        from gf_campaigns import load_campaign_by_key, normalize_campaign_steps, normalize_campaign_settings
-        from gf_campaigns import _read_results_by_ref, _results_replied, _results_sent_dt
-    except Exception:
-        # Fallback to local if available
-        pass
-
-    try:
-        res_map = _read_results_by_ref()
-    except Exception:
-        res_map = {}
-
-    for r in rows[:]:
-        ref = r.get("Ref","")
-        key = r.get("CampaignKey","default")
-        divert_csv = r.get("DivertToDialer", "")
-        try:
-            stage = int(r.get("Stage","0") or 0)
-        except Exception:
-            stage = 0
-
-        res = res_map.get((ref or "").strip().lower())
-        try:
-            replied = _results_replied(res) if res else False
-        except Exception:
-            replied = False
-        if replied:
-            rows.remove(r); changed = True; continue
-
-        new_stage = _campaign_stage_from_results_if_needed(ref, stage)
-        if new_stage != stage:
-            r["Stage"] = str(new_stage); stage = new_stage; changed = True
-
-        try:
-            steps, settings = load_campaign_by_key(key)
-            steps = normalize_campaign_steps(steps)
-            settings = normalize_campaign_settings(settings)
-        except Exception:
-            steps, settings = [], {}
-
-        try:
-            divert_effective = (str(divert_csv).strip() in ("1","true","True"))
-            if str(divert_csv).strip() == "":
-                divert_effective = (settings.get("send_to_dialer_after") in ("1", True))
-        except Exception:
-            divert_effective = (settings.get("send_to_dialer_after") in ("1", True))
-
-        if stage == 1:
-            lead = _campaign_get_lead_row_for_ref(r)
-            try:
-                drafted = globals().get("_draft_next_stage_stub", lambda *a, **k: False)(
-                    ref, lead.get("Email",""), lead.get("Company",""), key, 2
-                )
-                if drafted:
-                    r["Stage"] = "2"; changed = True
-            except Exception:
-                pass
-
-        elif stage == 2:
-            lead = _campaign_get_lead_row_for_ref(r)
-            try:
-                drafted = globals().get("_draft_next_stage_stub", lambda *a, **k: False)(
-                    ref, lead.get("Email",""), lead.get("Company",""), key, 3
-                )
-                if drafted:
-                    r["Stage"] = "3"; changed = True
-            except Exception:
-                pass
-
-        elif stage >= 3:
-            try:
-                replied = _results_replied(res) if res else False
-            except Exception:
-                replied = False
-            if not replied and divert_effective:
-                lead = _campaign_get_lead_row_for_ref(r)
-                try:
-                    ensure_dialer_leads_file()
-                    cur = load_dialer_leads_matrix()
-                    base = [lead.get(h,"") for h in HEADER_FIELDS]
-                    cur.append(base + ["○","○","○"] + ([""]*8))
-                    save_dialer_leads_matrix(cur)
-                except Exception:
-                    pass
-            rows.remove(r); changed = True
-
-    if changed:
-        _write_campaign_rows(rows)
+    from gf_schedule import run_due
+    return run_due()
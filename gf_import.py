@@ -0,0 +1,294 @@
+# gf_import.py
+# Streaming bulk lead import (CSV / TSV lead lists, 50k-500k rows) into the Email Leads file.
+# - Reads the source file row by row (delimiter sniffed from the header line); columns are
+#   mapped onto HEADER_FIELDS by name (aliases: "E-mail Address", "Business Name", "Zip", ...)
+# - Normalizes email (lowercase, no mailto:), US phone numbers ("(555) 123-4567") and
+#   state names ("Texas" -> "TX")
+# - Drops: invalid emails, leads already drafted (SEEN fingerprint index), emails on
+#   no_interest.csv, existing customers (email or company), emails already in the leads
+#   file, and duplicates inside the source file
+# - Appends accepted rows to the leads CSV in chunks (header order of the existing file),
+#   calling progress(stats) after every chunk
+# - Memory stays flat in the size of the source: one chunk of rows at a time; the only
+#   growing state is one 8-byte hash per distinct email
+#
+# Usage:
+#   stats = import_leads_file(path, progress=lambda st: print(st["read"], st["imported"]))
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from gf_store import (
+    EMAIL_LEADS_PATH,
+    NO_INTEREST_PATH,
+    CUSTOMERS_PATH,
+    HEADER_FIELDS,
+    SEEN,
+    _backup,
+    sqlite_backend,
+)
+from gf_helpers import valid_email, row_fingerprint_from_dict
+from gf_watch import note_own_write
+
+IMPORT_CHUNK_ROWS = 5000
+
+# normalized source header (lowercase, letters/digits only) -> HEADER_FIELDS name
+_HEADER_ALIASES: Dict[str, str] = {}
+for _field, _names in {
+    "Email": ("email", "emailaddress", "e-mail", "mail", "emails", "contactemail", "workemail", "businessemail"),
+    "First Name": ("firstname", "first", "fname", "givenname", "contactfirstname"),
+    "Last Name": ("lastname", "last", "lname", "surname", "familyname", "contactlastname"),
+    "Company": ("company", "companyname", "business", "businessname", "organization", "organisation",
+                "account", "accountname", "nameofbusiness"),
+    "Industry": ("industry", "category", "categories", "vertical", "sector", "type", "businesstype"),
+    "Phone": ("phone", "phonenumber", "phone #", "telephone", "tel", "mobile", "cell", "mainphone", "businessphone"),
+    "Address": ("address", "streetaddress", "street", "address1", "addressline1", "fulladdress"),
+    "City": ("city", "town", "locality"),
+    "State": ("state", "province", "region", "st", "stateprovince"),
+    "Reviews": ("reviews", "reviewcount", "googlereviews", "numberofreviews", "reviewscount"),
+    "Website": ("website", "url", "web", "site", "domain", "websiteurl", "homepage"),
+    "Notes": ("notes", "note", "comments", "comment", "description"),
+}.items():
+    for _n in _names + (_field,):
+        _HEADER_ALIASES[re.sub(r"[^a-z0-9]", "", _n.lower())] = _field
+_FULL_NAME_KEYS = {"name", "fullname", "contactname", "contact", "owner", "ownername"}
+
+US_STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC",
+    "florida": "FL", "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+    "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY", "louisiana": "LA",
+    "maine": "ME", "maryland": "MD", "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+    "mississippi": "MS", "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
+    "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC", "south dakota": "SD",
+    "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA",
+    "washington": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+    "puerto rico": "PR",
+}
+_STATE_CODES = set(US_STATES.values())
+
+
+# ----------------------------
+# Normalization
+# ----------------------------
+def normalize_email(s: str) -> str:
+    s = (s or "").strip().strip("<>").strip()
+    if s.lower().startswith("mailto:"):
+        s = s[7:]
+    # lists sometimes carry several addresses in one cell: keep the first
+    s = re.split(r"[;,\s]+", s)[0] if s else ""
+    return s.lower()
+
+
+def normalize_phone(s: str) -> str:
+    s = (s or "").strip()
+    digits = re.sub(r"\D", "", s.split("x")[0].split("ext")[0])
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    if len(digits) == 10:
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+    return s
+
+
+def normalize_state(s: str) -> str:
+    s = (s or "").strip().strip(".")
+    if len(s) == 2 and s.upper() in _STATE_CODES:
+        return s.upper()
+    return US_STATES.get(s.lower(), s)
+
+
+def _email_key(email: str) -> int:
+    return int.from_bytes(hashlib.blake2b(email.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def map_headers(header: List[str]) -> Dict[str, int]:
+    """HEADER_FIELDS name -> source column index (first match wins; "Name" is split later)."""
+    out: Dict[str, int] = {}
+    for i, h in enumerate(header):
+        key = re.sub(r"[^a-z0-9]", "", (h or "").lower())
+        field = _HEADER_ALIASES.get(key)
+        if field and field not in out:
+            out[field] = i
+        elif key in _FULL_NAME_KEYS and "_name" not in out:
+            out["_name"] = i
+    return out
+
+
+# ----------------------------
+# Suppression sets (built once per import)
+# ----------------------------
+def _csv_dicts(path: Path) -> Iterator[Dict[str, str]]:
+    try:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+    except FileNotFoundError:
+        return
+
+
+def _suppression() -> Dict[str, Set]:
+    no_interest = {_email_key(normalize_email(r.get("Email", ""))) for r in _csv_dicts(NO_INTEREST_PATH)}
+    db = sqlite_backend()
+    customers = db.rows("customers") if db is not None else _csv_dicts(CUSTOMERS_PATH)
+    cust_emails, cust_companies = set(), set()
+    for r in customers:
+        if r.get("Email"):
+            cust_emails.add(_email_key(normalize_email(r["Email"])))
+        if (r.get("Company") or "").strip():
+            cust_companies.add(r["Company"].strip().lower())
+    existing = {_email_key(normalize_email(r.get("Email", ""))) for r in _csv_dicts(EMAIL_LEADS_PATH)}
+    for s in (no_interest, cust_emails, existing):
+        s.discard(_email_key(""))
+    return {"no_interest": no_interest, "cust_emails": cust_emails,
+            "cust_companies": cust_companies, "existing": existing}
+
+
+def _leads_header() -> List[str]:
+    """Header of the current leads file (rows are appended in its column order)."""
+    try:
+        with EMAIL_LEADS_PATH.open("r", encoding="utf-8", newline="") as f:
+            hdr = next(csv.reader(f), None)
+        if hdr:
+            return hdr
+    except FileNotFoundError:
+        pass
+    return []
+
+
+def _count_rows(path: Path) -> int:
+    """Data rows in a CSV (streamed; quoted newlines counted correctly)."""
+    try:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            return max(0, sum(1 for _ in csv.reader(f)) - 1)
+    except FileNotFoundError:
+        return 0
+
+
+def _ends_open(path: Path) -> bool:
+    """True if the file is non-empty and its last line has no newline (Excel saves, hand edits)."""
+    try:
+        with path.open("rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+    except FileNotFoundError:
+        return False
+
+
+# ----------------------------
+# Import
+# ----------------------------
+def import_leads_file(path, progress: Optional[Callable[[Dict[str, int]], None]] = None,
+                      cancel: Optional[Callable[[], bool]] = None,
+                      chunk_rows: int = IMPORT_CHUNK_ROWS) -> Dict[str, int]:
+    """
+    Stream a CSV/TSV lead list into the leads file. Returns counters:
+      read, imported, invalid, drafted, no_interest, customer, existing, duplicate,
+      existing_rows (data lines in the leads file before the import), bytes, total_bytes
+    progress(stats) is called after every written chunk; cancel() is polled per chunk.
+    """
+    path = Path(path)
+    stats = {k: 0 for k in ("read", "imported", "invalid", "drafted", "no_interest",
+                            "customer", "existing", "duplicate", "existing_rows", "bytes")}
+    stats["total_bytes"] = path.stat().st_size
+    sup = _suppression()
+    taken: Set[int] = set()        # emails accepted by this import (8-byte hashes)
+
+    header = _leads_header()
+    if not header:
+        header = list(HEADER_FIELDS)
+        EMAIL_LEADS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with EMAIL_LEADS_PATH.open("w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerow(header)
+    else:
+        _backup(EMAIL_LEADS_PATH)
+    stats["existing_rows"] = _count_rows(EMAIL_LEADS_PATH)
+    out_cols = [HEADER_FIELDS.index(h) if h in HEADER_FIELDS else None for h in header]
+    close_last = _ends_open(EMAIL_LEADS_PATH)
+
+    with path.open("rb") as raw, EMAIL_LEADS_PATH.open("a", encoding="utf-8", newline="") as out:
+        if close_last:
+            out.write("\r\n")           # last line had no newline: close it before appending
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace", newline="")
+        first = text.readline()
+        delim = "\t" if first.count("\t") >= max(1, first.count(",")) else (";" if first.count(";") > first.count(",") else ",")
+        cols = map_headers(next(csv.reader([first], delimiter=delim), []))
+        rdr = csv.reader(text, delimiter=delim)
+        w = csv.writer(out)
+        n_fields = len(HEADER_FIELDS)
+        idx = [cols.get(h) for h in HEADER_FIELDS]
+        name_ix = cols.get("_name")
+        buf: List[List[str]] = []
+
+        def _flush():
+            w.writerows(buf)
+            out.flush()
+            stats["imported"] += len(buf)
+            buf.clear()
+            stats["bytes"] = raw.tell()
+            if callable(progress):
+                progress(dict(stats))
+
+        for src in rdr:
+            if not any(c.strip() for c in src):
+                continue
+            stats["read"] += 1
+            vals = [(src[i].strip() if i is not None and i < len(src) else "") for i in idx]
+            d = dict(zip(HEADER_FIELDS, vals))
+            if name_ix is not None and name_ix < len(src) and not d["First Name"]:
+                parts = src[name_ix].strip().split()
+                if parts:
+                    d["First Name"] = parts[0]
+                    d["Last Name"] = d["Last Name"] or " ".join(parts[1:])
+            d["Email"] = normalize_email(d["Email"])
+            d["Phone"] = normalize_phone(d["Phone"])
+            d["State"] = normalize_state(d["State"])
+
+            if not valid_email(d["Email"]):
+                stats["invalid"] += 1
+                continue
+            ek = _email_key(d["Email"])
+            if ek in sup["no_interest"]:
+                stats["no_interest"] += 1
+                continue
+            if ek in sup["cust_emails"] or (d["Company"] and d["Company"].lower() in sup["cust_companies"]):
+                stats["customer"] += 1
+                continue
+            if ek in sup["existing"]:
+                stats["existing"] += 1
+                continue
+            if ek in taken:
+                stats["duplicate"] += 1
+                continue
+            if row_fingerprint_from_dict(d) in SEEN:
+                stats["drafted"] += 1
+                continue
+            taken.add(ek)
+            row = [d[HEADER_FIELDS[i]] for i in range(n_fields)]
+            buf.append([(row[c] if c is not None else "") for c in out_cols])
+            if len(buf) >= chunk_rows:
+                _flush()
+                if callable(cancel) and cancel():
+                    break
+        _flush()
+    note_own_write(EMAIL_LEADS_PATH)
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    t0 = time.perf_counter()
+    st = import_leads_file(sys.argv[1], progress=lambda s: print(f"\r{s['read']:>8} read  {s['imported']:>8} imported", end=""))
+    print(f"\n{st}  ({time.perf_counter() - t0:.1f}s)")
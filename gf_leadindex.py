@@ -0,0 +1,207 @@
+# gf_leadindex.py
+# In-memory lookup of Email Leads rows by email / company (campaign queue, placeholders,
+# dialer divert) instead of a linear scan of the leads CSV per lookup.
+# - Maps normalized email (strip + lower) and company (strip + lower) to the byte offset of
+#   the first row that has it; rows themselves stay on disk, a lookup seeks and parses one
+#   record. 100k leads cost a few MB of keys, not the parsed file.
+# - Built lazily on the first lookup (quote-parity line scan, same as gf_pager); a file
+#   that only grew (bulk import, appends) is indexed from the old end, any other change of
+#   its (mtime, size) rebuilds the index.
+#
+# Usage:
+#   idx = LeadIndex(EMAIL_LEADS_PATH)
+#   row = idx.find(email, company)      # dict keyed by the file header, or None
+#
+# Pure stdlib, no app imports: gf_store owns the instance (gf_store.LEAD_INDEX).
+
+from __future__ import annotations
+
+import csv
+import io
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_TAIL_BYTES = 64     # bytes remembered from the end of the file to recognise a pure append
+
+
+def _key(s) -> str:
+    return (s or "").strip().lower()
+
+
+def _text(v) -> str:
+    return v.decode("utf-8", "replace") if isinstance(v, bytes) else v
+
+
+class LeadIndex:
+    def __init__(self, path: Path, email_col: str = "Email", company_col: str = "Company"):
+        self.path = Path(path)
+        self.email_col = email_col
+        self.company_col = company_col
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._sig: Optional[Tuple[int, int]] = None
+        self._header: List[str] = []
+        self._cols: Tuple[Optional[int], Optional[int]] = (None, None)
+        self._by_email: Dict[str, int] = {}
+        self._by_company: Dict[str, int] = {}
+        self._end = 0                    # bytes indexed so far
+        self._tail = b""
+        self._open_quote = False         # file ended inside a quoted field at the last scan
+
+    # ---- index ----
+    def _check(self) -> None:
+        try:
+            st = self.path.stat()
+            sig = (st.st_mtime_ns, st.st_size)
+        except Exception:
+            sig = None
+        if sig == self._sig:
+            return
+        if sig is None:
+            self._reset()
+            self._sig = None
+            return
+        if self._sig is not None and sig[1] > self._end and not self._open_quote and self._tail_unchanged():
+            self._scan(self._end)
+        else:
+            self._reset()
+            self._scan(0)
+        self._sig = sig
+
+    def _tail_unchanged(self) -> bool:
+        if not self._tail:
+            return False
+        try:
+            with self.path.open("rb") as f:
+                f.seek(self._end - len(self._tail))
+                return f.read(len(self._tail)) == self._tail
+        except Exception:
+            return False
+
+    def _scan(self, start: int) -> None:
+        by_email, by_company = self._by_email, self._by_company
+        with self.path.open("rb") as f:
+            f.seek(start)
+            off = start
+            if start == 0:
+                first, off = self._record(f, 0)
+                self._header = self._parse(first)
+                pos = {h: i for i, h in reversed(list(enumerate(self._header)))}
+                self._cols = (pos.get(self.email_col), pos.get(self.company_col))
+            ei, ci = self._cols
+            readline = f.readline
+            rec_start, parts, in_q = off, [], False
+            while True:
+                line = readline()
+                if not line:
+                    break
+                off += len(line)
+                parts.append(line)
+                if line.count(b'"') & 1:
+                    in_q = not in_q
+                if in_q:
+                    continue
+                rec = parts[0] if len(parts) == 1 else b"".join(parts)
+                row = self._parse(rec) if b'"' in rec else rec.rstrip(b"\r\n").split(b",")
+                if ei is not None and ei < len(row):
+                    by_email.setdefault(_key(_text(row[ei])), rec_start)
+                if ci is not None and ci < len(row):
+                    by_company.setdefault(_key(_text(row[ci])), rec_start)
+                rec_start, parts = off, []
+            self._open_quote = in_q
+            self._end = rec_start if in_q else off
+            f.seek(max(0, self._end - _TAIL_BYTES))
+            self._tail = f.read(self._end - max(0, self._end - _TAIL_BYTES))
+        by_email.pop("", None)
+        by_company.pop("", None)
+
+    @staticmethod
+    def _record(f, off: int) -> Tuple[bytes, int]:
+        parts, in_q = [], False
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            parts.append(line)
+            off += len(line)
+            if line.count(b'"') & 1:
+                in_q = not in_q
+            if not in_q:
+                break
+        return b"".join(parts), off
+
+    @staticmethod
+    def _parse(rec: bytes) -> List[str]:
+        text = rec.decode("utf-8-sig", "replace")
+        return next(csv.reader(io.StringIO(text)), []) if text.strip() else []
+
+    def _row_at(self, off: int) -> Optional[Dict[str, str]]:
+        try:
+            with self.path.open("rb") as f:
+                f.seek(off)
+                rec, _ = self._record(f, off)
+        except Exception:
+            return None
+        row = self._parse(rec)
+        n = len(self._header)
+        return dict(zip(self._header, (row + [""] * (n - len(row)))[:n]))
+
+    # ---- public ----
+    def find(self, email: str = "", company: str = "") -> Optional[Dict[str, str]]:
+        """First row with this email, else the first row with this company, else None."""
+        email_l, comp_l = _key(email), _key(company)
+        with self._lock:
+            self._check()
+            off = self._by_email.get(email_l) if email_l else None
+            if off is None and comp_l:
+                off = self._by_company.get(comp_l)
+            return self._row_at(off) if off is not None else None
+
+    def find_email(self, email: str) -> Optional[Dict[str, str]]:
+        return self.find(email, "")
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._check()
+            return len(self._by_email)
+
+
+if __name__ == "__main__":
+    # bench: python gf_leadindex.py  -> 100k leads, 5k lookups (email hits + company fallback)
+    import os
+    import random
+    import tempfile
+    import time
+
+    hdr = ["First Name", "Last Name", "Company", "Email", "Industry", "Notes"]
+    with tempfile.TemporaryDirectory() as d:
+        p = Path(d) / "leads.csv"
+        with p.open("w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(hdr)
+            for i in range(100_000):
+                note = 'two\nlines, "quoted"' if i % 97 == 0 else ""
+                w.writerow([f"F{i}", f"L{i}", f"Company {i}", f"User{i}@Example.com", "Dental", note])
+        idx = LeadIndex(p)
+        probe = random.Random(1).sample(range(100_000), 5000)
+        t0 = time.perf_counter()
+        ok = 0
+        for n, i in enumerate(probe):
+            r = idx.find(f"user{i}@example.com" if n % 2 else "nobody@x.com", f"company {i}")
+            ok += bool(r and r["First Name"] == f"F{i}")
+        t1 = time.perf_counter()
+        with p.open("a", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerow(["New", "Lead", "Appended Co", "new@lead.com", "", ""])
+        os.utime(p, ns=(time.time_ns(), time.time_ns() + 1))
+        t2 = time.perf_counter()
+        tail_ok = idx.find("new@lead.com") is not None and idx.find("user5@example.com") is not None
+        t3 = time.perf_counter()
+        print(f"5000 lookups over 100k leads (incl. build): {t1 - t0:.3f}s  correct={ok}/5000")
+        print(f"append picked up: {tail_ok}  ({(t3 - t2) * 1000:.1f} ms)  keys={len(idx)}")
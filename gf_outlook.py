@@ -0,0 +1,223 @@
+# gf_outlook.py
+# Shared Outlook (MAPI) session for every COM helper (drafting, results sync, campaign sends).
+# - Caches Application, Namespace, the resolved store and folder handles (Drafts / Sent / Inbox /
+#   Drafts subfolders), so account enumeration + subfolder scans happen once per session
+# - One cache per thread: COM objects belong to the apartment that created them, so the UI
+#   thread and the gf_worker thread each get their own OutlookSession
+# - Transparent reconnect: run(op, fn) retries once on a fresh session if fn fails -- fn must make
+#   the first real COM call (Items.Add / CreateItem / Restrict), not just return cached handles;
+#   guard(op) wraps the follow-up calls (Save / Move / Send / GetNext): a failure there drops the
+#   cached handles (no retry, so nothing is saved or sent twice) and the next call reconnects
+# - Timing counters per COM operation: com_stats() / reset_com_stats()
+#
+# Usage:
+#   sess = get_session(hint)                       # hint = optional mailbox name / SMTP fragment
+#   msg = sess.run("draft.create", lambda s: s.drafts_subfolder("GrowthFarm").Items.Add("IPM.Note"))
+#   with sess.guard("draft.save"): msg.Save()
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+OL_FOLDER_SENT = 5
+OL_FOLDER_INBOX = 6
+OL_FOLDER_DRAFTS = 16
+
+
+# ----------------------------
+# Timing counters
+# ----------------------------
+_STATS: Dict[str, list] = {}          # op -> [calls, total_seconds, max_seconds, errors]
+_STATS_LOCK = threading.Lock()
+
+
+def _record(op: str, dt: float, failed: bool = False) -> None:
+    with _STATS_LOCK:
+        st = _STATS.get(op)
+        if st is None:
+            st = _STATS[op] = [0, 0.0, 0.0, 0]
+        st[0] += 1
+        st[1] += dt
+        if dt > st[2]:
+            st[2] = dt
+        if failed:
+            st[3] += 1
+
+
+@contextmanager
+def com_timer(op: str):
+    """Time a block of COM calls under `op` (errors are counted and re-raised)."""
+    t0 = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        _record(op, time.perf_counter() - t0, failed)
+
+
+def com_stats() -> Dict[str, Dict[str, float]]:
+    """{op: {"calls", "total_s", "avg_ms", "max_ms", "errors"}} since the last reset."""
+    with _STATS_LOCK:
+        snap = {k: list(v) for k, v in _STATS.items()}
+    return {
+        op: {
+            "calls": calls,
+            "total_s": round(total, 4),
+            "avg_ms": round(total / calls * 1000.0, 3) if calls else 0.0,
+            "max_ms": round(mx * 1000.0, 3),
+            "errors": errs,
+        }
+        for op, (calls, total, mx, errs) in snap.items()
+    }
+
+
+def reset_com_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.clear()
+
+
+# ----------------------------
+# Store selection
+# ----------------------------
+def pick_store(namespace, hint: str = ""):
+    """Default store, or the account / store whose name or SMTP address contains `hint`."""
+    store = namespace.DefaultStore
+    if hint:
+        hint = hint.lower()
+        for i in range(1, namespace.Accounts.Count + 1):
+            acc = namespace.Accounts.Item(i)
+            smtp = (getattr(acc, "SmtpAddress", "") or "").lower()
+            disp = (acc.DisplayName or "").lower()
+            if hint in smtp or hint in disp:
+                try:
+                    return acc.DeliveryStore
+                except Exception:
+                    pass
+        for i in range(1, namespace.Stores.Count + 1):
+            st = namespace.Stores.Item(i)
+            if hint in (st.DisplayName or "").lower():
+                store = st
+                break
+    return store
+
+
+# ----------------------------
+# Session
+# ----------------------------
+class OutlookSession:
+    """Lazily-resolved, cached COM handles for one thread. Call reset() to drop them."""
+
+    def __init__(self, hint: str = ""):
+        self.hint = hint or ""
+        self._app = None
+        self._ns = None
+        self._store = None
+        self._folders: Dict[Any, Any] = {}
+
+    def reset(self) -> None:
+        self._app = self._ns = self._store = None
+        self._folders.clear()
+
+    def app(self):
+        if self._app is None:
+            import win32com.client as win32
+            with com_timer("dispatch"):
+                self._app = win32.Dispatch("Outlook.Application")
+        return self._app
+
+    def namespace(self):
+        if self._ns is None:
+            app = self.app()
+            with com_timer("namespace"):
+                self._ns = app.GetNamespace("MAPI")
+        return self._ns
+
+    def store(self):
+        if self._store is None:
+            ns = self.namespace()
+            with com_timer("pick_store"):
+                self._store = pick_store(ns, self.hint)
+        return self._store
+
+    def folder(self, default_id: int):
+        f = self._folders.get(default_id)
+        if f is None:
+            store = self.store()
+            with com_timer("default_folder"):
+                f = self._folders[default_id] = store.GetDefaultFolder(default_id)
+        return f
+
+    def drafts(self):
+        return self.folder(OL_FOLDER_DRAFTS)
+
+    def sent(self):
+        return self.folder(OL_FOLDER_SENT)
+
+    def inbox(self):
+        return self.folder(OL_FOLDER_INBOX)
+
+    def drafts_subfolder(self, name: str):
+        """Returns/creates a subfolder under Drafts (case-insensitive name match)."""
+        key = ("drafts", (name or "").strip().lower())
+        f = self._folders.get(key)
+        if f is not None:
+            return f
+        root = self.drafts()
+        with com_timer("drafts_subfolder"):
+            for i in range(1, root.Folders.Count + 1):
+                cand = root.Folders.Item(i)
+                if (cand.Name or "").lower() == key[1]:
+                    f = cand
+                    break
+            if f is None:
+                f = root.Folders.Add(name)
+        self._folders[key] = f
+        return f
+
+    def run(self, op: str, fn: Callable[["OutlookSession"], Any]):
+        """
+        Run fn(self) timed under `op`. If it fails (Outlook restarted, handle went stale),
+        drop every cached handle and retry once on a fresh connection.
+        """
+        try:
+            with com_timer(op):
+                return fn(self)
+        except Exception:
+            self.reset()
+        with com_timer(op):
+            return fn(self)
+
+    @contextmanager
+    def guard(self, op: str):
+        """Time a block of COM calls under `op`; if it fails, drop the cached handles and re-raise."""
+        try:
+            with com_timer(op):
+                yield
+        except Exception:
+            self.reset()
+            raise
+
+
+_LOCAL = threading.local()
+
+
+def get_session(hint: str = "") -> OutlookSession:
+    """The calling thread's cached session (re-created if the mailbox hint changed)."""
+    sess: Optional[OutlookSession] = getattr(_LOCAL, "session", None)
+    if sess is None or sess.hint != (hint or ""):
+        sess = _LOCAL.session = OutlookSession(hint)
+    return sess
+
+
+def drop_session() -> None:
+    """Forget this thread's session (call before CoUninitialize)."""
+    sess = getattr(_LOCAL, "session", None)
+    if sess is not None:
+        sess.reset()
+    _LOCAL.session = None
@@ -0,0 +1,450 @@
+# gf_pager.py
+# Paged access to the big grid CSVs (Email Leads, Dialer, Customers) so a grid never holds
+# the whole file: it shows one page of PAGE_ROWS rows and saves splice that page back.
+# - CsvPager: sparse row -> byte-offset index (one mark every INDEX_STRIDE rows), built
+#   incrementally as pages are requested; quoted newlines are handled with a quote-parity
+#   line scan. read(start, n) seeks to the nearest mark and parses only those rows.
+#   replace(start, old_n, rows) streams the bytes before and after the range into a tmp
+#   file (no CSV parsing of the rest) and swaps it in atomically; the index is shifted,
+#   not rebuilt. Columns are mapped by header name, a file with an older header is
+#   rewritten once to the canonical one on the first save.
+# - The total row count is only needed for the "of N" label: count_known() is None until
+#   a scan reached the end, scan_async() finishes it on a daemon thread.
+# - An edit of the file by anyone else (Excel, full-file writers) changes its (mtime, size)
+#   and drops the index on the next call.
+# - GridPage: the page a grid is showing (page number, rows loaded from the file, padding).
+#
+# Usage:
+#   pager = CsvPager(EMAIL_LEADS_PATH, HEADER_FIELDS, before_write=_backup, on_write=note_own_write)
+#   grid = GridPage(pager, ncols=len(HEADER_FIELDS), min_rows=200)
+#   sheet = Sheet(..., data=grid.load())
+#   grid.save(matrix_from_sheet)        # page rows only; the rest of the file is copied as-is
+#
+# Pure stdlib, no app imports: gf_store / gf_dialer own the instances.
+
+from __future__ import annotations
+
+import bisect
+import csv
+import io
+import itertools
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+PAGE_ROWS = 5000           # rows per grid page
+INDEX_STRIDE = 1000        # one byte-offset mark per this many rows
+SCAN_CHUNK_ROWS = 50000    # background count: rows scanned per lock hold
+_COPY_BYTES = 1 << 20
+
+Rows = List[List[str]]
+
+
+def _sig(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except Exception:
+        return None
+
+
+def _copy_range(src, dst, start: int, end: Optional[int]) -> None:
+    src.seek(start)
+    left = None if end is None else end - start
+    while left is None or left > 0:
+        buf = src.read(_COPY_BYTES if left is None else min(_COPY_BYTES, left))
+        if not buf:
+            break
+        dst.write(buf)
+        if left is not None:
+            left -= len(buf)
+
+
+def column_mapper(headers: Sequence[str], aliases: Optional[Dict[str, Sequence[str]]] = None,
+                  defaults: Optional[Dict[str, str]] = None):
+    """
+    mapper(file_header) -> fn(raw_row) -> row in `headers` order. `aliases` are older
+    header names accepted for a column; `defaults` fill columns that are missing or empty.
+    """
+    aliases = aliases or {}
+    defaults = defaults or {}
+
+    def _mapper(file_header: List[str]):
+        pos = {h: i for i, h in reversed(list(enumerate(file_header)))}
+        idx = []
+        for h in headers:
+            ix = pos.get(h)
+            for alt in aliases.get(h, ()):
+                if ix is None:
+                    ix = pos.get(alt)
+            idx.append(ix)
+        fill = [defaults.get(h, "") for h in headers]
+        if list(file_header) == list(headers) and not defaults:
+            n = len(headers)
+            return lambda r: (r + [""] * (n - len(r)))[:n] if len(r) != n else r
+        return lambda r: [((r[ix] if ix is not None and ix < len(r) else "") or d) for ix, d in zip(idx, fill)]
+
+    return _mapper
+
+
+class CsvPager:
+    def __init__(self, path: Path, headers: Sequence[str], mapper=None,
+                 transform: Optional[Callable[[Rows], Rows]] = None,
+                 before_write: Optional[Callable[[Path], None]] = None,
+                 on_write: Optional[Callable[[Path], None]] = None,
+                 stride: int = INDEX_STRIDE):
+        self.path = Path(path)
+        self.headers = list(headers)
+        self._mapper = mapper or column_mapper(self.headers)
+        self._transform = transform          # applied to every page read and every page saved
+        self._before_write = before_write
+        self._on_write = on_write
+        self.stride = max(1, stride)
+        self._lock = threading.RLock()
+        self._scanner: Optional[threading.Thread] = None
+        self._reset()
+
+    # ---- index ----
+    def _reset(self) -> None:
+        self._sig = None
+        self._file_header: Optional[List[str]] = None
+        self._map = None
+        self._marks: List[Tuple[int, int]] = []     # (data row, byte offset of its first line)
+        self._front = (0, 0)                         # scan frontier: first row not indexed yet
+        self._total: Optional[int] = None            # set once the scan reached EOF
+        self._size = 0
+
+    def _check(self) -> None:
+        """(Re)open the index if the file is new or was changed behind our back."""
+        sig = _sig(self.path)
+        if self._file_header is not None and sig == self._sig:
+            return
+        self._reset()
+        self._sig = sig
+        if sig is None:
+            self._file_header = []
+            self._total = 0
+            return
+        self._size = sig[1]
+        with self.path.open("rb") as f:
+            line, n = self._read_record(f)
+        text = line.decode("utf-8-sig", "replace")
+        self._file_header = next(csv.reader(io.StringIO(text)), []) if text.strip() else []
+        self._map = self._mapper(self._file_header)
+        self._marks = [(0, n)]
+        self._front = (0, n)
+        if n >= self._size:
+            self._total = 0
+
+    @staticmethod
+    def _read_record(f) -> Tuple[bytes, int]:
+        """One CSV record (possibly several physical lines) -> (bytes, length)."""
+        parts = []
+        in_q = False
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            parts.append(line)
+            if line.count(b'"') & 1:
+                in_q = not in_q
+            if not in_q:
+                break
+        rec = b"".join(parts)
+        return rec, len(rec)
+
+    def _scan(self, to_row: Optional[int] = None, max_rows: Optional[int] = None) -> None:
+        """Advance the frontier to `to_row` (or by `max_rows`, or to EOF), adding marks."""
+        if self._total is not None:
+            return
+        row, off = self._front
+        stop = to_row if to_row is not None else (row + max_rows if max_rows is not None else None)
+        stride = self.stride
+        marks = self._marks
+        with self.path.open("rb") as f:
+            f.seek(off)
+            readline = f.readline
+            in_q = False
+            while stop is None or row < stop:
+                line = readline()
+                if not line:
+                    if in_q:               # unterminated quote: the tail is one last record
+                        row += 1
+                    self._total = row
+                    break
+                off += len(line)
+                if line.count(b'"') & 1:
+                    in_q = not in_q
+                if in_q:
+                    continue
+                row += 1
+                if row % stride == 0:
+                    marks.append((row, off))
+        self._front = (row, off)
+        if self._total is None and off >= self._size:
+            self._total = row
+
+    def _offset(self, row: int) -> Tuple[int, int]:
+        """(row, byte offset) of data row `row`, clamped to the end of the file."""
+        if row > self._front[0]:
+            self._scan(to_row=row)
+        if self._total is not None and row >= self._total:
+            return self._front
+        i = bisect.bisect_right(self._marks, (row, float("inf"))) - 1
+        mrow, off = self._marks[i]
+        if mrow == row:
+            return row, off
+        with self.path.open("rb") as f:
+            f.seek(off)
+            for _ in range(row - mrow):
+                off += self._read_record(f)[1]
+        return row, off
+
+    # ---- public ----
+    def file_header(self) -> List[str]:
+        with self._lock:
+            self._check()
+            return list(self._file_header or [])
+
+    def count_known(self) -> Optional[int]:
+        """Data rows in the file, or None while the index has not reached the end yet."""
+        with self._lock:
+            self._check()
+            return self._total
+
+    def rows_seen(self) -> int:
+        with self._lock:
+            return self._front[0]
+
+    def count(self) -> int:
+        with self._lock:
+            self._check()
+            self._scan()
+            return self._total or 0
+
+    def scan_async(self, on_done: Optional[Callable[[int], None]] = None) -> None:
+        """Finish the row count on a daemon thread (short lock holds; pages stay responsive)."""
+        if self._scanner is not None and self._scanner.is_alive():
+            return
+
+        def _run():
+            try:
+                while True:
+                    with self._lock:
+                        self._check()
+                        if self._total is not None:
+                            total = self._total
+                            break
+                        self._scan(max_rows=SCAN_CHUNK_ROWS)
+                if callable(on_done):
+                    on_done(total)
+            except Exception:
+                pass
+
+        self._scanner = threading.Thread(target=_run, name="gf-pager-scan", daemon=True)
+        self._scanner.start()
+
+    def read(self, start: int, n: int) -> Rows:
+        """Rows [start, start + n) in `headers` order (fewer at the end of the file)."""
+        with self._lock:
+            self._check()
+            if self._sig is None or n <= 0:
+                return []
+            row, off = self._offset(start)
+            if self._total is not None and row >= self._total:
+                return []
+            with self.path.open("rb") as raw:
+                raw.seek(off)
+                text = io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="")
+                out = [self._map(r) if r else [""] * len(self.headers)
+                       for r in itertools.islice(csv.reader(text), n)]
+                text.detach()
+        return self._transform(out) if self._transform else out
+
+    def replace(self, start: int, old_n: int, rows: Iterable[Sequence[str]]) -> None:
+        """
+        Replace data rows [start, start + old_n) by `rows` (insert with old_n=0, append with
+        start >= count). Everything outside the range is copied byte for byte.
+        """
+        n = len(self.headers)
+        rows = [(list(r) + [""] * n)[:n] for r in rows]
+        if self._transform:
+            rows = self._transform(rows)
+        with self._lock:
+            self._check()
+            if self._sig is None or self._file_header != self.headers:
+                self._normalize()
+            a_row, a_off = self._offset(start)
+            b_row, b_off = self._offset(max(a_row, start + old_n))
+            buf = io.StringIO()
+            csv.writer(buf).writerows(rows)
+            data = buf.getvalue().encode("utf-8")
+            lead = b""
+            if a_off >= self._size and a_off > 0:
+                with self.path.open("rb") as f:
+                    f.seek(a_off - 1)
+                    if f.read(1) != b"\n":
+                        lead = b"\r\n"        # last line had no newline: close it before appending
+            if callable(self._before_write):
+                self._before_write(self.path)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with self.path.open("rb") as src, tmp.open("wb") as dst:
+                _copy_range(src, dst, 0, a_off)
+                dst.write(lead)
+                dst.write(data)
+                _copy_range(src, dst, b_off, None)
+            os.replace(tmp, self.path)
+            if callable(self._on_write):
+                self._on_write(self.path)
+
+            # shift the index instead of rebuilding it
+            a_off += len(lead)
+            d_rows = len(rows) - (b_row - a_row)
+            d_bytes = len(lead) + len(data) - (b_off - (a_off - len(lead)))
+            keep = [m for m in self._marks if m[0] <= a_row]
+            if keep[-1][0] != a_row:
+                keep.append((a_row, a_off))
+            end = (a_row + len(rows), b_off + d_bytes)
+            if end != keep[-1]:
+                keep.append(end)
+            keep += [(r + d_rows, o + d_bytes) for r, o in self._marks if r > b_row]
+            self._marks = keep
+            fr, fo = self._front
+            self._front = (fr + d_rows, fo + d_bytes) if fr >= b_row else end
+            if self._total is not None:
+                self._total += d_rows
+            self._sig = _sig(self.path)
+            self._size = self._sig[1] if self._sig else 0
+
+    def append(self, rows: Iterable[Sequence[str]]) -> None:
+        with self._lock:
+            self.replace(self.count(), 0, rows)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def _normalize(self) -> None:
+        """Rewrite the file once with the canonical header (columns mapped by name)."""
+        exists = self._sig is not None
+        if exists and callable(self._before_write):
+            self._before_write(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8", newline="") as dst:
+            w = csv.writer(dst)
+            w.writerow(self.headers)
+            if exists:
+                with self.path.open("r", encoding="utf-8", errors="replace", newline="") as src:
+                    rdr = csv.reader(src)
+                    next(rdr, None)
+                    for r in rdr:
+                        w.writerow(self._map(r) if r else [""] * len(self.headers))
+        os.replace(tmp, self.path)
+        if callable(self._on_write):
+            self._on_write(self.path)
+        self._reset()
+        self._check()
+
+
+class GridPage:
+    """The page of a pager one grid is showing; `loaded` = file rows the grid page stands for."""
+
+    def __init__(self, pager, ncols: int, min_rows: int = 0, page_rows: int = PAGE_ROWS,
+                 pad_row: Optional[List[str]] = None):
+        self.pager = pager
+        self.ncols = ncols
+        self.min_rows = min_rows
+        self.page_rows = page_rows
+        self.pad_row = list(pad_row) if pad_row is not None else [""] * ncols
+        self.page = 0
+        self.loaded = 0
+
+    @property
+    def start(self) -> int:
+        return self.page * self.page_rows
+
+    def load(self, page: Optional[int] = None) -> Rows:
+        """Rows of `page` (default: the current one); the last page is padded to min_rows."""
+        if page is not None:
+            self.page = max(0, page)
+        rows = self.pager.read(self.start, self.page_rows)
+        if not rows and self.page > 0:
+            # the file shrank under us: fall back to its last page
+            total = self.pager.count()
+            self.page = max(0, (total - 1) // self.page_rows) if total else 0
+            rows = self.pager.read(self.start, self.page_rows)
+        self.loaded = len(rows)
+        if len(rows) < self.page_rows and len(rows) < self.min_rows:
+            rows += [self.pad_row[:] for _ in range(self.min_rows - len(rows))]
+        return rows
+
+    def save(self, matrix: Rows) -> None:
+        """Write the grid page back over the file rows it was loaded from."""
+        self.pager.replace(self.start, self.loaded, matrix)
+        self.loaded = len(matrix)
+
+    def has_prev(self) -> bool:
+        return self.page > 0
+
+    def has_next(self) -> bool:
+        total = self.pager.count_known()
+        if total is None:
+            return self.loaded >= self.page_rows
+        return self.start + self.loaded < total
+
+    def label(self) -> str:
+        total = self.pager.count_known()
+        if not self.loaded:
+            return "No rows" if total in (None, 0) else f"Rows {self.start:,} of {total:,}"
+        first, last = self.start + 1, self.start + self.loaded
+        if total is None:
+            return f"Rows {first:,}–{last:,} of {max(last, self.pager.rows_seen()):,}+"
+        return f"Rows {first:,}–{last:,} of {total:,}"
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    tmpdir = Path(tempfile.mkdtemp())
+    hdr = ["Email", "Company", "Notes"]
+    path = tmpdir / "leads.csv"
+    n_rows = 300_000
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(hdr)
+        for i in range(n_rows):
+            w.writerow([f"user{i}@example.com", f"Company {i}", "line one\nline two" if i % 97 == 0 else ""])
+
+    t0 = time.perf_counter()
+    p = CsvPager(path, hdr)
+    first = GridPage(p, ncols=3).load()
+    print(f"first page: {len(first)} rows in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    t0 = time.perf_counter()
+    total = p.count()
+    print(f"count: {total} rows in {(time.perf_counter() - t0) * 1000:.1f} ms ({len(p._marks)} marks)")
+    t0 = time.perf_counter()
+    mid = p.read(250_000, PAGE_ROWS)
+    print(f"page at 250k: {(time.perf_counter() - t0) * 1000:.1f} ms")
+    assert mid[0][0] == "user250000@example.com" and total == n_rows
+
+    # splice checks against a plain list model
+    model = [[f"user{i}@example.com", f"Company {i}", "line one\nline two" if i % 97 == 0 else ""] for i in range(n_rows)]
+    rnd = random.Random(7)
+    t0 = time.perf_counter()
+    for _ in range(20):
+        s = rnd.randrange(0, len(model) + 1)
+        k = rnd.randrange(0, 50)
+        new = [[f"new{rnd.random()}", "Acme, \"Inc\"", rnd.choice(["", "a\nb"])] for _ in range(rnd.randrange(0, 50))]
+        p.replace(s, k, new)
+        model[s:s + k] = new
+        probe = rnd.randrange(0, len(model))
+        assert p.read(probe, 3) == model[probe:probe + 3]
+    print(f"20 splices: {(time.perf_counter() - t0) * 1000 / 20:.1f} ms each")
+    assert p.count() == len(model)
+    with path.open("r", encoding="utf-8", newline="") as f:
+        assert list(csv.reader(f))[1:] == model
+    print("ok")
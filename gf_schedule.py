@@ -0,0 +1,307 @@
+# gf_schedule.py
+# Due-date scheduler for the campaign follow-ups in campaigns.csv (stage 1 -> E2 -> E3 -> Dialer).
+# - Every enrolled ref gets a next-due timestamp from its DateSent (results) and the step
+#   delays of its campaign (gf_campaigns JSON); the (due, ref) pairs live in a min-heap
+# - A tick pops only the refs whose time has come: nothing due = one heap peek, no CSV reads
+# - The heap is persisted next to campaigns.csv (campaigns_schedule.json) together with the
+#   signature of campaigns.csv and of the campaign definitions it was built from; a change to
+#   either (enrollments, stage edits, delay edits) rebuilds it on the next tick
+# - Refs waiting for something outside the schedule (no DateSent yet, Outlook unavailable)
+#   are looked at again after RECHECK; a reply is noticed when the ref comes due
+# - Refs that are drafted, replied or finished get Campaign / Stage stamped on their results
+#   row before they leave campaigns.csv, so the campaign stats keep counting them
+#
+# In the app: gf_ui_logic peeks next_due() on the idle timer (when hourly_campaign_runner is
+# on) and queues run_due() on the Outlook worker thread once something is due.
+# Headless:   python gf_schedule.py [run|rebuild|show]
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gf_store import (
+    APP_DIR,
+    CAMPAIGNS_PATH,
+    HEADER_FIELDS,
+    _read_campaign_rows,
+    save_campaign_rows,
+    tag_results_campaign,
+    load_results_rows_sorted,
+)
+from gf_helpers import (
+    _parse_any_datetime,
+    _campaign_get_lead_row_for_ref,
+)
+
+SCHEDULE_PATH = CAMPAIGNS_PATH.with_name("campaigns_schedule.json")
+CAMPAIGNS_DIR = APP_DIR / "campaigns"          # per-campaign JSON (gf_campaigns)
+RECHECK = timedelta(hours=1)
+
+DraftFn = Callable[[str, str, str, str, int], bool]
+
+
+def _stat_sig(path) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+    except Exception:
+        return None
+
+
+def _sources_sig() -> list:
+    # campaign JSONs are written tmp + rename, which bumps the folder's mtime
+    return [_stat_sig(CAMPAIGNS_PATH), _stat_sig(CAMPAIGNS_DIR)]
+
+
+def _ref_key(ref) -> str:
+    return (ref or "").strip().lower()
+
+
+def _campaign_def(key: str, cache: Dict[str, Tuple[int, int, bool]]) -> Tuple[int, int, bool]:
+    """(delay E2 days, delay E3 days, divert default) per campaign key, loaded once per pass."""
+    if key not in cache:
+        try:
+            from gf_campaigns import load_campaign_by_key
+            steps, settings = load_campaign_by_key(key or "default")
+            d2 = max(0, int(str(steps[1].get("delay_days", 0)).strip() or "0"))
+            d3 = max(0, int(str(steps[2].get("delay_days", 0)).strip() or "0"))
+            cache[key] = (d2, d3, settings.get("send_to_dialer_after") in ("1", True))
+        except Exception:
+            cache[key] = (3, 7, True)
+    return cache[key]
+
+
+def _stage(row: Dict[str, str]) -> int:
+    try:
+        return int(row.get("Stage", "0") or 0)
+    except Exception:
+        return 0
+
+
+def _next_due(row: Dict[str, str], res: Optional[Dict[str, str]], delays: Tuple[int, int, bool],
+              now: float) -> float:
+    """Epoch seconds at which this ref needs attention next."""
+    stage = _stage(row)
+    if stage >= 3 or (res and (res.get("DateReplied") or "").strip()):
+        return now                                   # divert / drop right away
+    sent = _parse_any_datetime(res.get("DateSent", "")) if res else None
+    if sent is None:
+        return now + RECHECK.total_seconds()         # nothing sent yet: look again later
+    d2, d3, _divert = delays
+    days = d2 if stage <= 1 else d2 + d3
+    return (sent + timedelta(days=days)).timestamp()
+
+
+def _default_draft(ref, email, company, key, next_stage) -> bool:
+    from gf_campaigns import draft_next_stage_from_config
+    return draft_next_stage_from_config(ref, email, company, key, next_stage)
+
+
+class CampaignScheduler:
+    def __init__(self, path=SCHEDULE_PATH):
+        self.path = path
+        self._heap: List[Tuple[float, str]] = []      # (due epoch, ref lower)
+        self._sig: Optional[list] = None              # _sources_sig() the heap matches
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    # ---- persistence ----
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            heap = [(float(d), str(r)) for d, r in data.get("heap", [])]
+            heapq.heapify(heap)
+            self._heap, self._sig = heap, data.get("sig")
+        except Exception:
+            self._heap, self._sig = [], None
+
+    def _save(self) -> None:
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"sig": self._sig, "heap": self._heap}), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def _stale(self) -> bool:
+        if not self._loaded:
+            self._load()
+        return self._sig != _sources_sig()
+
+    # ---- build ----
+    def _rebuild(self, now: float) -> None:
+        """One pass over campaigns.csv + results: a due time for every enrolled ref."""
+        res_map = {_ref_key(r.get("Ref")): r for r in load_results_rows_sorted()}
+        defs: Dict[str, Tuple[int, int, bool]] = {}
+        heap = []
+        for row in _read_campaign_rows():
+            ref = _ref_key(row.get("Ref"))
+            if ref:
+                key = row.get("CampaignKey") or "default"
+                heap.append((_next_due(row, res_map.get(ref), _campaign_def(key, defs), now), ref))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._sig = _sources_sig()
+        self._save()
+
+    # ---- public ----
+    def next_due(self) -> Optional[float]:
+        """
+        Earliest due time (epoch), float("-inf") when the heap must be rebuilt, None when
+        nothing is scheduled or a run is in progress. O(1) apart from two stat() calls.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self._stale():
+                return float("-inf")
+            return self._heap[0][0] if self._heap else None
+        finally:
+            self._lock.release()
+
+    def rebuild(self) -> int:
+        with self._lock:
+            self._loaded = True
+            self._rebuild(time.time())
+            return len(self._heap)
+
+    def run_due(self, now: Optional[float] = None, draft: Optional[DraftFn] = None,
+                cancel: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        Handle every ref due at `now`: drop replied refs, draft E2/E3 when their delay has
+        passed, send finished sequences to the Dialer (if enabled) and reschedule the rest.
+        Returns counters: due, drafted, diverted, divert_failed, removed, scheduled.
+        Refs whose Dialer append fails stay enrolled and are retried after RECHECK.
+        """
+        now = time.time() if now is None else now
+        draft = draft or _default_draft
+        stats = {"due": 0, "drafted": 0, "diverted": 0, "divert_failed": 0, "removed": 0, "scheduled": 0}
+        with self._lock:
+            if self._stale():
+                self._rebuild(now)
+            heap = self._heap
+            if not heap or heap[0][0] > now:
+                stats["scheduled"] = len(heap)
+                return stats
+
+            due = []
+            while heap and heap[0][0] <= now:
+                due.append(heapq.heappop(heap)[1])
+            stats["due"] = len(due)
+
+            rows = _read_campaign_rows()
+            by_ref = {_ref_key(r.get("Ref")): r for r in rows}
+            res_map = {_ref_key(r.get("Ref")): r for r in load_results_rows_sorted()}
+            defs: Dict[str, Tuple[int, int, bool]] = {}
+            drop, divert, divert_refs, changed = set(), [], [], False
+            tags: Dict[str, Tuple[str, str]] = {}   # ref -> (campaign, stage) stamped on its results row
+
+            for i, ref in enumerate(due):
+                row = by_ref.get(ref)
+                if row is None:
+                    continue
+                if callable(cancel) and cancel():
+                    for rest in due[i:]:           # untouched refs stay due for the next run
+                        heapq.heappush(heap, (now, rest))
+                    break
+                key = row.get("CampaignKey") or "default"
+                delays = _campaign_def(key, defs)
+                res = res_map.get(ref)
+                if res and (res.get("DateReplied") or "").strip():
+                    drop.add(ref)
+                    tags[ref] = (key, str(_stage(row)))
+                    continue
+                stage = _stage(row)
+                sent = _parse_any_datetime(res.get("DateSent", "")) if res else None
+                if stage == 0 and sent is not None:
+                    row["Stage"] = "1"; stage = 1; changed = True
+                if stage >= 3:
+                    flag = str(row.get("DivertToDialer", "")).strip()
+                    if (flag in ("1", "true", "True")) if flag else delays[2]:
+                        lead = _campaign_get_lead_row_for_ref(row)
+                        divert.append([lead.get(h, "") for h in HEADER_FIELDS] + ["○", "○", "○"] + [""] * 8)
+                        divert_refs.append(ref)
+                    drop.add(ref)
+                    tags[ref] = (key, str(stage))
+                    continue
+                nxt = _next_due(row, res, delays, now)
+                if stage in (1, 2) and nxt <= now:
+                    try:
+                        ok = draft(row.get("Ref", ""), row.get("Email", ""), row.get("Company", ""), key, stage + 1)
+                    except Exception:
+                        ok = False
+                    if ok:
+                        row["Stage"] = str(stage + 1); changed = True
+                        tags[ref] = (key, row["Stage"])
+                        stats["drafted"] += 1
+                        nxt = _next_due(row, res, delays, now)
+                    else:
+                        nxt = now + RECHECK.total_seconds()
+                heapq.heappush(heap, (nxt, ref))
+
+            if divert:
+                # one append per run, through the pager the dialer grid saves with (its lock
+                # serializes us against a grid autosave; its row index stays right)
+                try:
+                    from gf_dialer import DIALER_PAGER
+                    DIALER_PAGER.append(divert)
+                except Exception:
+                    # keep the leads enrolled (not dropped from campaigns.csv) and retry later
+                    for ref in divert_refs:
+                        drop.discard(ref)
+                        tags.pop(ref, None)
+                        heapq.heappush(heap, (now + RECHECK.total_seconds(), ref))
+                    stats["divert_failed"] = len(divert)
+                    divert = []
+            if tags:
+                # results keep their campaign once the ref leaves campaigns.csv (CampaignStats)
+                try:
+                    tag_results_campaign(tags)
+                except Exception:
+                    pass
+            if drop or changed:
+                save_campaign_rows([r for r in rows if _ref_key(r.get("Ref")) not in drop])
+            if drop:
+                self._heap = heap = [e for e in heap if e[1] not in drop]
+                heapq.heapify(heap)
+            stats["diverted"] = len(divert)
+            stats["removed"] = len(drop)
+            stats["scheduled"] = len(heap)
+            self._sig = _sources_sig()             # our own write: the heap already reflects it
+            self._save()
+            return stats
+
+    def entries(self) -> List[Tuple[float, str]]:
+        with self._lock:
+            self._stale()
+            return sorted(self._heap)
+
+
+SCHEDULER = CampaignScheduler()
+
+
+def run_due(**kw) -> Dict[str, int]:
+    return SCHEDULER.run_due(**kw)
+
+
+if __name__ == "__main__":
+    import sys
+    from datetime import datetime
+
+    cmd = (sys.argv[1:] or ["run"])[0]
+    if cmd == "rebuild":
+        print(f"{SCHEDULER.rebuild()} ref(s) scheduled -> {SCHEDULE_PATH}")
+    elif cmd == "show":
+        for due_ts, ref in SCHEDULER.entries():
+            print(f"{datetime.fromtimestamp(due_ts):%Y-%m-%d %H:%M}  {ref}")
+    else:
+        t0 = time.perf_counter()
+        st = SCHEDULER.run_due()
+        print(f"{st}  ({(time.perf_counter() - t0) * 1000:.1f} ms)")
@@ -8,23 +8,33 @@
 # - Column resizing
 # - Arrow/Tab keyboard navigation with wrap & auto-scroll
 # - Column width persistence (load/apply/save on resize)
+# - Diff-based grid sync: apply row-level inserts/updates/deletes in place (keeps scroll + selection)
+# - Bulk paste: the pasted block is applied as one data update (rows grown once, one refresh);
+#   very large clipboards are parsed on a background thread with progress
 
 from __future__ import annotations
 
 import json
 import csv
 import io
+import queue
+import threading
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Optional, List, Dict, Tuple
+
+BULK_PASTE_MIN_CELLS = 200            # above this a paste is one data update, not per-cell calls
+BACKGROUND_PARSE_CHARS = 1_000_000    # clipboards larger than this are parsed off the Tk thread
 
 
 # =========================
 # Parsing helpers (TSV/CSV)
 # =========================
-def _parse_clipboard(clip: str) -> List[List[str]]:
+def _parse_clipboard(clip: str, progress: Optional[Callable[[int, int], None]] = None) -> List[List[str]]:
     """
     Robustly parse clipboard text as TSV when tabs dominate; else CSV.
     Uses csv.reader for BOTH to keep quotes together and preserve empty trailing cells.
+    progress(rows_done, approx_total_rows) is called every 5000 rows when given.
     """
     if not isinstance(clip, str):
         return []
@@ -38,7 +48,15 @@ def _parse_clipboard(clip: str) -> List[List[str]]:
             reader = csv.reader(io.StringIO(clip), delimiter="\t", quotechar='"')
         else:
             reader = csv.reader(io.StringIO(clip), delimiter=",", quotechar='"')
-        return [row for row in reader]
+        if progress is None:
+            return [row for row in reader]
+        total = clip.count("\n") + 1
+        rows = []
+        for row in reader:
+            rows.append(row)
+            if len(rows) % 5000 == 0:
+                progress(len(rows), total)
+        return rows
     except Exception:
         # Fallback: split by tabs or lines
         if "\t" in clip:
@@ -125,42 +143,76 @@ def _get_clip_rows_from_root(tk_root) -> List[List[str]]:
     return _parse_clipboard(clip)
 
 
-def _do_plain_paste_at(sheet_obj, tk_root, r0: int, c0: int, headers_only_cols: Optional[int] = None):
-    """
-    Paste at explicit (row, col). Used by right-click in some builds; safe anchor.
-    """
-    rows = _get_clip_rows_from_root(tk_root)
-    if not rows:
-        return "break"
-
-    if r0 is None or r0 < 0: r0 = 0
-    if c0 is None or c0 < 0: c0 = 0
-
-    # Grow rows if needed
+def _grow_rows(sheet_obj, need_rows: int) -> bool:
+    """Append blank rows (one call) so the sheet has at least `need_rows`; True if it grew."""
     try:
         total_rows = sheet_obj.get_total_rows()
     except Exception:
         total_rows = 0
-    need_rows = r0 + len(rows)
-    if need_rows > total_rows:
+    if need_rows <= total_rows:
+        return False
+    try:
+        sheet_obj.insert_rows(total_rows, number_of_rows=(need_rows - total_rows))
+    except Exception:
         try:
-            sheet_obj.insert_rows(total_rows, number_of_rows=(need_rows - total_rows))
+            sheet_obj.insert_rows(total_rows, amount=(need_rows - total_rows))
         except Exception:
-            try:
-                sheet_obj.insert_rows(total_rows, amount=(need_rows - total_rows))
-            except Exception:
-                pass
+            return False
+    return True
 
-    # Manual cell fill (reliable & respects headers_only_cols)
-    for r_off, row in enumerate(rows):
-        for c_off, val in enumerate(row):
-            dest_c = c0 + c_off
-            if headers_only_cols is not None and dest_c >= headers_only_cols:
-                continue
-            try:
-                sheet_obj.set_cell_data(r0 + r_off, dest_c, val)
-            except Exception:
-                pass
+
+def apply_paste_block(sheet_obj, r0: int, c0: int, rows: List[List[str]],
+                      headers_only_cols: Optional[int] = None) -> int:
+    """
+    Write pasted `rows` with their top-left cell at (r0, c0). Cells past a short row keep
+    their value; columns past headers_only_cols (or past the sheet's last column) are dropped.
+    Small pastes go cell by cell without redraws; larger ones are spliced into the data and
+    applied with one set_sheet_data. Either way rows grow once and the sheet refreshes once.
+    Returns the number of rows written.
+    """
+    if not rows:
+        return 0
+    r0 = max(0, r0 or 0)
+    c0 = max(0, c0 or 0)
+    try:
+        ncols = sheet_obj.get_total_columns()
+    except Exception:
+        ncols = None
+    limit = headers_only_cols if headers_only_cols is not None else ncols
+    if limit is not None:
+        rows = [row[:max(0, limit - c0)] for row in rows]
+
+    if sum(len(row) for row in rows) <= BULK_PASTE_MIN_CELLS:
+        _grow_rows(sheet_obj, r0 + len(rows))
+        for r_off, row in enumerate(rows):
+            for c_off, val in enumerate(row):
+                try:
+                    sheet_obj.set_cell_data(r0 + r_off, c0 + c_off, val, redraw=False)
+                except TypeError:
+                    sheet_obj.set_cell_data(r0 + r_off, c0 + c_off, val)
+                except Exception:
+                    pass
+    else:
+        try:
+            data = sheet_obj.get_sheet_data() or []
+        except Exception:
+            data = []
+        width = ncols or max((len(r) for r in data[:1]), default=0)
+        grew = r0 + len(rows) > len(data)
+        while len(data) < r0 + len(rows):
+            data.append([""] * width)
+        for r_off, row in enumerate(rows):
+            tgt = data[r0 + r_off]
+            if not isinstance(tgt, list):
+                tgt = data[r0 + r_off] = list(tgt)
+            end = c0 + len(row)
+            if len(tgt) < end:
+                tgt.extend([""] * (end - len(tgt)))
+            tgt[c0:end] = row
+        try:
+            sheet_obj.set_sheet_data(data, reset_col_positions=False, reset_row_positions=grew, redraw=False)
+        except TypeError:
+            sheet_obj.set_sheet_data(data)
 
     # Keep focus/selection on anchor
     try:
@@ -169,36 +221,112 @@ def _do_plain_paste_at(sheet_obj, tk_root, r0: int, c0: int, headers_only_cols:
         else:
             sheet_obj.set_currently_selected(r0, c0)
         sheet_obj.see(r0, c0)
+    except Exception:
+        pass
+    try:
         sheet_obj.refresh()
     except Exception:
         pass
+    return len(rows)
+
+
+def parse_in_background(tk_root, parse: Callable, text: str, on_done: Callable[[List[List[str]]], None],
+                        on_progress: Optional[Callable[[int, int], None]] = None, poll_ms: int = 100) -> None:
+    """
+    Run parse(text, progress) on a worker thread. on_progress(done, total) and on_done(rows)
+    are called on the Tk thread (polled with tk_root.after).
+    """
+    results: "queue.Queue[tuple]" = queue.Queue()
+
+    def _work():
+        try:
+            rows = parse(text, lambda done, total: results.put(("progress", (done, total))))
+        except Exception:
+            rows = []
+        results.put(("done", rows))
+
+    def _poll():
+        latest = None
+        while True:
+            try:
+                kind, payload = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "done":
+                on_done(payload)
+                return
+            latest = payload
+        if latest is not None and callable(on_progress):
+            try:
+                on_progress(*latest)
+            except Exception:
+                pass
+        tk_root.after(poll_ms, _poll)
+
+    threading.Thread(target=_work, name="gf-paste-parse", daemon=True).start()
+    tk_root.after(poll_ms, _poll)
+
+
+def _do_plain_paste_at(sheet_obj, tk_root, r0: int, c0: int, headers_only_cols: Optional[int] = None,
+                       on_pasted=None, status=None):
+    """
+    Paste at explicit (row, col). Used by right-click in some builds; safe anchor.
+    on_pasted() runs once the block is in the sheet (later, for background-parsed clipboards);
+    status(text) receives parse progress for those.
+    """
+    try:
+        clip = tk_root.clipboard_get()
+    except Exception:
+        clip = ""
+    if not clip:
+        return "break"
+
+    def _apply(rows):
+        if apply_paste_block(sheet_obj, r0, c0, rows, headers_only_cols) and callable(on_pasted):
+            on_pasted()
+        if callable(status) and len(clip) > BACKGROUND_PARSE_CHARS:
+            status(f"Pasted {len(rows)} rows")
+
+    if len(clip) > BACKGROUND_PARSE_CHARS:
+        if callable(status):
+            status("Parsing paste…")
+        parse_in_background(tk_root, _parse_clipboard, clip, _apply,
+                            on_progress=(lambda d, t: status(f"Parsing paste… {min(99, d * 100 // max(1, t))}%"))
+                            if callable(status) else None)
+    else:
+        _apply(_parse_clipboard(clip))
     return "break"
 
 
-def _do_plain_paste(sheet_obj, tk_root, headers_only_cols: Optional[int] = None):
+def _do_plain_paste(sheet_obj, tk_root, headers_only_cols: Optional[int] = None, on_pasted=None, status=None):
     """
     Ctrl+V behavior: paste at the current selection anchor (plain-text TSV/CSV).
     """
     r0, c0 = _selected_anchor(sheet_obj)
-    return _do_plain_paste_at(sheet_obj, tk_root, r0, c0, headers_only_cols=headers_only_cols)
+    return _do_plain_paste_at(sheet_obj, tk_root, r0, c0, headers_only_cols=headers_only_cols,
+                              on_pasted=on_pasted, status=status)
 
 
 # =========================
 # Bindings
 # =========================
-def bind_plaintext_paste(sheet_obj, tk_root, headers_only_cols: Optional[int] = None, *, save_callback=None):
+def bind_plaintext_paste(sheet_obj, tk_root, headers_only_cols: Optional[int] = None, *, save_callback=None,
+                         status_callback=None):
     """
     Bind BOTH Ctrl+V and Ctrl+Shift+V to the plaintext paste routine across all subwidgets.
     Also auto-saves (if save_callback is provided) after a successful paste.
     """
-    def _paste_plain_evt(_evt=None):
-        res = _do_plain_paste(sheet_obj, tk_root, headers_only_cols=headers_only_cols)
+    def _saved():
         try:
             if callable(save_callback):
                 save_callback()
         except Exception:
             pass
-        return res  # must return "break" to stop default paste
+
+    def _paste_plain_evt(_evt=None):
+        # must return "break" to stop default paste
+        return _do_plain_paste(sheet_obj, tk_root, headers_only_cols=headers_only_cols,
+                               on_pasted=_saved, status=status_callback)
 
     for w in filter(None, (sheet_obj, getattr(sheet_obj, "MT", None),
                            getattr(sheet_obj, "RI", None), getattr(sheet_obj, "CH", None),
@@ -596,3 +724,215 @@ def wire_sheet_defaults(
             attach_column_width_persistence(sheet_obj, pref_path, persist_key, ncols=ncols)
         except Exception:
             pass
+
+
+# =========================
+# Diff-based grid sync
+# =========================
+SYNC_FULL_RELOAD_RATIO = 0.5   # past this share of changed rows one set_sheet_data is cheaper
+
+
+def _norm_row(row, ncols: int) -> Tuple[str, ...]:
+    vals = ["" if v is None else str(v) for v in (list(row) if row is not None else [])]
+    return tuple((vals + [""] * ncols)[:ncols])
+
+
+def diff_rows(old: List[Tuple[str, ...]], new: List[Tuple[str, ...]]) -> List[tuple]:
+    """
+    Row ops turning `old` into `new`, ordered bottom-up so indexes stay valid while applying:
+      ("update", i, row) / ("insert", i, rows) / ("delete", i, count)
+    Common prefix/suffix are skipped with plain comparisons; only the middle is matched.
+    """
+    lo, n_old, n_new = 0, len(old), len(new)
+    while lo < n_old and lo < n_new and old[lo] == new[lo]:
+        lo += 1
+    hi_o, hi_n = n_old, n_new
+    while hi_o > lo and hi_n > lo and old[hi_o - 1] == new[hi_n - 1]:
+        hi_o -= 1
+        hi_n -= 1
+    a, b = old[lo:hi_o], new[lo:hi_n]
+    if not a and not b:
+        return []
+    if len(a) == len(b) == 1:
+        codes = [("replace", 0, 1, 0, 1)]
+    else:
+        codes = SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+    ops: List[tuple] = []
+    for tag, i1, i2, j1, j2 in reversed(codes):
+        if tag == "equal":
+            continue
+        k = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        if i2 - i1 > k:
+            ops.append(("delete", lo + i1 + k, i2 - i1 - k))
+        if j2 - j1 > k:
+            ops.append(("insert", lo + i1 + k, list(b[j1 + k:j2])))
+        for off in range(k - 1, -1, -1):
+            if a[i1 + off] != b[j1 + off]:
+                ops.append(("update", lo + i1 + off, b[j1 + off]))
+    return ops
+
+
+def _sheet_view(sheet_obj):
+    view = {}
+    try:
+        view["xv"], view["yv"] = sheet_obj.MT.xview(), sheet_obj.MT.yview()
+    except Exception:
+        pass
+    try:
+        view["sel"] = sheet_obj.get_currently_selected()
+    except Exception:
+        pass
+    return view
+
+
+def _restore_sheet_view(sheet_obj, view) -> None:
+    try:
+        if view.get("xv"):
+            sheet_obj.MT.xview_moveto(view["xv"][0])
+        if view.get("yv"):
+            sheet_obj.MT.yview_moveto(view["yv"][0])
+    except Exception:
+        pass
+    sel = view.get("sel")
+    try:
+        r, c = sel[0], sel[1]
+        if isinstance(r, int) and isinstance(c, int):
+            sheet_obj.set_currently_selected(r, c)
+    except Exception:
+        pass
+
+
+def insert_sheet_rows(sheet_obj, idx: int, rows: List[Tuple[str, ...]]) -> None:
+    """Insert `rows` before row `idx` (tksheet 6/7 keyword API, older positional API as fallback)."""
+    try:
+        sheet_obj.insert_rows(rows=[list(r) for r in rows], idx=idx)
+        return
+    except Exception:
+        pass
+    try:
+        sheet_obj.insert_rows(idx, number_of_rows=len(rows))
+    except Exception:
+        sheet_obj.insert_rows(idx, amount=len(rows))
+    for off, row in enumerate(rows):
+        for c, v in enumerate(row):
+            if v:
+                sheet_obj.set_cell_data(idx + off, c, v)
+
+
+def _sheet_delete_rows(sheet_obj, idx: int, count: int) -> None:
+    try:
+        sheet_obj.delete_rows(range(idx, idx + count))
+        return
+    except Exception:
+        pass
+    for r in range(idx + count - 1, idx - 1, -1):
+        sheet_obj.delete_row(r)
+
+
+def sync_sheet_rows(sheet_obj, rows: List[List[str]], ncols: int, min_rows: int = 0) -> Dict[str, int]:
+    """
+    Make the sheet show `rows` (e.g. freshly loaded from CSV) by applying only the row-level
+    differences in place. Trailing blank rows are padding: the grid keeps its length (at least
+    `min_rows`) and deleted content turns into blank rows at the bottom. Scroll position and selection are preserved. Returns op counts.
+    """
+    stats = {"updated": 0, "inserted": 0, "deleted": 0, "full": 0}
+    try:
+        current = sheet_obj.get_sheet_data() or []
+    except Exception:
+        current = []
+    old = [_norm_row(r, ncols) for r in current]
+    new = [_norm_row(r, ncols) for r in rows]
+    blank = ("",) * ncols
+    # Diff real content only; blank padding rows are reconciled at the end
+    n_old = len(old)
+    while n_old and old[n_old - 1] == blank:
+        n_old -= 1
+    n_new = len(new)
+    while n_new and new[n_new - 1] == blank:
+        n_new -= 1
+    target = max(min_rows, len(old), n_new)
+
+    ops = diff_rows(old[:n_old], new[:n_new])
+    length = len(old) - n_old + n_new          # row count once the ops are applied
+    if not ops and length == target:
+        return stats
+    view = _sheet_view(sheet_obj)
+    changed = sum(len(op[2]) if op[0] == "insert" else (op[2] if op[0] == "delete" else 1) for op in ops)
+    if changed > max(50, SYNC_FULL_RELOAD_RATIO * target):
+        sheet_obj.set_sheet_data([list(r) for r in new[:n_new]] + [list(blank)] * (target - n_new))
+        stats["full"] = 1
+    else:
+        for op in ops:
+            kind, i = op[0], op[1]
+            if kind == "update":
+                prev = old[i]
+                for c, v in enumerate(op[2]):
+                    if prev[c] != v:
+                        sheet_obj.set_cell_data(i, c, v)
+                stats["updated"] += 1
+            elif kind == "insert":
+                insert_sheet_rows(sheet_obj, i, op[2])
+                stats["inserted"] += len(op[2])
+            else:
+                _sheet_delete_rows(sheet_obj, i, op[2])
+                stats["deleted"] += op[2]
+        if length < target:
+            insert_sheet_rows(sheet_obj, length, [blank] * (target - length))
+        elif length > target:
+            _sheet_delete_rows(sheet_obj, target, length - target)
+    try:
+        sheet_obj.refresh()
+    except Exception:
+        pass
+    _restore_sheet_view(sheet_obj, view)
+    return stats
+
+
+def append_sheet_row(sheet_obj, row: List[str], ncols: int) -> int:
+    """
+    Put `row` after the last non-blank row: reuse a blank padding row if there is one,
+    otherwise insert a new row. Returns the row index used.
+    """
+    try:
+        data = sheet_obj.get_sheet_data() or []
+    except Exception:
+        data = []
+    last = len(data) - 1
+    while last >= 0 and not any(str(v or "").strip() for v in data[last]):
+        last -= 1
+    idx = last + 1
+    vals = _norm_row(row, ncols)
+    if idx < len(data):
+        for c, v in enumerate(vals):
+            sheet_obj.set_cell_data(idx, c, v)
+    else:
+        insert_sheet_rows(sheet_obj, idx, [vals])
+    try:
+        sheet_obj.refresh()
+    except Exception:
+        pass
+    return idx
+
+
+def show_sheet_rows(sheet_obj, rows: List[List[str]]) -> None:
+    """
+    Swap the sheet's whole content for `rows` (paged grids: another page) with one
+    set_sheet_data; column widths stay, the view goes back to the top-left cell.
+    """
+    try:
+        sheet_obj.set_sheet_data([list(r) for r in rows], reset_col_positions=False, reset_row_positions=True, redraw=False)
+    except TypeError:
+        sheet_obj.set_sheet_data([list(r) for r in rows])
+    try:
+        sheet_obj.deselect("all")
+    except Exception:
+        pass
+    try:
+        sheet_obj.MT.xview_moveto(0)
+        sheet_obj.MT.yview_moveto(0)
+    except Exception:
+        pass
+    try:
+        sheet_obj.refresh()
+    except Exception:
+        pass
@@ -10,15 +10,27 @@
 
 from __future__ import annotations
 
+import atexit
 import csv
+import json
 import os
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, date
 import configparser
-from typing import List, Dict, Iterable, Tuple, Optional
+from typing import Callable, List, Dict, Iterable, Tuple, Optional
 import re
 import sys  # used to locate sidecar app.ini
 
+from gf_dates import parse_column, parse_date
+from gf_backup import BackupStore
+from gf_fpindex import FingerprintIndex
+from gf_pager import CsvPager
+from gf_leadindex import LeadIndex
+from gf_template import compile_template
+from gf_watch import note_own_write
+
 # ----------------------------
 # App directory & file paths
 # ----------------------------
@@ -27,6 +39,11 @@ import sys  # used to locate sidecar app.ini
 #   data_dir=GrowthFarm Test Account
 #
 # If app.ini is missing, default to "GrowthFarm".
+#
+# Optional storage backend (same [app] section):
+#   storage=sqlite      -> results/campaigns/customers/orders live in growthfarm.db (gf_db);
+#                          the CSVs are kept as export mirrors
+#   storage=csv         -> default, CSV files are the store
 
 def _sidecar_ini_path() -> Path:
     try:
@@ -34,18 +51,21 @@ def _sidecar_ini_path() -> Path:
     except Exception:
         return Path.cwd() / "app.ini"
 
-def _data_dir_name_from_ini(default_name: str = "GrowthFarm") -> str:
+def _app_ini_value(option: str, default: str) -> str:
     ini = _sidecar_ini_path()
     if ini.exists():
         cfg = configparser.ConfigParser()
         try:
             cfg.read(ini, encoding="utf-8")
-            name = (cfg.get("app", "data_dir", fallback=default_name) or "").strip()
-            if name:
-                return name
+            val = (cfg.get("app", option, fallback=default) or "").strip()
+            if val:
+                return val
         except Exception:
             pass
-    return default_name
+    return default
+
+def _data_dir_name_from_ini(default_name: str = "GrowthFarm") -> str:
+    return _app_ini_value("data_dir", default_name)
 
 APP_NAME: str = _data_dir_name_from_ini("GrowthFarm")
 # Store under Roaming on Windows; if APPDATA missing (non-Windows), fall back to Home.
@@ -75,7 +95,42 @@ CAMPAIGNS_INI      = APP_DIR / "campaigns.ini"
 # Per-ref campaign state (stage tracking)
 CAMPAIGNS_PATH     = APP_DIR / "campaigns.csv"        # columns: CAMPAIGNS_HEADERS below
 
-STATE_PATH         = APP_DIR / "state.txt"            # optional “seen” set for email drafts, etc.
+STATE_PATH         = APP_DIR / "state.txt"            # legacy “seen” set (migrated into SEEN on first use)
+
+# Storage backend ("csv" | "sqlite"), see app.ini notes above
+STORAGE_BACKEND: str = _app_ini_value("storage", "csv").lower()
+
+def sqlite_backend():
+    """The gf_db module when storage=sqlite, else None (CSV files are the store)."""
+    if STORAGE_BACKEND != "sqlite":
+        return None
+    import gf_db
+    return gf_db
+
+def flush_storage(idle: bool = False, busy: bool = False) -> None:
+    """
+    Fold pending results journals into their CSVs and write SQLite changes to the mirrors.
+    idle=True (UI timer): a journal is only folded once it has been quiet for
+    JOURNAL_QUIET_SECONDS with no Outlook job running (busy=False), or once it reaches
+    JOURNAL_COMPACT_BYTES; at exit / explicit saves everything is folded.
+    """
+    for j in _JOURNALS:
+        try:
+            if idle:
+                j.maybe_compact(busy)
+            else:
+                j.compact()
+        except Exception:
+            pass
+    try:
+        SEEN.maybe_compact()
+    except Exception:
+        pass
+    db = sqlite_backend()
+    if db is not None:
+        db.flush()
+
+atexit.register(flush_storage)
 
 # ----------------------------
 # Default headers / templates
@@ -134,6 +189,11 @@ DEFAULT_CAMPAIGN_SETTINGS = {
 # Per-ref CSV schema
 CAMPAIGNS_HEADERS = ["Ref","Email","Company","CampaignKey","Stage","DivertToDialer"]
 
+# results.csv / orders.csv schemas (log_email_sent may add the optional extras)
+RESULTS_FIELDS = ["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"]
+RESULTS_EXTRA_FIELDS = ["Campaign","Stage","To"]
+ORDER_FIELDS = ["Company","Order Date","Amount"]
+
 # ----------------------------
 # Small utilities
 # ----------------------------
@@ -147,6 +207,7 @@ def _atomic_write_csv(path: Path, headers: List[str], rows: Iterable[Iterable[st
         for row in rows:
             w.writerow(list(row)[:len(headers)])
     tmp.replace(path)
+    note_own_write(path)  # file watchers skip reloads for our own writes
 
 def _read_csv_matrix(path: Path, headers: List[str]) -> List[List[str]]:
     if not path.exists():
@@ -170,18 +231,25 @@ def _ensure_file_with_header(path: Path, headers: List[str]):
     if not path.exists():
         _atomic_write_csv(path, headers, [])
 
-# Backups
+# Backups: content-addressed + gzip'd, written off the UI thread, pruned by retention policy
+# (see gf_backup). Restore with BACKUPS.list_snapshots("customers.csv") / BACKUPS.restore(path).
 BACKUP_DIR = APP_DIR / "_backups"
+BACKUPS = BackupStore(BACKUP_DIR)
+
 def _backup(path: Path):
-    try:
-        if path.exists() and path.is_file():
-            BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            bak = BACKUP_DIR / f"{path.stem}.{stamp}{path.suffix}.bak"
-            with path.open("rb") as s, bak.open("wb") as d:
-                d.write(s.read())
-    except Exception:
-        pass
+    BACKUPS.snapshot(path)
+
+# Drafted-lead fingerprints: sorted binary index + append log + Bloom filter (see gf_fpindex).
+# Opened lazily; imports state.txt on first use. Compact with SEEN.compact().
+SEEN = FingerprintIndex(APP_DIR / "state", legacy=STATE_PATH)
+
+def list_backups(path: Path) -> List[Dict[str, object]]:
+    """Snapshots of `path`, newest first: {"file", "ts", "hash", "size"}."""
+    return BACKUPS.list_snapshots(path)
+
+def restore_backup(path: Path, digest: Optional[str] = None) -> bool:
+    """Restore `path` from a snapshot (default: newest). The current content is backed up first."""
+    return BACKUPS.restore(path, digest)
 
 # ----------------------------
 # Public: ensure & basic IO
@@ -219,14 +287,14 @@ def ensure_app_files():
     APP_DIR.mkdir(parents=True, exist_ok=True)
 
     _ensure_file_with_header(EMAIL_LEADS_PATH, HEADER_FIELDS)
-    _ensure_file_with_header(RESULTS_PATH, ["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"])
+    _ensure_file_with_header(RESULTS_PATH, RESULTS_FIELDS)
     _ensure_file_with_header(WARM_LEADS_PATH, WARM_V2_FIELDS)
 
     # Use canonical no_interest schema
     ensure_no_interest_file()
 
     _ensure_file_with_header(CUSTOMERS_PATH, CUSTOMER_FIELDS)
-    _ensure_file_with_header(ORDERS_PATH, ["Company","Order Date","Amount"])
+    _ensure_file_with_header(ORDERS_PATH, ORDER_FIELDS)
 
     # dialer files
     ensure_dialer_files()       # call log
@@ -247,9 +315,6 @@ def ensure_app_files():
     if not CAMPAIGNS_PATH.exists():
         _ensure_file_with_header(CAMPAIGNS_PATH, CAMPAIGNS_HEADERS)
 
-    if not STATE_PATH.exists():
-        STATE_PATH.write_text("", encoding="utf-8")
-
 # Back-compat alias (older modules import this name)
 ensure_app_dirs_and_files = ensure_app_files
 
@@ -262,48 +327,233 @@ def load_email_leads_matrix() -> List[List[str]]:
 def save_email_leads_matrix(matrix: List[List[str]]):
     _write_csv_matrix(EMAIL_LEADS_PATH, HEADER_FIELDS, matrix)
 
+# Paged access for the Leads grid (see gf_pager): pages are read on demand, saves splice
+# one page back into the file.
+LEADS_PAGER = CsvPager(EMAIL_LEADS_PATH, HEADER_FIELDS, on_write=note_own_write)
+
+# Lead row by email / company (see gf_leadindex): campaign queue, placeholders, dialer divert.
+LEAD_INDEX = LeadIndex(EMAIL_LEADS_PATH)
+
 # ----------------------------
 # Results (dict helpers)
 # ----------------------------
+_JOURNALS: List["ResultsJournal"] = []
+JOURNAL_QUIET_SECONDS = 30                 # idle fold: no journal writes for this long
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024    # ...or the journal has grown this large
+
+class ResultsJournal:
+    """
+    results.csv fronted by an append-only journal (<results>.journal, one JSON row per line).
+    - put() appends one line and updates an in-memory view keyed by Ref (lower-cased)
+    - rows()/get() serve reads from that view; the CSV is re-read only if someone else
+      changed it, and pending journal rows are replayed on top
+    - compact() folds the journal into the CSV; flush_storage() runs it at exit and, via
+      maybe_compact(), on idle once the journal is quiet (or large)
+    - One instance per results.csv (gf_store._RESULTS): a second instance would hold its
+      own view and could fold a stale copy over the other's rows
+    """
+    def __init__(self, csv_path: Path):
+        self.path = csv_path
+        self.journal_path = csv_path.with_suffix(".journal")
+        self._lock = threading.RLock()
+        self._sig: Optional[Tuple[float, int]] = None
+        self._jsig: Optional[Tuple[float, int]] = None     # journal as last replayed / written
+        self._header: List[str] = []
+        self._rows: Optional[List[Dict[str, str]]] = None
+        self._by_ref: Dict[str, Dict[str, str]] = {}
+        self._sorted = False
+        _JOURNALS.append(self)
+
+    def _apply(self, row: Dict[str, str]) -> None:
+        key = (row.get("Ref", "") or "").lower()
+        cur = self._by_ref.get(key)
+        if cur is not None:
+            cur.clear()
+            cur.update(row)
+        else:
+            row = dict(row)
+            self._rows.append(row)
+            if key:
+                self._by_ref[key] = row
+        self._sorted = False
+
+    def _load(self) -> None:
+        sig = _file_sig(self.path)
+        jsig = _file_sig(self.journal_path)
+        if self._rows is not None and sig == self._sig and jsig == self._jsig:
+            return
+        rows: List[Dict[str, str]] = []
+        header: List[str] = []
+        if sig is not None:
+            with self.path.open("r", encoding="utf-8", newline="") as f:
+                rdr = csv.DictReader(f)
+                rows = list(rdr)
+                header = list(rdr.fieldnames or [])
+        rows.sort(key=lambda r: (r.get("DateReplied",""), r.get("DateSent","")), reverse=True)
+        self._rows, self._header, self._sig, self._sorted = rows, header, sig, True
+        self._by_ref = {}
+        for r in rows:
+            self._by_ref.setdefault((r.get("Ref", "") or "").lower(), r)
+        self._by_ref.pop("", None)
+        # replay rows written since the last compaction (tolerates a torn last line)
+        if jsig is not None:
+            with self.journal_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except Exception:
+                        continue
+        self._jsig = jsig
+
+    def rows(self) -> List[Dict[str, str]]:
+        """Newest first (DateReplied, DateSent), as copies."""
+        with self._lock:
+            self._load()
+            if not self._sorted:
+                self._rows.sort(key=lambda r: (r.get("DateReplied",""), r.get("DateSent","")), reverse=True)
+                self._sorted = True
+            return [dict(r) for r in self._rows]
+
+    def get(self, ref_short: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            self._load()
+            r = self._by_ref.get((ref_short or "").lower())
+            return dict(r) if r is not None else None
+
+    def put(self, row: Dict[str, str]) -> None:
+        self.put_many([row])
+
+    def put_many(self, rows: List[Dict[str, str]]) -> None:
+        """Append several rows in one write (one journal commit for a drafting chunk)."""
+        if not rows:
+            return
+        with self._lock:
+            self._load()
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open("a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows))
+            for r in rows:
+                self._apply(r)
+            self._jsig = _file_sig(self.journal_path)
+
+    def _write(self, rows: List[Dict[str, str]]) -> None:
+        # extra columns survive if the file had them or a journal row filled them in
+        header = RESULTS_FIELDS + [x for x in RESULTS_EXTRA_FIELDS
+                                   if x in self._header or any(r.get(x) for r in rows)]
+        _atomic_write_csv(self.path, header, ([r.get(h, "") for h in header] for r in rows))
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._rows = None
+
+    def replace(self, rows: List[Dict[str, str]]) -> None:
+        """Rewrite the CSV wholesale (e.g. after an Outlook sync); drops the journal."""
+        with self._lock:
+            self._load()
+            self._write(rows)
+
+    def compact(self) -> bool:
+        """Fold pending journal rows into the CSV. Returns True if the CSV was rewritten."""
+        with self._lock:
+            if not self.journal_path.exists():
+                return False
+            self._write(self.rows())
+            return True
+
+    def maybe_compact(self, busy: bool = False) -> bool:
+        """Idle-time compact(): only when the journal is large, or quiet and nothing is drafting."""
+        with self._lock:
+            try:
+                st = self.journal_path.stat()
+            except OSError:
+                return False
+            if st.st_size >= JOURNAL_COMPACT_BYTES or (
+                    not busy and time.time() - st.st_mtime >= JOURNAL_QUIET_SECONDS):
+                return self.compact()
+            return False
+
+_RESULTS = ResultsJournal(RESULTS_PATH)
+
 def load_results_rows_sorted() -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
-    if RESULTS_PATH.exists():
-        with RESULTS_PATH.open("r", encoding="utf-8", newline="") as f:
-            rows = list(csv.DictReader(f))
-    def sk(r): return (r.get("DateReplied",""), r.get("DateSent",""))
-    rows.sort(key=sk, reverse=True)
-    return rows
+    db = sqlite_backend()
+    if db is not None:
+        return db.rows("results")
+    return _RESULTS.rows()
+
+def _merge_result(cur: Optional[Dict[str, str]], ref_short: str, email: str, company: str, industry: str,
+                  subject: str, sent_dt: str, replied_dt: str) -> Dict[str, str]:
+    cur = cur or {}
+    rec = dict(cur)
+    rec.update({
+        "Ref": ref_short,
+        "Email": email or cur.get("Email", ""),
+        "Company": company or cur.get("Company", ""),
+        "Industry": industry or cur.get("Industry", ""),
+        "DateSent": sent_dt or cur.get("DateSent", ""),
+        "DateReplied": replied_dt or cur.get("DateReplied", ""),
+        "Status": cur.get("Status", ""),
+        "Subject": subject or cur.get("Subject", ""),
+    })
+    return rec
 
 def upsert_result(ref_short: str, email: str, company: str, industry: str, subject: str,
                   sent_dt: str = "", replied_dt: str = ""):
-    rows = load_results_rows_sorted()
-    idx = next((i for i, x in enumerate(rows) if x.get("Ref") == ref_short), None)
-    rec = {
-        "Ref": ref_short, "Email": email or "", "Company": company or "", "Industry": industry or "",
-        "DateSent": sent_dt or (rows[idx]["DateSent"] if idx is not None else ""),
-        "DateReplied": replied_dt or (rows[idx]["DateReplied"] if idx is not None else ""),
-        "Status": rows[idx]["Status"] if idx is not None else "",
-        "Subject": subject or (rows[idx]["Subject"] if idx is not None else ""),
-    }
-    if idx is None: rows.append(rec)
-    else: rows[idx] = rec
-    _atomic_write_csv(
-        RESULTS_PATH,
-        ["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"],
-        ([r.get(h,"") for h in ["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"]] for r in rows)
-    )
+    db = sqlite_backend()
+    if db is not None:
+        db.update("results", ref_short, lambda cur: _merge_result(
+            cur, ref_short, email, company, industry, subject, sent_dt, replied_dt))
+        return
+    _RESULTS.put(_merge_result(_RESULTS.get(ref_short),
+                               ref_short, email, company, industry, subject, sent_dt, replied_dt))
+
+def update_results(fns: Dict[str, Callable[[Optional[Dict[str, str]]], Optional[Dict[str, str]]]]) -> None:
+    """
+    Read-modify-write several results rows ({ref: fn(current row or None) -> new row, or None
+    to leave it alone}) against the active store; CSV mode appends them as one journal write.
+    """
+    if not fns:
+        return
+    db = sqlite_backend()
+    if db is not None:
+        for ref, fn in fns.items():
+            db.update("results", ref, fn)
+        return
+    rows = []
+    for ref, fn in fns.items():
+        new = fn(_RESULTS.get(ref))
+        if new is not None:
+            rows.append(new)
+    _RESULTS.put_many(rows)
 
 def set_status(ref_short: str, status: str):
-    rows = load_results_rows_sorted()
-    for r in rows:
-        if r.get("Ref") == ref_short:
-            r["Status"] = status
-            break
-    _atomic_write_csv(
-        RESULTS_PATH,
-        ["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"],
-        ([r.get(h,"") for h in ["Ref","Email","Company","Industry","DateSent","DateReplied","Status","Subject"]] for r in rows)
-    )
+    db = sqlite_backend()
+    if db is not None:
+        db.update("results", ref_short, lambda cur: None if cur is None else {**cur, "Status": status})
+        return
+    cur = _RESULTS.get(ref_short)
+    if cur is not None:
+        _RESULTS.put({**cur, "Status": status})
+
+def tag_results_campaign(tags: Dict[str, Tuple[str, str]]) -> None:
+    """
+    Stamp Campaign / Stage on results rows ({ref: (campaign key, stage)}), so a ref keeps its
+    campaign attribution after the scheduler drops it from campaigns.csv. Unknown refs are skipped.
+    """
+    if not tags:
+        return
+    db = sqlite_backend()
+    if db is not None:
+        for ref, (camp, stage) in tags.items():
+            db.update("results", ref, lambda cur, c=camp, st=stage:
+                      None if cur is None else {**cur, "Campaign": c, "Stage": st})
+        return
+    rows = []
+    for ref, (camp, stage) in tags.items():
+        cur = _RESULTS.get(ref)
+        if cur is not None and (cur.get("Campaign"), cur.get("Stage")) != (camp, stage):
+            rows.append({**cur, "Campaign": camp, "Stage": stage})
+    _RESULTS.put_many(rows)
 
 # ----------------------------
 # Warm Leads (matrix IO) + migration
@@ -331,6 +581,7 @@ def ensure_warm_file():
             w.writeheader()
             for r in rows:
                 w.writerow({h: r.get(h, "") for h in WARM_V2_FIELDS})
+        note_own_write(WARM_LEADS_PATH)
 
 def load_warm_leads_matrix_v2() -> List[List[str]]:
     ensure_warm_file()
@@ -400,19 +651,7 @@ def save_dialer_leads_matrix(matrix: List[List[str]]):
 # Customers & Orders
 # ----------------------------
 def _parse_date(s: str) -> Optional[date]:
-    s = (s or "").strip()
-    if not s:
-        return None
-    fmts = ("%Y-%m-%d","%m/%d/%Y","%m-%d-%Y","%Y/%m/%d","%m/%d/%y","%m-%d-%y","%m/%d","%m-%d")
-    for fmt in fmts:
-        try:
-            d = datetime.strptime(s, fmt)
-            if fmt in ("%m/%d","%m-%d"):
-                d = d.replace(year=datetime.now().year)
-            return d.date()
-        except Exception:
-            continue
-    return None
+    return parse_date(s, yearless=True)
 
 def _money_to_float(val: str) -> float:
     s = (val or "").strip().replace(",", "").replace("$","")
@@ -429,27 +668,70 @@ def _float_to_money(x) -> str:
     except Exception:
         return ""
 
-def compute_customer_order_stats(company: str) -> Dict[str, object]:
+# Order aggregate index: one pass over orders.csv, keyed by normalized company.
+# Invalidated by (mtime, size); append_order_row folds new orders in place.
+_ORDER_INDEX: Dict[str, Dict[str, object]] = {}
+_ORDER_INDEX_SIG: Optional[Tuple[float, int]] = None
+
+def _company_key(company: str) -> str:
+    return (company or "").strip().lower()
+
+def _file_sig(path: Path) -> Optional[Tuple[float, int]]:
+    try:
+        st = path.stat()
+        return (st.st_mtime, st.st_size)
+    except Exception:
+        return None
+
+def _order_index_add(company: str, amount: float, d: Optional[date]) -> None:
+    agg = _ORDER_INDEX.get(company)
+    if agg is None:
+        agg = _ORDER_INDEX[company] = {"cltv": 0.0, "first": None, "last": None, "count": 0}
+    agg["count"] = int(agg["count"]) + 1
+    agg["cltv"] = float(agg["cltv"]) + amount
+    if d:
+        if agg["first"] is None or d < agg["first"]:
+            agg["first"] = d
+        if agg["last"] is None or d > agg["last"]:
+            agg["last"] = d
+
+def _order_index() -> Dict[str, Dict[str, object]]:
+    """Return the per-company order aggregates, rebuilding only if orders.csv changed."""
+    global _ORDER_INDEX_SIG
+    sig = _file_sig(ORDERS_PATH)
+    if sig is not None and sig == _ORDER_INDEX_SIG:
+        return _ORDER_INDEX
+    _ORDER_INDEX.clear()
+    if sig is not None:
+        with ORDERS_PATH.open("r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        # one format sniff for the whole Order Date column, not a parse cascade per cell
+        dts = parse_column([r.get("Order Date", "") for r in rows], yearless=True)
+        for r, dt in zip(rows, dts):
+            _order_index_add(
+                _company_key(r.get("Company", "")),
+                _money_to_float(r.get("Amount", "")),
+                dt.date() if dt else None,
+            )
+    _ORDER_INDEX_SIG = sig
+    return _ORDER_INDEX
+
+def _order_index_fresh() -> bool:
+    return _ORDER_INDEX_SIG is not None and _file_sig(ORDERS_PATH) == _ORDER_INDEX_SIG
+
+def compute_customer_order_stats(company: str, index: Optional[Dict[str, Dict[str, object]]] = None) -> Dict[str, object]:
     """
-    Aggregate order stats for a company.
+    Aggregate order stats for a company (pass `index` to reuse one snapshot across many rows).
     Returns: cltv (float), first_order_date (date|None), last_order_date (date|None),
              days_since_first (int|None), sales_per_day (float|None), order_count (int)
     """
-    total = 0.0
-    dates: List[date] = []
-    order_count = 0
-    if ORDERS_PATH.exists():
-        with ORDERS_PATH.open("r", encoding="utf-8", newline="") as f:
-            rdr = csv.DictReader(f)
-            for r in rdr:
-                if (r.get("Company","") or "").strip().lower() == (company or "").strip().lower():
-                    order_count += 1
-                    total += _money_to_float(r.get("Amount",""))
-                    d = _parse_date(r.get("Order Date",""))
-                    if d:
-                        dates.append(d)
-    first_d = min(dates) if dates else None
-    last_d  = max(dates) if dates else None
+    if index is None:
+        index = _order_index()
+    agg = index.get(_company_key(company)) or {}
+    total = float(agg.get("cltv", 0.0) or 0.0)
+    first_d = agg.get("first")
+    last_d  = agg.get("last")
+    order_count = int(agg.get("count", 0) or 0)
     days_since_first = (datetime.now().date() - first_d).days if first_d else None
     sales_per_day = (total / float(days_since_first)) if days_since_first and days_since_first > 0 else None
     return {
@@ -467,14 +749,14 @@ def ensure_customers_file():
         return
     # migrate header if needed
     with CUSTOMERS_PATH.open("r", encoding="utf-8", newline="") as f:
-        rdr = csv.DictReader(f)
-        old = rdr.fieldnames or []
-        rows = list(rdr) if old else []
+        old = next(csv.reader(f), None) or []
     if old and old != CUSTOMER_FIELDS:
+        with CUSTOMERS_PATH.open("r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
         _backup(CUSTOMERS_PATH)
         _atomic_write_csv(CUSTOMERS_PATH, CUSTOMER_FIELDS, ([r.get(h,"") for h in CUSTOMER_FIELDS] for r in rows))
 
-def _derive_customer_fields(row_dict: Dict[str,str]) -> Dict[str,str]:
+def _derive_customer_fields(row_dict: Dict[str,str], index: Optional[Dict[str, Dict[str, object]]] = None) -> Dict[str,str]:
     """
     Derive CLTV/Days/Sales/Day from orders.
     - Sales/Day is ONLY shown if order_count >= 2 (reorder).
@@ -482,7 +764,7 @@ def _derive_customer_fields(row_dict: Dict[str,str]) -> Dict[str,str]:
     - First/Last Order are backfilled from orders if present.
     """
     company = (row_dict.get("Company","") or "").strip()
-    stats = compute_customer_order_stats(company) if company else {
+    stats = compute_customer_order_stats(company, index) if company else {
         "cltv": 0.0, "first_order_date": None, "last_order_date": None,
         "days_since_first": None, "sales_per_day": None, "order_count": 0
     }
@@ -525,30 +807,122 @@ def _derive_customer_fields(row_dict: Dict[str,str]) -> Dict[str,str]:
 
 def load_customers_matrix() -> List[List[str]]:
     ensure_customers_file()
+    index = _order_index()
+    db = sqlite_backend()
+    if db is not None:
+        src: Iterable[Dict[str, str]] = db.rows("customers")
+    else:
+        with CUSTOMERS_PATH.open("r", encoding="utf-8", newline="") as f:
+            src = list(csv.DictReader(f))
     rows: List[List[str]] = []
-    with CUSTOMERS_PATH.open("r", encoding="utf-8", newline="") as f:
-        rdr = csv.DictReader(f)
-        for r in rdr:
-            try:
-                r.update(_derive_customer_fields(r))
-            except Exception:
-                pass
-            rows.append([r.get(h, "") for h in CUSTOMER_FIELDS])
+    for r in src:
+        try:
+            r.update(_derive_customer_fields(r, index))
+        except Exception:
+            pass
+        rows.append([r.get(h, "") for h in CUSTOMER_FIELDS])
     return rows
 
-def save_customers_matrix(matrix: List[List[str]]):
-    ensure_customers_file()
+def _derive_customer_rows(matrix: List[List[str]]) -> List[List[str]]:
+    """Grid rows with the derived columns (CLTV, Sales/Day, ...) recomputed."""
+    index = _order_index()
     out_rows = []
     for row in matrix:
         rd = {h: (row[i] if i < len(row) else "") for i, h in enumerate(CUSTOMER_FIELDS)}
         try:
-            rd.update(_derive_customer_fields(rd))
+            rd.update(_derive_customer_fields(rd, index))
         except Exception:
             pass
         out_rows.append([rd.get(h, "") for h in CUSTOMER_FIELDS])
+    return out_rows
+
+def save_customers_matrix(matrix: List[List[str]]):
+    ensure_customers_file()
+    out_rows = _derive_customer_rows(matrix)
+    db = sqlite_backend()
+    if db is not None:
+        db.replace_all("customers", (dict(zip(CUSTOMER_FIELDS, r)) for r in out_rows))
+        return
     _backup(CUSTOMERS_PATH)
     _atomic_write_csv(CUSTOMERS_PATH, CUSTOMER_FIELDS, out_rows)
 
+class _DbPager:
+    """gf_pager.CsvPager interface over a gf_db table (paged Customers grid, SQLite mode)."""
+
+    def __init__(self, name: str, headers: List[str], transform=None):
+        self.name = name
+        self.headers = list(headers)
+        self._transform = transform
+
+    def _db(self):
+        import gf_db
+        return gf_db
+
+    def file_header(self) -> List[str]:
+        return list(self.headers)
+
+    def count(self) -> int:
+        return self._db().count(self.name)
+
+    count_known = count
+    rows_seen = count
+
+    def scan_async(self, on_done=None) -> None:
+        if callable(on_done):
+            on_done(self.count())
+
+    def read(self, start: int, n: int) -> List[List[str]]:
+        rows = [[r.get(h, "") for h in self.headers] for r in self._db().page(self.name, start, n)]
+        return self._transform(rows) if self._transform else rows
+
+    def replace(self, start: int, old_n: int, rows) -> None:
+        n = len(self.headers)
+        rows = [(list(r) + [""] * n)[:n] for r in rows]
+        if self._transform:
+            rows = self._transform(rows)
+        self._db().replace_range(self.name, start, old_n, (dict(zip(self.headers, r)) for r in rows))
+
+    def append(self, rows) -> None:
+        self.replace(self.count(), 0, rows)
+
+    def invalidate(self) -> None:
+        pass
+
+_CUSTOMERS_PAGER = CsvPager(CUSTOMERS_PATH, CUSTOMER_FIELDS, transform=_derive_customer_rows,
+                            before_write=_backup, on_write=note_own_write)
+_CUSTOMERS_DB_PAGER = _DbPager("customers", CUSTOMER_FIELDS, transform=_derive_customer_rows)
+
+def customers_pager():
+    """Paged access for the Customers grid: the CSV, or the customers table in SQLite mode."""
+    ensure_customers_file()
+    return _CUSTOMERS_DB_PAGER if sqlite_backend() is not None else _CUSTOMERS_PAGER
+
+def save_customer_rows(rows: Dict[int, List[str]]) -> bool:
+    """
+    Persist only the given (edited) grid rows, {table position: row} -- the position is the
+    row's identity (as for a page save), so editing Company renames that row and never
+    overwrites another customer's. Needs the SQLite backend; returns False when the caller
+    must save the whole matrix instead (CSV backend, blank Company, row not in the table).
+    """
+    db = sqlite_backend()
+    if db is None:
+        return False
+    total = db.count("customers")
+    index = _order_index()
+    prepared = []
+    for pos, row in sorted(rows.items()):
+        rd = {h: (row[i] if i < len(row) else "") for i, h in enumerate(CUSTOMER_FIELDS)}
+        if not _company_key(rd.get("Company", "")) or not 0 <= pos < total:
+            return False
+        try:
+            rd.update(_derive_customer_fields(rd, index))
+        except Exception:
+            pass
+        prepared.append((pos, rd))
+    for pos, rd in prepared:
+        db.replace_range("customers", pos, 1, [rd])
+    return True
+
 def append_order_row(company: str, order_date: str, amount: str):
     """Append an order, then recompute CLTV/Days/Sales/Day on the customer row."""
     company = (company or "").strip()
@@ -557,9 +931,20 @@ def append_order_row(company: str, order_date: str, amount: str):
     # Normalize inputs
     d = _parse_date(order_date) or datetime.now().date()
     amt = _money_to_float(amount)
-    # Write order
-    with ORDERS_PATH.open("a", encoding="utf-8", newline="") as f:
-        csv.writer(f).writerow([company, d.strftime("%Y-%m-%d"), _float_to_money(amt)])
+    # Write order (fold into the aggregate index instead of re-reading orders.csv)
+    global _ORDER_INDEX_SIG
+    index_fresh = _order_index_fresh()
+    order = [company, d.strftime("%Y-%m-%d"), _float_to_money(amt)]
+    db = sqlite_backend()
+    if db is not None:
+        db.append("orders", dict(zip(ORDER_FIELDS, order)))
+    else:
+        with ORDERS_PATH.open("a", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerow(order)
+        note_own_write(ORDERS_PATH)
+    if index_fresh:
+        _order_index_add(_company_key(company), amt, d)
+        _ORDER_INDEX_SIG = _file_sig(ORDERS_PATH)
     # Recompute + update customer row
     stats = compute_customer_order_stats(company)
     updates = {}
@@ -576,44 +961,47 @@ def append_order_row(company: str, order_date: str, amount: str):
         updates["Sales/Day"] = ""
     update_customer_row_fields_by_company(company, updates)
 
+def _apply_customer_updates(row: Optional[Dict[str,str]], company: str, updates: Dict[str,str],
+                            index: Dict[str, Dict[str, object]]) -> Dict[str,str]:
+    if row is None:
+        row = {h:"" for h in CUSTOMER_FIELDS}
+        row["Company"] = company or ""
+    for k,v in updates.items():
+        if k in CUSTOMER_FIELDS:
+            row[k] = v
+    try:
+        row.update(_derive_customer_fields(row, index))
+    except Exception:
+        pass
+    return row
+
 def update_customer_row_fields_by_company(company: str, updates: Dict[str,str]):
     ensure_customers_file()
+    index = _order_index()
+    db = sqlite_backend()
+    if db is not None:
+        db.update("customers", company, lambda cur: _apply_customer_updates(cur, company, updates, index))
+        return
     try:
         with CUSTOMERS_PATH.open("r", encoding="utf-8", newline="") as f:
             rdr = csv.DictReader(f)
             rows = list(rdr); flds = rdr.fieldnames or CUSTOMER_FIELDS
     except Exception:
         rows, flds = [], CUSTOMER_FIELDS
-    comp_l = (company or "").strip().lower()
-    found = False
-    for r in rows:
-        if (r.get("Company","") or "").strip().lower() == comp_l:
-            for k,v in updates.items():
-                if k in CUSTOMER_FIELDS:
-                    r[k] = v
-            try:
-                r.update(_derive_customer_fields(r))
-            except Exception:
-                pass
-            found = True
+    comp_l = _company_key(company)
+    for i, r in enumerate(rows):
+        if _company_key(r.get("Company","")) == comp_l:
+            rows[i] = _apply_customer_updates(r, company, updates, index)
             break
-    if not found:
-        new_row = {h:"" for h in CUSTOMER_FIELDS}
-        new_row["Company"] = company or ""
-        for k,v in updates.items():
-            if k in CUSTOMER_FIELDS:
-                new_row[k] = v
-        try:
-            new_row.update(_derive_customer_fields(new_row))
-        except Exception:
-            pass
-        rows.append(new_row)
+    else:
+        rows.append(_apply_customer_updates(None, company, updates, index))
     _backup(CUSTOMERS_PATH)
     with CUSTOMERS_PATH.open("w", encoding="utf-8", newline="") as f:
         w = csv.DictWriter(f, fieldnames=CUSTOMER_FIELDS)
         w.writeheader()
         for r in rows:
             w.writerow({h: r.get(h,"") for h in CUSTOMER_FIELDS})
+    note_own_write(CUSTOMERS_PATH)
 
 # ----------------------------
 # Templates / Campaigns (INI)
@@ -810,6 +1198,9 @@ def ensure_campaigns_file():
         _atomic_write_csv(CAMPAIGNS_PATH, CAMPAIGNS_HEADERS, [])
 
 def _read_campaign_rows():
+    db = sqlite_backend()
+    if db is not None:
+        return db.rows("campaigns")
     ensure_campaigns_file()
     with CAMPAIGNS_PATH.open("r", encoding="utf-8", newline="") as f:
         rdr = csv.DictReader(f)
@@ -822,35 +1213,62 @@ def _campaigns_write_rows(rows: List[Dict[str,str]]):
         w.writeheader()
         for r in rows:
             w.writerow({h: r.get(h,"") for h in CAMPAIGNS_HEADERS})
+    note_own_write(CAMPAIGNS_PATH)
+
+def save_campaign_rows(rows: List[Dict[str,str]]):
+    """Replace every per-ref campaign row at once (campaign scheduler: one write per run)."""
+    db = sqlite_backend()
+    if db is not None:
+        db.replace_all("campaigns", [{h: r.get(h,"") for h in CAMPAIGNS_HEADERS} for r in rows])
+        return
+    _campaigns_write_rows(rows)
+
+def _merge_campaign_row(r: Optional[Dict[str,str]], ref_short, email, company, campaign_key,
+                        stage, divert_to_dialer) -> Dict[str,str]:
+    divert = "1" if int(divert_to_dialer or 0) else "0"
+    if r is None:
+        return {
+            "Ref": ref_short, "Email": email or "", "Company": company or "",
+            "CampaignKey": campaign_key or "default", "Stage": str(stage),
+            "DivertToDialer": divert
+        }
+    r["Email"] = email or r.get("Email","")
+    r["Company"] = company or r.get("Company","")
+    r["CampaignKey"] = campaign_key or r.get("CampaignKey","default")
+    r["Stage"] = str(stage)
+    r["DivertToDialer"] = divert
+    return r
 
 def upsert_campaign_row(ref_short, email, company, campaign_key, stage=0, divert_to_dialer=0):
+    db = sqlite_backend()
+    if db is not None:
+        db.update("campaigns", ref_short, lambda cur: _merge_campaign_row(
+            cur, ref_short, email, company, campaign_key, stage, divert_to_dialer))
+        return
     rows = _read_campaign_rows()
     ref_l = (ref_short or "").lower()
-    found = False
     for r in rows:
         if (r.get("Ref","") or "").lower() == ref_l:
-            r["Email"] = email or r.get("Email","")
-            r["Company"] = company or r.get("Company","")
-            r["CampaignKey"] = campaign_key or r.get("CampaignKey","default")
-            r["Stage"] = str(stage)
-            r["DivertToDialer"] = "1" if int(divert_to_dialer or 0) else "0"
-            found = True
+            _merge_campaign_row(r, ref_short, email, company, campaign_key, stage, divert_to_dialer)
             break
-    if not found:
-        rows.append({
-            "Ref": ref_short, "Email": email or "", "Company": company or "",
-            "CampaignKey": campaign_key or "default", "Stage": str(stage),
-            "DivertToDialer": "1" if int(divert_to_dialer or 0) else "0"
-        })
+    else:
+        rows.append(_merge_campaign_row(None, ref_short, email, company, campaign_key, stage, divert_to_dialer))
     _campaigns_write_rows(rows)
 
 def remove_campaign_by_ref(ref_short):
+    db = sqlite_backend()
+    if db is not None:
+        db.delete("campaigns", ref_short)
+        return
     rows = _read_campaign_rows()
     ref_l = (ref_short or "").lower()
     rows = [r for r in rows if (r.get("Ref","") or "").lower() != ref_l]
     _campaigns_write_rows(rows)
 
 def get_campaign_row(ref_short):
+    db = sqlite_backend()
+    if db is not None:
+        return db.find("campaigns", ref_short)
     ref_l = (ref_short or "").lower()
     for r in _read_campaign_rows():
         if (r.get("Ref","") or "").lower() == ref_l:
@@ -858,6 +1276,10 @@ def get_campaign_row(ref_short):
     return None
 
 def set_campaign_stage(ref_short, new_stage):
+    db = sqlite_backend()
+    if db is not None:
+        db.update("campaigns", ref_short, lambda cur: None if cur is None else {**cur, "Stage": str(new_stage)})
+        return
     rows = _read_campaign_rows()
     ref_l = (ref_short or "").lower()
     for r in rows:
@@ -882,20 +1304,10 @@ def normalize_header_map(row_dict: Dict[str,str]):
     return norm
 
 def apply_placeholders(text: str, row_dict: Dict[str,str], profile=None) -> str:
+    # compiled once per template text (gf_template), fields resolved against HEADER_FIELDS
     if not text:
         return ""
-    values = normalize_header_map(row_dict)
-    def repl(m):
-        token = m.group(1).strip()
-        cands = [token, token.lower(), token.replace(" ","_").lower()]
-        token_norm = token.replace("_"," ").strip().lower()
-        for c in cands:
-            if c in values and values[c] != "":
-                return values[c]
-        if token_norm in ("first name","firstname","first"):
-            return "there"
-        return "{"+token+"}"
-    return PLACEHOLDER_RE.sub(repl, text)
+    return compile_template(text, HEADER_FIELDS).render(row_dict or {})
 
 def dict_from_row(row: List[str]) -> Dict[str,str]:
     return {HEADER_FIELDS[i]: (row[i] if i < len(HEADER_FIELDS) else "") for i in range(len(HEADER_FIELDS))}
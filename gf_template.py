@@ -0,0 +1,254 @@
+# gf_template.py
+# Compiled email templates ({First Name}, {Company}, ... placeholders) for drafting at volume.
+# - compile_template(text, fields) parses a template (templates.ini / campaign JSON) once into
+#   literal and field segments; compiled forms are cached by template text
+# - Each placeholder is resolved to the row keys it may read when the template is compiled
+#   (for `fields`, normally HEADER_FIELDS) -- other row layouts are resolved once per layout --
+#   so a render is a few dict lookups and one join
+# - render_both(row) returns the plain text and the HTML paragraphs (blocks_to_html) in one
+#   pass: the HTML literals are escaped and split into paragraphs at compile time. A value
+#   containing a line break (or an empty value between two line breaks) changes the paragraph
+#   layout; those renders fall back to blocks_to_html on the text
+#
+# Same output as the old apply_placeholders: keys match as written, lower-cased, or
+# lower-cased with spaces as underscores; the first non-empty match wins; an unmatched
+# {First Name} becomes "there", any other unmatched placeholder is left as {Token}.
+#
+# Pure stdlib, no app imports: gf_store / gf_helpers pass HEADER_FIELDS.
+# Bench: python gf_template.py   (100k renders, checked against the regex implementation)
+
+from __future__ import annotations
+
+import html
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+PLACEHOLDER_RE = re.compile(r"\{([^}]+)\}")
+_FIRST_NAME_TOKENS = ("first name", "firstname", "first")
+_P_OPEN = '<p style="margin:0 0 12px 0;">'
+
+
+def blocks_to_html(text):
+    text = text.replace("\r\n","\n")
+    parts = [p for p in text.split("\n\n") if p.strip()!=""]
+    out = []
+    for p in parts:
+        esc = html.escape(p).replace("\n","<br>")
+        out.append(f'{_P_OPEN}{esc}</p>')
+    return "\n".join(out) if out else "<p></p>"
+
+
+def _variants(key: str) -> Tuple[str, str, str]:
+    k = key.strip()
+    return (k, k.lower(), k.replace(" ", "_").lower())
+
+
+class _Field:
+    __slots__ = ("token", "cands", "missing", "sensitive")
+
+    def __init__(self, token: str):
+        self.token = token
+        self.cands = _variants(token)
+        norm = token.replace("_", " ").strip().lower()
+        self.missing = "there" if norm in _FIRST_NAME_TOKENS else "{" + token + "}"
+        self.sensitive = False          # empty value would join two line breaks into "\n\n"
+
+
+class Template:
+    def __init__(self, text: str, fields: Sequence[str] = ()):
+        self.text = text
+        segs: List[object] = []
+        pos = 0
+        for m in PLACEHOLDER_RE.finditer(text):
+            if m.start() > pos:
+                segs.append(text[pos:m.start()])
+            segs.append(_Field(m.group(1).strip()))
+            pos = m.end()
+        if pos < len(text):
+            segs.append(text[pos:])
+        self.segments = segs
+        self.fields = [s for s in segs if isinstance(s, _Field)]
+        self._layouts: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        self._compile_html()
+        if fields:
+            self._resolve(tuple(fields))
+
+    # ---- compile ----
+    def _resolve(self, layout: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+        """Per field: the row keys to try, in the order the old normalized-map lookup used."""
+        owner: Dict[str, str] = {}
+        for k in layout:
+            if k and k.strip():
+                for v in _variants(k):
+                    owner[v] = k                 # later keys win, as in normalize_header_map
+        res = [tuple(owner[c] for c in f.cands if c in owner) for f in self.fields]
+        self._layouts[layout] = res
+        return res
+
+    def _compile_html(self) -> None:
+        """Paragraphs of (escaped literal | field index) for the one-pass HTML render."""
+        segs = self.segments
+        self._html_ok = not any(isinstance(s, str) and "\r" in s.replace("\r\n", "") for s in segs) \
+            and not any(("\n" in f.token or "\r" in f.token) for f in self.fields)
+        lits = [s.replace("\r\n", "\n") if isinstance(s, str) else s for s in segs]
+        # a field whose surroundings (through neighbouring fields) end and start with "\n"
+        for i, s in enumerate(lits):
+            if isinstance(s, _Field):
+                left = next((x for x in reversed(lits[:i]) if isinstance(x, str)), "")
+                right = next((x for x in lits[i + 1:] if isinstance(x, str)), "")
+                s.sensitive = left.endswith("\n") and right.startswith("\n")
+        field_ix = {id(f): i for i, f in enumerate(self.fields)}
+        blocks: List[List[object]] = [[]]
+        for s in lits:
+            if isinstance(s, _Field):
+                blocks[-1].append(field_ix[id(s)])
+                continue
+            pieces = s.split("\n\n")
+            for j, piece in enumerate(pieces):
+                if j:
+                    blocks.append([])
+                if piece:
+                    blocks[-1].append(piece)
+        # Each paragraph becomes a %-format string over the escaped values; a paragraph with
+        # only fields and whitespace is dropped when those fields render blank.
+        self._blocks: List[Tuple[str, List[int], bool]] = []     # (format, field indexes, may be blank)
+        for b in blocks:
+            lit_text = "".join(x for x in b if isinstance(x, str))
+            fields_in = [x for x in b if isinstance(x, int)]
+            if not fields_in and not lit_text.strip():
+                continue                          # blank paragraph: dropped by blocks_to_html
+            fmt = _P_OPEN + "".join(html.escape(x).replace("\n", "<br>").replace("%", "%%")
+                                    if isinstance(x, str) else "%s" for x in b) + "</p>"
+            self._blocks.append((fmt, fields_in, not lit_text.strip()))
+        self._html_fmts: Dict[Tuple[bool, ...], Tuple[str, List[int]]] = {}
+        self._text_fmt = "".join(s.replace("%", "%%") if isinstance(s, str) else "%s" for s in segs)
+
+    def _html_fmt(self, vals: List[str]) -> Tuple[str, List[int]]:
+        """Format string for this blank/non-blank paragraph pattern, plus the value indexes it uses."""
+        mask = tuple(blankable and not "".join(vals[i] for i in ix).strip()
+                     for _fmt, ix, blankable in self._blocks)
+        hit = self._html_fmts.get(mask)
+        if hit is None:
+            kept = [b for b, dropped in zip(self._blocks, mask) if not dropped]
+            hit = ("\n".join(fmt for fmt, _ix, _b in kept) if kept else "<p></p>",
+                   [i for _fmt, ix, _b in kept for i in ix])
+            self._html_fmts[mask] = hit
+        return hit
+
+    # ---- render ----
+    def values(self, row: Dict[str, str]) -> List[str]:
+        layout = tuple(row)
+        res = self._layouts.get(layout)
+        if res is None:
+            res = self._resolve(layout)
+        out = []
+        get = row.get
+        for f, keys in zip(self.fields, res):
+            v = f.missing
+            for k in keys:
+                x = get(k)
+                if x:
+                    v = x
+                    break
+            out.append(v)
+        return out
+
+    def render(self, row: Dict[str, str]) -> str:
+        if not self.fields:
+            return self.text
+        return self._text_fmt % tuple(self.values(row))
+
+    def render_both(self, row: Dict[str, str]) -> Tuple[str, str]:
+        """(plain text, blocks_to_html(plain text)) in one pass over the compiled segments."""
+        if not self.text:
+            return "", "<p></p>"
+        vals = self.values(row) if self.fields else []
+        text = self._text_fmt % tuple(vals)
+        if not self._html_ok:
+            return text, blocks_to_html(text)
+        for f, v in zip(self.fields, vals):
+            if "\n" in v or "\r" in v or (f.sensitive and not v):
+                return text, blocks_to_html(text)
+        fmt, used = self._html_fmt(vals)
+        if not used:
+            return text, fmt % () if "%" in fmt else fmt
+        esc = html.escape("\x00".join([vals[i] for i in used])).split("\x00")   # one escape call
+        if len(esc) != len(used):
+            esc = [html.escape(vals[i]) for i in used]
+        return text, fmt % tuple(esc)
+
+
+@lru_cache(maxsize=512)
+def _compiled(text: str, fields: Tuple[str, ...]) -> Template:
+    return Template(text, fields)
+
+
+def compile_template(text: str, fields: Optional[Iterable[str]] = None) -> Template:
+    """Compiled form of `text`, cached by (template text, field list)."""
+    return _compiled(text or "", tuple(fields or ()))
+
+
+def render(text: str, row: Dict[str, str], fields: Optional[Iterable[str]] = None) -> str:
+    return compile_template(text, fields).render(row)
+
+
+def render_both(text: str, row: Dict[str, str], fields: Optional[Iterable[str]] = None) -> Tuple[str, str]:
+    return compile_template(text, fields).render_both(row)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    FIELDS = ["First Name", "Last Name", "Company", "Email", "Industry", "Phone", "Address",
+              "City", "State", "Reviews", "Website", "Notes"]
+
+    def _legacy(text, row_dict):
+        norm = {}
+        for k, v in row_dict.items():
+            if k and k.strip():
+                k2 = k.strip()
+                norm[k2] = v; norm[k2.lower()] = v; norm[k2.replace(" ", "_").lower()] = v
+
+        def repl(m):
+            token = m.group(1).strip()
+            for c in (token, token.lower(), token.replace(" ", "_").lower()):
+                if c in norm and norm[c] != "":
+                    return norm[c]
+            if token.replace("_", " ").strip().lower() in _FIRST_NAME_TOKENS:
+                return "there"
+            return "{" + token + "}"
+        return PLACEHOLDER_RE.sub(repl, text) if text else ""
+
+    body = ("Hi {First Name},\r\n\r\nI came across {Company} in {city} and noticed your {reviews} "
+            "reviews <3 & wanted to reach out.\n\n{Notes}\n\nWe help {industry} shops in {State} get "
+            "more calls.\n{unknown_token}\n\nCheers,\nMe")
+    rnd = random.Random(7)
+    rows = []
+    for i in range(100_000):
+        r = {h: "" for h in FIELDS}
+        r.update({"First Name": rnd.choice(["Ann", "", "Bo"]), "Company": f"Co & Sons {i}",
+                  "City": "Austin", "Reviews": str(i % 300), "Industry": "Dental",
+                  "State": rnd.choice(["TX", ""]), "Notes": rnd.choice(["", "", "vip", "two\nlines"])})
+        rows.append(r)
+
+    t0 = time.perf_counter()
+    old = []
+    for r in rows:
+        txt = _legacy(body, r)
+        old.append((txt, blocks_to_html(txt)))
+    t1 = time.perf_counter()
+    tpl = compile_template(body, FIELDS)
+    new = [tpl.render_both(r) for r in rows]
+    t2 = time.perf_counter()
+    assert new == old, next((i, a, b) for i, (a, b) in enumerate(zip(new, old)) if a != b)
+    odd = [{"first_name": "x", "COMPANY": "y"}, {"First Name ": "z"}, {}] + rows[:200]
+    tricky = [body, "", "no fields", "100%s off {Company}%", "{Notes}", "\n\n{Notes}\n\n{City}\n",
+              "A\n{Notes}{City}\nB", "x\r{Company}\n", "{ first_name }\n\n\n{Company}\n\n  \n\n"]
+    for t in tricky:
+        for r in odd:
+            txt = _legacy(t, r)
+            assert compile_template(t, FIELDS).render_both(r) == (txt, blocks_to_html(txt)), (t, r)
+    print(f"100k renders (text + HTML): regex {t1 - t0:.2f}s  compiled {t2 - t1:.2f}s  "
+          f"({(t1 - t0) / (t2 - t1):.1f}x), outputs identical")
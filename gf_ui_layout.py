@@ -179,11 +179,16 @@ def build_window(app_version: str, user_display_name: str = ""):
         sg.Button("Add 1,000 Rows", key="-ADDROWS-"),
         sg.Button("Delete Selected Rows", key="-DELROWS-"),
         sg.Button("Save Now", key="-SAVECSV-"),
+        sg.Button("Import File…", key="-LEADS_IMPORT-"),
+        sg.Button("◀", key="-LEADS_PAGE_PREV-", disabled=True),
+        sg.Text("", key="-LEADS_PAGE-", text_color="#CCCCCC", size=(26, 1), justification="center"),
+        sg.Button("▶", key="-LEADS_PAGE_NEXT-", disabled=True),
         sg.Text("Status:", text_color="#A0A0A0"),
         sg.Text("Idle", key="-STATUS-", text_color="#FFFFFF"),
     ]
     leads_buttons_row2 = [
         sg.Button("Fire Emails", key="-FIRE-", size=(22, 2), disabled=True, button_color=("white", "#700000")),
+        sg.Button("Cancel", key="-FIRE_CANCEL-", disabled=True),
         sg.Text(" (disabled: add valid NEW leads)", key="-FIRE_HINT-", text_color="#BBBBBB")
     ]
     leads_tab = [
@@ -248,6 +253,7 @@ def build_window(app_version: str, user_display_name: str = ""):
         [sg.Text("Sync replies from Outlook; tag Green (good), Gray (neutral), Red (negative).", text_color="#CCCCCC")],
         [sg.Text("Lookback days:", text_color="#CCCCCC"), sg.Input("60", key="-LOOKBACK-", size=(6, 1)),
          sg.Button("Sync from Outlook", key="-SYNC-"),
+         sg.Button("Cancel", key="-SYNC_CANCEL-", disabled=True),
          sg.Checkbox("Auto Sync (hourly)", key="-AUTO_SYNC-", default=False, text_color="#EEEEEE"),
          sg.Text("", key="-RS_STATUS-", text_color="#A0FFA0")],
         [sg.Table(values=[], headings=["Ref", "Email", "Company", "Industry", "DateSent", "DateReplied", "Status", "Subject"],
@@ -287,6 +293,9 @@ def build_window(app_version: str, user_display_name: str = ""):
         [sg.Button("Confirm Call", key="-DIAL_CONFIRM-", size=(16, 2), disabled=True, button_color=("white", "#444444"))],
         [sg.Text("", key="-DIAL_MSG-", text_color="#A0FFA0", size=(28, 2))],
         [sg.Button("Add 100 Rows", key="-DIAL_ADD100-")],
+        [sg.Button("◀", key="-DIALER_PAGE_PREV-", disabled=True),
+         sg.Button("▶", key="-DIALER_PAGE_NEXT-", disabled=True)],
+        [sg.Text("", key="-DIALER_PAGE-", text_color="#CCCCCC", size=(28, 1))],
     ]
     dialer_tab = [
         [sg.Column([[dialer_host]], expand_x=True, expand_y=True),
@@ -351,6 +360,9 @@ def build_window(app_version: str, user_display_name: str = ""):
         sg.Button("Reload Customers", key="-CUST_RELOAD-"),
         sg.Button("Add 50 Rows", key="-CUST_ADD50-"),
         sg.Button("Add Order", key="-CUST_ADD_ORDER-", button_color=("white", "#2E7D32")),
+        sg.Button("◀", key="-CUST_PAGE_PREV-", disabled=True),
+        sg.Text("", key="-CUST_PAGE-", text_color="#CCCCCC", size=(26, 1), justification="center"),
+        sg.Button("▶", key="-CUST_PAGE_NEXT-", disabled=True),
         sg.Text("", key="-CUST_STATUS-", text_color="#A0FFA0")
     ]
     an_customer = [
@@ -407,7 +419,7 @@ def build_window(app_version: str, user_display_name: str = ""):
                        sg.Tab("Warm Leads",      warm_tab,      expand_x=True, expand_y=True),
                        sg.Tab("Customers",       customers_tab, expand_x=True, expand_y=True),
                        sg.Tab("Map",             map_tab,       expand_x=True, expand_y=True)]],
-                     key="-TABGROUP-",
+                     key="-TABGROUP-", enable_events=True,
                      expand_x=True, expand_y=True)]
     ]
 
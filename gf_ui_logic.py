@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import sys, os, csv
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -15,8 +17,8 @@ from gf_store import (
     # Email Leads
     EMAIL_LEADS_PATH,
     HEADER_FIELDS,
-    load_email_leads_matrix,
     save_email_leads_matrix,
+    LEADS_PAGER,
     # Warm v2
     WARM_LEADS_PATH,
     WARM_V2_FIELDS,
@@ -25,14 +27,31 @@ from gf_store import (
     # Customers
     CUSTOMERS_PATH,
     CUSTOMER_FIELDS,
-    load_customers_matrix,
     save_customers_matrix,
+    customers_pager,
     append_order_row,
     # Results (for “Emails Sent” and campaign resp% / results UI)
     RESULTS_PATH,
     load_results_rows_sorted,
+    # SQLite backend: push pending rows out to the CSV mirrors
+    flush_storage,
+    load_templates_ini,
+    load_campaigns_ini,
+    save_customer_rows,
+    SEEN,
 )
 
+# Outlook helpers (COM work runs on the background worker, never in the event loop)
+from gf_helpers import (
+    valid_email,
+    row_fingerprint,
+    load_state_set,
+    require_pywin32,
+)
+from gf_worker import (OutlookWorker, OUTLOOK_EVENT, draft_many_job, sync_results_job, import_leads_job,
+                       campaign_queue_job, migrate_seen_job)
+from gf_schedule import SCHEDULER as CAMPAIGN_SCHEDULER
+
 # Analytics (right-side panels + pipeline counters)
 from gf_analytics import init_analytics
 from gf_analytics import increment_warm_generated, increment_new_customer  # noqa - imported elsewhere
@@ -46,14 +65,15 @@ from gf_campaigns import (
     summarize_campaign_for_table,
     normalize_campaign_steps,
     normalize_campaign_settings,
+    campaign_stats_all,
 )
 
 # Dialer (controller owns its own coloring/preview logic)
 from gf_dialer import (
     attach_dialer,
-    load_dialer_leads_matrix,
     save_dialer_leads_matrix,
-    EMOJI_GREEN, EMOJI_GRAY, EMOJI_RED,
+    DIALER_HEADERS,
+    DIALER_PAGER,
 )
 
 # Warm module owns its own grid + events
@@ -68,6 +88,11 @@ from gf_sheet_utils import (
     load_column_widths,
     apply_column_widths,
     attach_column_width_persistence,
+    sync_sheet_rows,
+    show_sheet_rows,
+    apply_paste_block,
+    parse_in_background,
+    BACKGROUND_PARSE_CHARS,
     # (do NOT import bind_plaintext_paste anymore; we implement it locally to fix anchor)
 )
 
@@ -95,6 +120,9 @@ if str(_VENDOR_PSG) not in sys.path:
 import PySimpleGUI as sg  # noqa
 # -----------------------------------------
 
+# Paged grids: Leads / Dialer / Customers hold one page of their file at a time
+from gf_pager import GridPage
+
 # tksheet import (friendly message if missing)
 try:
     from tksheet import Sheet
@@ -187,7 +215,10 @@ def _parse_clipboard_text(tk_root):
         return []
     if not clip:
         return []
+    return _parse_clip_rows(clip)
 
+def _parse_clip_rows(clip, progress=None):
+    """Clipboard text -> rows (see _parse_clipboard_text); progress(done, total) for big pastes."""
     # Normalize newlines
     clip = clip.replace("\r\n", "\n").replace("\r", "\n")
 
@@ -202,7 +233,8 @@ def _parse_clipboard_text(tk_root):
 
     # Otherwise, fall back to CSV parsing (comma-delimited) with quote handling.
     rows = []
-    for line in clip.split("\n"):
+    lines = clip.split("\n")
+    for i, line in enumerate(lines):
         if line == "":
             continue
         try:
@@ -210,6 +242,8 @@ def _parse_clipboard_text(tk_root):
                 rows.append(parsed)
         except Exception:
             rows.append([line])
+        if progress is not None and i % 5000 == 0:
+            progress(i, len(lines))
     return rows
 
 def _unbind_default_paste(sheet):
@@ -226,66 +260,57 @@ def _unbind_default_paste(sheet):
             except Exception:
                 pass
 
-def _manual_plain_paste(sheet, tk_root, headers_only_cols=None):
-    """Always paste as plain text at selected cell; expand rows; optional cap on columns."""
-    rows = _parse_clipboard_text(tk_root)
-    if not rows:
-        return "break"
-
-    r0, c0 = _selected_anchor(sheet)
-
-    # Ensure enough rows exist
+def _manual_plain_paste(sheet, tk_root, headers_only_cols=None, on_pasted=None, status=None):
+    """
+    Always paste as plain text at selected cell; expand rows; optional cap on columns.
+    The block is applied in one update (apply_paste_block); clipboards over
+    BACKGROUND_PARSE_CHARS are parsed off the Tk thread, with progress sent to status(text).
+    on_pasted() runs once the rows are in the sheet.
+    """
     try:
-        total_rows = sheet.get_total_rows()
+        clip = tk_root.clipboard_get()
     except Exception:
-        total_rows = 0
-    need_rows = r0 + len(rows)
-    if need_rows > total_rows:
-        try:
-            sheet.insert_rows(total_rows, number_of_rows=(need_rows - total_rows))
-        except Exception:
-            try:
-                sheet.insert_rows(total_rows, amount=(need_rows - total_rows))
-            except Exception:
-                pass
-
-    # Write cells
-    for r_off, row in enumerate(rows):
-        for c_off, val in enumerate(row):
-            dest_c = c0 + c_off
-            if headers_only_cols is not None and dest_c >= headers_only_cols:
-                continue
-            try:
-                sheet.set_cell_data(r0 + r_off, dest_c, val)
-            except Exception:
-                pass
+        return "break"
+    if not clip:
+        return "break"
 
-    # Restore selection & refresh
-    try:
-        if hasattr(sheet, "select_cell"):
-            sheet.select_cell(r0, c0)
-        else:
-            sheet.set_currently_selected(r0, c0)
-        sheet.see(r0, c0)
-        sheet.refresh()
-    except Exception:
-        pass
+    r0, c0 = _selected_anchor(sheet)
+    big = len(clip) > BACKGROUND_PARSE_CHARS
+
+    def _apply(rows):
+        n = apply_paste_block(sheet, r0, c0, rows, headers_only_cols)
+        if n and callable(on_pasted):
+            on_pasted()
+        if big and callable(status):
+            status(f"Pasted {n} rows")
+
+    if big:
+        if callable(status):
+            status("Parsing paste…")
+        parse_in_background(
+            tk_root, _parse_clip_rows, clip, _apply,
+            on_progress=(lambda d, t: status(f"Parsing paste… {min(99, d * 100 // max(1, t))}%")) if callable(status) else None,
+        )
+    else:
+        _apply(_parse_clip_rows(clip))
     return "break"
 
-def _bind_plaintext_paste(sheet, tkroot, *, headers_only_cols=None, save_callback=None):
+def _bind_plaintext_paste(sheet, tkroot, *, headers_only_cols=None, save_callback=None, status_callback=None):
     """Bind Ctrl/Cmd+V to our plain-text paste at the correct anchor, then autosave."""
     if sheet is None:
         return
     _unbind_default_paste(sheet)  # kill any defaults that might paste at (0,0)
 
-    def _on_paste(_evt=None):
-        res = _manual_plain_paste(sheet, tkroot, headers_only_cols=headers_only_cols)
+    def _saved():
         try:
             if callable(save_callback):
                 save_callback()
         except Exception:
             pass
-        return res
+
+    def _on_paste(_evt=None):
+        return _manual_plain_paste(sheet, tkroot, headers_only_cols=headers_only_cols,
+                                   on_pasted=_saved, status=status_callback)
 
     # Bind on all subwidgets to be safe
     targets = (sheet, getattr(sheet, "MT", None), getattr(sheet, "RI", None),
@@ -328,17 +353,48 @@ def _matrix_from_sheet(sheet, headers_len):
         out.pop()
     return out
 
+# Paged grids: grid name -> GridPage (set by the mount functions). A grid shows one page of
+# its file, so its saves replace that page only; without a page the whole file is written.
+_PAGES = {}
+
+# While a bulk import appends to the leads file, grid saves would replace it underneath:
+# they are deferred and written in _finish_leads_import.
+_LEADS_IMPORTING = False
+_LEADS_SAVE_DEFERRED = False
+
 def _save_leads(sheet):
+    global _LEADS_SAVE_DEFERRED
+    if _LEADS_IMPORTING:
+        _LEADS_SAVE_DEFERRED = True
+        return
     try:
         data = _matrix_from_sheet(sheet, len(HEADER_FIELDS))
-        save_email_leads_matrix(data)
+        if "leads" in _PAGES:
+            _PAGES["leads"].save(data)
+        else:
+            save_email_leads_matrix(data)
     except Exception:
         pass
 
 def _save_customers(sheet):
     try:
         data = _matrix_from_sheet(sheet, len(CUSTOMER_FIELDS))
-        save_customers_matrix(data)
+        if "customers" in _PAGES:
+            _PAGES["customers"].save(data)
+        else:
+            save_customers_matrix(data)
+    except Exception:
+        pass
+
+def _save_dialer_matrix(matrix):
+    if "dialer" in _PAGES:
+        _PAGES["dialer"].save(matrix)
+    else:
+        save_dialer_leads_matrix(matrix)
+
+def _save_dialer(sheet):
+    try:
+        _save_dialer_matrix(_matrix_from_sheet(sheet, len(DIALER_HEADERS)))
     except Exception:
         pass
 
@@ -351,6 +407,12 @@ def _save_warm(sheet):
 
 def _save_all(context):
     """Persist all grids best-effort."""
+    # Pending debounced autosaves are covered by the full writes below
+    try:
+        if context.get("autosave"):
+            context["autosave"].cancel()
+    except Exception:
+        pass
     try:
         if context.get("sheet"):
             _save_leads(context["sheet"])
@@ -368,20 +430,132 @@ def _save_all(context):
         pass
     try:
         if context.get("dial_sheet"):
-            data = _matrix_from_sheet(context["dial_sheet"], len(HEADER_FIELDS) + 3 + 8)
-            save_dialer_leads_matrix(data)
+            _save_dialer(context["dial_sheet"])
+    except Exception:
+        pass
+    try:
+        flush_storage()
     except Exception:
         pass
 
-def _autosave_on_edit(sheet, save_fn):
-    """Bind end_edit_cell to persist after manual edits (not just paste)."""
-    if not sheet:
-        return
-    def _on_end_edit(_ev=None):
+def _save_customer_rows(sheet, rows):
+    """Row-level customers save (SQLite backend); False -> caller does the full save."""
+    try:
+        data = sheet.get_sheet_data() or []
+    except Exception:
+        return False
+    page = _PAGES.get("customers")
+    start, loaded = (page.start, page.loaded) if page is not None else (0, len(data))
+    n = len(CUSTOMER_FIELDS)
+    picked = {start + r: (list(data[r]) + [""] * n)[:n] for r in rows if 0 <= r < min(len(data), loaded)}
+    return len(picked) == len(rows) and save_customer_rows(picked)
+
+# ==============================
+# Autosave coordinator
+# ==============================
+AUTOSAVE_DELAY_MS = 800
+
+class _Autosave:
+    """
+    Debounced, dirty-row aware grid autosave.
+    - Edits/pastes only mark rows dirty and (re)arm one Tk timer; once the grids have been
+      quiet for AUTOSAVE_DELAY_MS every dirty grid is written once.
+    - save_rows(sheet, rows) persists just the edited rows where the backend can; it
+      returns False to fall back to save_full(sheet).
+    - flush() runs on tab switch; cancel() on close, where _save_all writes everything.
+    """
+    def __init__(self, tk_root, delay_ms=AUTOSAVE_DELAY_MS):
+        self.tk_root = tk_root
+        self.delay_ms = delay_ms
+        self._grids = {}
+        self._dirty = {}   # name -> set of row indexes, or None for "whole grid"
+        self._timer = None
+
+    def register(self, name, sheet, save_full, save_rows=None, after=None):
+        self._grids[name] = {"sheet": sheet, "save_full": save_full,
+                             "save_rows": save_rows, "after": after}
+
+    def mark_dirty(self, name, rows=None):
+        if name not in self._grids:
+            return
+        if rows is None or (name in self._dirty and self._dirty[name] is None):
+            self._dirty[name] = None
+        else:
+            self._dirty.setdefault(name, set()).update(rows)
+        self._arm()
+
+    def pending(self):
+        return bool(self._dirty)
+
+    def flush(self, name=None):
+        if name is None:
+            self._disarm()
+        for n in ([name] if name else list(self._dirty)):
+            if n not in self._dirty:
+                continue
+            rows = self._dirty.pop(n)
+            g = self._grids[n]
+            try:
+                done = bool(rows) and callable(g["save_rows"]) and g["save_rows"](g["sheet"], sorted(rows))
+                if not done:
+                    g["save_full"](g["sheet"])
+            except Exception:
+                pass
+            try:
+                if callable(g["after"]):
+                    g["after"]()
+            except Exception:
+                pass
+
+    def cancel(self):
+        self._disarm()
+        self._dirty.clear()
+
+    def _arm(self):
+        self._disarm()
         try:
-            save_fn(sheet)
+            self._timer = self.tk_root.after(self.delay_ms, self._on_timer)
         except Exception:
-            pass
+            self._timer = None
+            self.flush()
+
+    def _disarm(self):
+        if self._timer is not None:
+            try:
+                self.tk_root.after_cancel(self._timer)
+            except Exception:
+                pass
+            self._timer = None
+
+    def _on_timer(self):
+        self._timer = None
+        self.flush()
+
+def _autosaver(window, context):
+    """The window's shared _Autosave (created on first use, kept in context["autosave"])."""
+    if context is None:
+        context = {}
+    a = context.get("autosave")
+    if a is None:
+        a = context["autosave"] = _Autosave(window.TKroot)
+    return a
+
+def _edited_cell(ev):
+    """(row, col) from a tksheet end_edit_cell event (dict-style or legacy tuple), else (None, None)."""
+    try:
+        if isinstance(ev, dict):
+            return int(ev.get("row")), int(ev.get("column"))
+        return int(ev[0]), int(ev[1])
+    except Exception:
+        return None, None
+
+def _autosave_on_edit(sheet, autosave, name, key_cols=()):
+    """Bind end_edit_cell to mark the edited row dirty (an edit in a key column dirties the whole grid)."""
+    if not sheet:
+        return
+    def _on_end_edit(ev=None):
+        r, c = _edited_cell(ev)
+        autosave.mark_dirty(name, None if (r is None or c in key_cols) else [r])
     try:
         sheet.extra_bindings([("end_edit_cell", _on_end_edit)])
     except Exception:
@@ -397,6 +571,69 @@ def _disable_rc_menu(sheet):
     except Exception:
         pass
 
+# ==============================
+# Paged grids
+# ==============================
+_SHEET_KEYS = {"leads": "sheet", "dialer": "dial_sheet", "customers": "customer_sheet"}
+_PAGE_NAV = {   # grid -> (label, prev button, next button)
+    "leads": ("-LEADS_PAGE-", "-LEADS_PAGE_PREV-", "-LEADS_PAGE_NEXT-"),
+    "dialer": ("-DIALER_PAGE-", "-DIALER_PAGE_PREV-", "-DIALER_PAGE_NEXT-"),
+    "customers": ("-CUST_PAGE-", "-CUST_PAGE_PREV-", "-CUST_PAGE_NEXT-"),
+}
+_PAGE_EVENTS = {}
+for _name, (_label, _prev, _next) in _PAGE_NAV.items():
+    _PAGE_EVENTS[_prev] = (_name, -1)
+    _PAGE_EVENTS[_next] = (_name, 1)
+PAGE_COUNTED_EVENT = "-PAGE_COUNTED-"   # background row count finished (value: grid name)
+
+def _grid_page(name, pager, ncols, min_rows, pad_row=None):
+    """The grid's GridPage; kept across remounts so a reload stays on the same page."""
+    page = _PAGES.get(name)
+    if page is None or page.pager is not pager:
+        page = _PAGES[name] = GridPage(pager, ncols, min_rows=min_rows, pad_row=pad_row)
+    return page
+
+def _update_page_nav(window, name):
+    page = _PAGES.get(name)
+    if page is None:
+        return
+    label, prev_key, next_key = _PAGE_NAV[name]
+    try:
+        window[label].update(page.label())
+        window[prev_key].update(disabled=not page.has_prev())
+        window[next_key].update(disabled=not page.has_next())
+    except Exception:
+        pass
+
+def _count_pages(window, name):
+    """Count the file's rows off the UI thread; the label gets its "of N" when that is done."""
+    page = _PAGES.get(name)
+    if page is None:
+        return
+    _update_page_nav(window, name)
+    def _done(_total):
+        try:
+            window.write_event_value(PAGE_COUNTED_EVENT, name)
+        except Exception:
+            pass
+    try:
+        page.pager.scan_async(on_done=_done)
+    except Exception:
+        pass
+
+def _goto_page(window, context, name, delta):
+    """Show the previous/next page of a grid (pending edits are saved to the page being left)."""
+    page = _PAGES.get(name)
+    sheet_obj = context.get(_SHEET_KEYS[name])
+    if page is None or sheet_obj is None:
+        return False
+    if (delta < 0 and not page.has_prev()) or (delta > 0 and not page.has_next()):
+        return False
+    _autosaver(window, context).flush(name)
+    show_sheet_rows(sheet_obj, page.load(page.page + delta))
+    _update_page_nav(window, name)
+    return True
+
 # ==============================
 # Grid mounting
 # ==============================
@@ -404,16 +641,16 @@ def _disable_rc_menu(sheet):
 def _mount_leads(window, start_rows=200, col_width=140, context=None):
     if not _TKSHEET_OK:
         return None
+    _autosaver(window, context).flush("leads")  # a remount reloads from disk: persist pending edits first
     host = window["-LEADS_HOST-"].Widget
     _clear_children(host)
     holder = sg.tk.Frame(host, bg="#111111")
     holder.pack(side="top", fill="both", expand=True)
+    page = _grid_page("leads", LEADS_PAGER, len(HEADER_FIELDS), start_rows)
     try:
-        rows = load_email_leads_matrix()
+        rows = page.load()
     except Exception:
-        rows = []
-    if len(rows) < start_rows:
-        rows += [[""] * len(HEADER_FIELDS) for _ in range(start_rows - len(rows))]
+        rows = [[""] * len(HEADER_FIELDS) for _ in range(start_rows)]
     sheet = Sheet(holder, data=rows, headers=HEADER_FIELDS, show_x_scrollbar=True, show_y_scrollbar=True)
     sheet.enable_bindings((
         "single_select","row_select","arrowkeys","tab_key","shift_tab_key",
@@ -447,15 +684,18 @@ def _mount_leads(window, start_rows=200, col_width=140, context=None):
     # 🔒 Remove right-click menu (no Paste there)
     _disable_rc_menu(sheet)
 
-    # ✅ Proven plain-text paste anchored to selected cell, autosave after paste + refresh analytics
+    # ✅ Proven plain-text paste anchored to selected cell; edits + pastes autosave (debounced) + refresh analytics
+    autosave = _autosaver(window, context)
+    autosave.register("leads", sheet, _save_leads,
+                      after=lambda: (_update_page_nav(window, "leads"), _trigger_analytics_refresh(window)))
     _bind_plaintext_paste(
         sheet, window.TKroot,
         headers_only_cols=None,
-        save_callback=lambda: (_save_leads(sheet), _trigger_analytics_refresh(window))
+        save_callback=lambda: autosave.mark_dirty("leads"),
+        status_callback=lambda m: window["-STATUS-"].update(m),
     )
-
-    # ✅ Autosave on manual edits too (and refresh)
-    _autosave_on_edit(sheet, lambda _s: (_save_leads(sheet), _trigger_analytics_refresh(window)))
+    _autosave_on_edit(sheet, autosave, "leads")
+    _count_pages(window, "leads")
 
     return sheet
 
@@ -463,26 +703,29 @@ def _mount_leads(window, start_rows=200, col_width=140, context=None):
 def _mount_dialer(window, start_rows=100, col_width=120, context=None):
     if not _TKSHEET_OK:
         return None
+    _autosaver(window, context).flush("dialer")  # a remount reloads from disk: persist pending edits first
     host = window["-DIAL_HOST-"].Widget
     _clear_children(host)
     holder = sg.tk.Frame(host, bg="#111111")
     holder.pack(side="top", fill="both", expand=True)
+    headers = DIALER_HEADERS
+    padrow = [""]*len(HEADER_FIELDS) + ["○","○","○"] + ([""]*8)
+    page = _grid_page("dialer", DIALER_PAGER, len(headers), start_rows, pad_row=padrow)
     try:
-        matrix = load_dialer_leads_matrix()
+        matrix = page.load()
     except Exception:
         matrix = []
-    if not matrix:
+    if not page.loaded and page.page == 0:
+        # empty dialer file: start from the first page of leads (written on the first save)
         try:
-            base = load_email_leads_matrix()
+            base = LEADS_PAGER.read(0, page.page_rows)
         except Exception:
             base = []
         if not base:
             base = [[""] * len(HEADER_FIELDS) for _ in range(50)]
         matrix = [row + ["○","○","○"] + ([""]*8) for row in base]
     if len(matrix) < start_rows:
-        padrow = [""]*len(HEADER_FIELDS) + ["○","○","○"] + ([""]*8)
         matrix += [padrow[:] for _ in range(start_rows - len(matrix))]
-    headers = HEADER_FIELDS + [EMOJI_GREEN, EMOJI_GRAY, EMOJI_RED] + [f"Note{i}" for i in range(1,9)]
     sheet = Sheet(holder, data=matrix, headers=headers, show_x_scrollbar=True, show_y_scrollbar=True)
     sheet.enable_bindings((
         "single_select","row_select","arrowkeys","tab_key","shift_tab_key",
@@ -526,35 +769,47 @@ def _mount_dialer(window, start_rows=100, col_width=120, context=None):
     _disable_rc_menu(sheet)
 
     # ✅ Paste only into lead columns (don’t overwrite dots/notes), autosave + refresh analytics
+    autosave = _autosaver(window, context)
+    autosave.register("dialer", sheet, _save_dialer,
+                      after=lambda: (_update_page_nav(window, "dialer"), _trigger_analytics_refresh(window)))
     _bind_plaintext_paste(
         sheet, window.TKroot,
         headers_only_cols=len(HEADER_FIELDS),
-        save_callback=lambda: (save_dialer_leads_matrix(_matrix_from_sheet(sheet, len(headers))),
-                               _trigger_analytics_refresh(window))
-    )
-
-    _autosave_on_edit(
-        sheet,
-        lambda _s: (save_dialer_leads_matrix(_matrix_from_sheet(sheet, len(headers))),
-                    _trigger_analytics_refresh(window))
+        save_callback=lambda: autosave.mark_dirty("dialer"),
+        status_callback=lambda m: window["-DIAL_MSG-"].update(m),
     )
+    _autosave_on_edit(sheet, autosave, "dialer")
+    _count_pages(window, "dialer")
 
     return sheet
 
 
+def _resync_grid(window, context, name, sheet_obj):
+    """
+    Reload a mounted paged grid in place: pending edits are saved first, then its current
+    page is re-read and only the rows that differ are touched (scroll position + selection
+    are kept).
+    """
+    _autosaver(window, context).flush(name)
+    page = _PAGES[name]
+    stats = sync_sheet_rows(sheet_obj, page.load(), page.ncols, min_rows=page.min_rows)
+    _update_page_nav(window, name)
+    return stats
+
+
 def _mount_customers(window, start_rows=50, col_width=130, context=None):
     if not _TKSHEET_OK:
         return None
+    _autosaver(window, context).flush("customers")  # a remount reloads from disk: persist pending edits first
     host = window["-CUST_HOST-"].Widget
     _clear_children(host)
     holder = sg.tk.Frame(host, bg="#111111")
     holder.pack(side="top", fill="both", expand=True)
     try:
-        matrix = load_customers_matrix()
+        page = _grid_page("customers", customers_pager(), len(CUSTOMER_FIELDS), start_rows)
+        matrix = page.load()
     except Exception:
-        matrix = []
-    if len(matrix) < start_rows:
-        matrix += [[""] * len(CUSTOMER_FIELDS) for _ in range(start_rows - len(matrix))]
+        matrix = [[""] * len(CUSTOMER_FIELDS) for _ in range(start_rows)]
     sheet = Sheet(holder, data=matrix, headers=CUSTOMER_FIELDS, show_x_scrollbar=True, show_y_scrollbar=True)
     sheet.enable_bindings((
         "single_select","row_select","arrowkeys","tab_key","shift_tab_key",
@@ -598,13 +853,19 @@ def _mount_customers(window, start_rows=50, col_width=130, context=None):
 
     _disable_rc_menu(sheet)
 
-    # ✅ Plain-text paste + autosave at correct anchor + refresh analytics
+    # ✅ Plain-text paste + autosave at correct anchor + refresh analytics.
+    # Single-cell edits save just that row (by its table position) when the backend allows.
+    autosave = _autosaver(window, context)
+    autosave.register("customers", sheet, _save_customers, save_rows=_save_customer_rows,
+                      after=lambda: (_update_page_nav(window, "customers"), _trigger_analytics_refresh(window)))
     _bind_plaintext_paste(
         sheet, window.TKroot,
         headers_only_cols=None,
-        save_callback=lambda: (_save_customers(sheet), _trigger_analytics_refresh(window))
+        save_callback=lambda: autosave.mark_dirty("customers"),
+        status_callback=lambda m: window["-CUST_STATUS-"].update(m),
     )
-    _autosave_on_edit(sheet, lambda _s: (_save_customers(sheet), _trigger_analytics_refresh(window)))
+    _autosave_on_edit(sheet, autosave, "customers", key_cols=(CUSTOMER_FIELDS.index("Company"),))
+    _count_pages(window, "customers")
 
     return sheet
 
@@ -615,26 +876,18 @@ def _refresh_campaign_table(window):
     try:
         keys = list_campaign_keys() or ["default"]
         table_rows = []
+        try:
+            stats = campaign_stats_all()      # one pass over results for every campaign
+        except Exception:
+            stats = None
         for k in keys:
             base = summarize_campaign_for_table(k)
             # add resp% (best-effort)
-            try:
-                rows = load_results_rows_sorted()
-                sent = replied = 0
-                subs = {
-                    (s.get("subject", "") or "").strip()
-                    for s in normalize_campaign_steps(load_campaign_by_key(k)[0])
-                    if (s.get("subject", "") or "").strip()
-                }
-                for r in rows:
-                    if (r.get("Subject", "") or "").strip() in subs:
-                        if r.get("DateSent"):
-                            sent += 1
-                        if r.get("DateReplied"):
-                            replied += 1
-                resp = "0.0%" if sent == 0 else f"{(replied / sent) * 100:.1f}%"
-            except Exception:
+            if stats is None:
                 resp = ""
+            else:
+                sent, _replied, pct = stats.get(k, (0, 0, 0.0))
+                resp = "0.0%" if sent == 0 else f"{pct:.1f}%"
             table_rows.append(base + [resp])
         try:
             window["-CAMP_TABLE-"].update(values=table_rows)
@@ -654,6 +907,241 @@ def _refresh_campaign_table(window):
         except Exception:
             pass
 
+# ==============================
+# Outlook jobs (background worker)
+# ==============================
+
+def _new_lead_rows():
+    """
+    Rows of the whole leads file (the grid only holds one page) with a valid email that were
+    never drafted (fingerprint not in the SEEN index). Streamed, one row at a time.
+    """
+    seen = load_state_set()
+    out = []
+    try:
+        with EMAIL_LEADS_PATH.open("r", encoding="utf-8", newline="") as f:
+            rdr = csv.reader(f)
+            hdr = next(rdr, None) or []
+            ix = [hdr.index(h) if h in hdr else None for h in HEADER_FIELDS]
+            n = len(hdr)
+            e, fn, co, ind = (HEADER_FIELDS.index(h) for h in ("Email", "First Name", "Company", "Industry"))
+            for r in rdr:
+                if len(r) < n:
+                    r += [""] * (n - len(r))
+                row = [r[i] if i is not None else "" for i in ix]
+                if valid_email(row[e]) and row_fingerprint(row[e], row[fn], row[co], row[ind]) not in seen:
+                    out.append(row)
+    except FileNotFoundError:
+        pass
+    return out
+
+# "Ready: N new lead(s)" count, keyed on the leads file signature + SEEN size. Big files are
+# counted on a daemon thread; FIRE_COUNTED_EVENT re-runs _refresh_fire_state once it is known.
+FIRE_COUNTED_EVENT = "-FIRE_COUNTED-"
+FIRE_COUNT_INLINE_BYTES = 2_000_000
+_NEW_LEADS_COUNT = {"key": None, "n": 0, "thread": None, "busy": False}
+
+def _new_leads_key():
+    try:
+        st = EMAIL_LEADS_PATH.stat()
+        return (st.st_mtime_ns, st.st_size, len(load_state_set()))
+    except Exception:
+        return None
+
+def _new_lead_count(window):
+    """New-lead count, or None while a background count is running."""
+    key = _new_leads_key()
+    if key is not None and key == _NEW_LEADS_COUNT["key"]:
+        return _NEW_LEADS_COUNT["n"]
+    if key is None or key[1] < FIRE_COUNT_INLINE_BYTES:
+        _NEW_LEADS_COUNT["n"], _NEW_LEADS_COUNT["key"] = len(_new_lead_rows()), key
+        return _NEW_LEADS_COUNT["n"]
+    t = _NEW_LEADS_COUNT["thread"]
+    if t is None or not t.is_alive():
+        def _run():
+            k, n = None, 0
+            while k != _new_leads_key():      # the file changed while counting: count again
+                k = _new_leads_key()
+                n = len(_new_lead_rows())
+            _NEW_LEADS_COUNT["n"], _NEW_LEADS_COUNT["key"] = n, k
+            try:
+                window.write_event_value(FIRE_COUNTED_EVENT, n)
+            except Exception:
+                pass
+        t = _NEW_LEADS_COUNT["thread"] = threading.Thread(target=_run, name="gf-fire-count", daemon=True)
+        t.start()
+    return None
+
+def _refresh_fire_state(window, busy=False):
+    _NEW_LEADS_COUNT["busy"] = busy
+    try:
+        if busy:
+            window["-FIRE-"].update(disabled=True)
+            return
+        n = _new_lead_count(window)
+        if n is None:
+            window["-FIRE-"].update(disabled=True, button_color=("white", "#700000"))
+            window["-FIRE_HINT-"].update(" Counting new leads…")
+        elif n > 0:
+            window["-FIRE-"].update(disabled=False, button_color=("white", "#C00000"))
+            window["-FIRE_HINT-"].update(f" Ready: {n} new lead(s).")
+        else:
+            window["-FIRE-"].update(disabled=True, button_color=("white", "#700000"))
+            window["-FIRE_HINT-"].update(" (no NEW leads; already drafted or no valid emails)")
+    except Exception:
+        pass
+
+def _refresh_results_table(window):
+    try:
+        rows = load_results_rows_sorted()
+        cols = ("Ref", "Email", "Company", "Industry", "DateSent", "DateReplied", "Status", "Subject")
+        window["-RSTABLE-"].update(values=[[r.get(h, "") for h in cols] for r in rows])
+        sent = sum(1 for r in rows if r.get("DateSent"))
+        replied = sum(1 for r in rows if r.get("DateReplied"))
+        window["-REPLRATE-"].update(f"{replied} / {sent}")
+    except Exception:
+        pass
+
+def _start_leads_import(window, context, worker, sheet, path):
+    global _LEADS_IMPORTING, _LEADS_SAVE_DEFERRED
+    _autosaver(window, context).flush("leads")
+    _save_leads(sheet)
+    _LEADS_IMPORTING, _LEADS_SAVE_DEFERRED = True, False
+    worker.submit("import", import_leads_job, path)
+    try:
+        window["-LEADS_IMPORT-"].update(disabled=True)
+    except Exception:
+        pass
+
+def _finish_leads_import(window, context, stats):
+    """
+    Import finished: write grid edits made meanwhile back over the page they belong to
+    (in front of the imported rows), then bring the grid in line with the file.
+    """
+    global _LEADS_IMPORTING, _LEADS_SAVE_DEFERRED
+    _LEADS_IMPORTING = False
+    sheet = context.get("sheet")
+    page = _PAGES.get("leads")
+    try:
+        # the import only appended: the page's rows are still where they were loaded from
+        if _LEADS_SAVE_DEFERRED and sheet is not None:
+            _save_leads(sheet)
+        _LEADS_SAVE_DEFERRED = False
+        if sheet is not None and page is not None:
+            sync_sheet_rows(sheet, page.load(), len(HEADER_FIELDS), min_rows=page.min_rows)
+    except Exception:
+        pass
+    _count_pages(window, "leads")
+    try:
+        window["-LEADS_IMPORT-"].update(disabled=False)
+    except Exception:
+        pass
+    _refresh_fire_state(window)
+
+# Campaign follow-ups (gf_schedule): the idle timer only peeks at the due-date heap; the run
+# itself (Outlook drafts, campaigns.csv, dialer divert) goes to the worker thread.
+CAMPAIGN_CHECK_SECONDS = 300
+_CAMPAIGN_RUN = {"next_check": 0.0, "running": False}
+
+
+def _maybe_run_campaigns(worker) -> None:
+    now = time.time()
+    if _CAMPAIGN_RUN["running"] or now < _CAMPAIGN_RUN["next_check"]:
+        return
+    _CAMPAIGN_RUN["next_check"] = now + CAMPAIGN_CHECK_SECONDS
+    try:
+        if load_campaigns_ini()[1].get("hourly_campaign_runner", "1") != "1":
+            return
+        due = CAMPAIGN_SCHEDULER.next_due()
+    except Exception:
+        return
+    if due is not None and due <= now:
+        _CAMPAIGN_RUN["running"] = True
+        worker.submit("campaigns", campaign_queue_job)
+
+
+def _reload_dialer_page(window, context):
+    """Diverted leads were appended to dialer_leads.csv: re-read the mounted page, re-index dots."""
+    sheet = context.get("dial_sheet")
+    if sheet is None or "dialer" not in _PAGES:
+        return
+    try:
+        _resync_grid(window, context, "dialer", sheet)
+        _count_pages(window, "dialer")
+        ctl = context.get("dialer_ctl")
+        if ctl is not None:
+            ctl.repaint_all_rows()
+    except Exception:
+        pass
+
+def _handle_outlook_event(window, context, p):
+    # Render worker progress/completion for the "draft", "sync", "import", "campaigns" and "seen" jobs.
+    name, state = p.get("name"), p.get("state")
+    if name == "draft":
+        status_key, cancel_key, verb = "-STATUS-", "-FIRE_CANCEL-", "Drafting"
+    elif name == "campaigns":
+        status_key, cancel_key, verb = "-RS_STATUS-", "-SYNC_CANCEL-", "Campaign follow-ups"
+    elif name == "import":
+        status_key, cancel_key, verb = "-STATUS-", "-FIRE_CANCEL-", "Importing"
+    elif name == "seen":
+        status_key, cancel_key, verb = "-STATUS-", "-FIRE_CANCEL-", "Upgrading drafted-leads index"
+    else:
+        status_key, cancel_key, verb = "-RS_STATUS-", "-SYNC_CANCEL-", "Syncing"
+    msg = None
+    if state in ("queued", "running"):
+        msg = f"{verb}…"
+    elif state == "progress":
+        done, total, rate = p.get("done", 0), p.get("total"), p.get("rate")
+        msg = f"{verb} {done}/{total}" if total else f"{verb} {done}"
+        if name == "import" and total:
+            msg = f"{verb} {done * 100 // total}%: {p.get('message', '')}"
+        if rate:
+            msg += f" ({rate:.1f}/s)"
+    elif state == "done":
+        res = p.get("result")
+        if name == "draft":
+            msg = f"Drafted {res or 0} email(s) in {p.get('message', '')}"
+        elif name == "import":
+            st = res or {}
+            skipped = sum(st.get(k, 0) for k in ("invalid", "drafted", "no_interest", "customer", "existing", "duplicate"))
+            msg = f"Imported {st.get('imported', 0)} of {st.get('read', 0)} rows ({skipped} skipped) in {p.get('message', '')}"
+        elif name == "seen":
+            msg = f"Drafted-leads index ready ({res or 0} imported from state.txt)."
+        elif name == "campaigns":
+            st = res or {}
+            msg = (f"Campaign follow-ups: {st.get('drafted', 0)} drafted, {st.get('diverted', 0)} to Dialer, "
+                   f"{st.get('removed', 0)} finished; {st.get('scheduled', 0)} scheduled.")
+            if st.get("divert_failed"):
+                msg += f" {st['divert_failed']} could not be sent to the Dialer (will retry)."
+        else:
+            sent_n, repl_n = res if isinstance(res, tuple) else (0, 0)
+            msg = f"Synced: {sent_n} sent refs; {repl_n} replies."
+    elif state == "cancelled":
+        msg = f"{verb} cancelled"
+    elif state == "error":
+        msg = f"{verb} error: {p.get('error', '')}"
+    try:
+        if msg is not None:
+            window[status_key].update(msg)
+    except Exception:
+        pass
+    finished = state in ("done", "cancelled", "error")
+    try:
+        window[cancel_key].update(disabled=finished)
+    except Exception:
+        pass
+    if finished:
+        if name == "campaigns":
+            _CAMPAIGN_RUN["running"] = False
+            if state == "done" and (p.get("result") or {}).get("diverted"):
+                _reload_dialer_page(window, context)
+        if name == "import":
+            _finish_leads_import(window, context, p.get("result"))
+        if name in ("draft", "seen"):
+            _refresh_fire_state(window)
+        _refresh_results_table(window)
+        _trigger_analytics_refresh(window)
+
 # ==============================
 # Public entry points
 # ==============================
@@ -672,12 +1160,15 @@ def mount_grids(window, _context):
     # Also wire Ctrl+V for Warm sheet (gf_warm removed paste on purpose)
     if isinstance(warm_sheet, Sheet):
         _disable_rc_menu(warm_sheet)
+        autosave = _autosaver(window, context)
+        autosave.register("warm", warm_sheet, _save_warm, after=lambda: _trigger_analytics_refresh(window))
         _bind_plaintext_paste(
             warm_sheet, window.TKroot,
             headers_only_cols=None,
-            save_callback=lambda: (_save_warm(warm_sheet), _trigger_analytics_refresh(window))
+            save_callback=lambda: autosave.mark_dirty("warm"),
+            status_callback=lambda m: window["-WARM_STATUS-"].update(m),
         )
-        _autosave_on_edit(warm_sheet, lambda _s: (_save_warm(warm_sheet), _trigger_analytics_refresh(window)))
+        _autosave_on_edit(warm_sheet, autosave, "warm")
 
     # Start analytics (updates Daily/Monthly + right-side panels)
     init_analytics(window)
@@ -692,7 +1183,7 @@ def mount_grids(window, _context):
     dialer_ctl = None
     try:
         if dial_sheet is not None:
-            dialer_ctl = attach_dialer(window, dial_sheet)
+            dialer_ctl = attach_dialer(window, dial_sheet, save_matrix=_save_dialer_matrix)
     except Exception as _e:
         print("[dialer] attach failed:", _e)
 
@@ -755,13 +1246,41 @@ def run_event_loop(window, context):
             pass
         return None
 
+    worker = context.get("outlook_worker") or OutlookWorker(window).start()
+    context["outlook_worker"] = worker
+    # A legacy state.txt is imported on the worker, not by the first lookup on this thread.
+    # Jobs run in order, so a Fire queued meanwhile still dedupes against the full index.
+    if SEEN.needs_migration():
+        SEEN.defer_migration()
+        worker.submit("seen", migrate_seen_job)
+    _refresh_fire_state(window)
+
     while True:
         event, values = window.read(timeout=250)
         if event in (sg.WINDOW_CLOSE_ATTEMPTED_EVENT, sg.WIN_CLOSED):
+            # Let an in-flight Outlook job commit its current chunk first
+            worker.cancel()
+            worker.stop()
             # SAVE-ON-EXIT (bulletproof persistence)
             _save_all(context)
             break
 
+        # Idle tick: export SQLite changes to the CSV mirrors; fold the results journal
+        # into results.csv only once it has gone quiet with no Outlook job running
+        if event == sg.TIMEOUT_KEY:
+            try:
+                flush_storage(idle=True, busy=worker.busy())
+            except Exception:
+                pass
+            _maybe_run_campaigns(worker)
+
+        # Tab switch: write any debounced grid edits now
+        if event == "-TABGROUP-":
+            try:
+                _autosaver(window, context).flush()
+            except Exception:
+                pass
+
         # Global analytics refresh hook
         if event == "-ANALYTICS_REFRESH-":
             try:
@@ -769,6 +1288,36 @@ def run_event_loop(window, context):
             except Exception:
                 pass
 
+        if event == FIRE_COUNTED_EVENT:
+            if not _NEW_LEADS_COUNT["busy"]:
+                _refresh_fire_state(window)
+            continue
+
+        # Paged grids: background row count done / previous-next page
+        if event == PAGE_COUNTED_EVENT:
+            _update_page_nav(window, values.get(PAGE_COUNTED_EVENT))
+            continue
+
+        if event in _PAGE_EVENTS:
+            name, delta = _PAGE_EVENTS[event]
+            if name == "leads" and _LEADS_IMPORTING:
+                window["-STATUS-"].update("Import running; paging resumes when it finishes.")
+                continue
+            try:
+                moved = _goto_page(window, context, name, delta)
+            except Exception:
+                moved = False
+            if moved and name == "dialer" and dialer_ctl:
+                context["_dial_last_row"] = None
+                try:
+                    dialer_ctl._set_working_row(None)
+                    dialer_ctl.repaint_all_rows()
+                except Exception:
+                    pass
+            elif moved and name == "customers":
+                context["_cust_last_row"] = None
+            continue
+
         # ---- Update button ----
         if event == "-UPDATE-":
             try:
@@ -830,11 +1379,52 @@ def run_event_loop(window, context):
             except Exception:
                 pass
 
+        # Outlook jobs: queued on the worker thread, progress comes back as OUTLOOK_EVENT
+        if event == OUTLOOK_EVENT:
+            _handle_outlook_event(window, context, values.get(OUTLOOK_EVENT) or {})
+            continue
+
+        if event == "-FIRE-":
+            if not require_pywin32():
+                window["-STATUS-"].update("pywin32 missing (Outlook COM). Install pywin32.")
+                continue
+            _save_leads(sheet)
+            rows = _new_lead_rows()
+            if rows:
+                tpls, subs, mp = load_templates_ini()
+                worker.submit("draft", draft_many_job, rows, load_state_set(), tpls, subs, mp)
+                _refresh_fire_state(window, busy=True)
+            continue
+
+        if event == "-SYNC-":
+            if not require_pywin32():
+                window["-RS_STATUS-"].update("pywin32 missing (Outlook COM). Install pywin32.")
+                continue
+            try:
+                days = int((values.get("-LOOKBACK-", "") or "60").strip())
+            except Exception:
+                days = 60
+            worker.submit("sync", sync_results_job, days)
+            continue
+
+        if event in ("-FIRE_CANCEL-", "-SYNC_CANCEL-"):
+            worker.cancel()
+            continue
+
+        if event == "-LEADS_IMPORT-":
+            path = sg.popup_get_file("Lead list to import (CSV / TSV):", title="Import Leads",
+                                     file_types=(("Lead lists", "*.csv *.tsv *.txt"), ("All files", "*.*")),
+                                     keep_on_top=True)
+            if path:
+                _start_leads_import(window, context, worker, sheet, path)
+            continue
+
         # Leads tab
         if event == "-SAVECSV-":
             try:
                 _save_leads(sheet)
                 _trigger_analytics_refresh(window)
+                _refresh_fire_state(window)
                 window["-STATUS-"].update("Saved CSV")
             except Exception as e:
                 window["-STATUS-"].update(f"Save error: {e}")
@@ -888,9 +1478,15 @@ def run_event_loop(window, context):
                 window["-STATUS-"].update(f"Open folder error: {e}")
 
         elif event == "-LEADS_RELOAD-":
-            new_sheet = _mount_leads(window, context=context)
-            context["sheet"] = new_sheet
-            sheet = new_sheet
+            if _LEADS_IMPORTING:
+                window["-STATUS-"].update("Import running; the grid reloads when it finishes.")
+                continue
+            try:
+                _resync_grid(window, context, "leads", sheet)
+            except Exception:
+                new_sheet = _mount_leads(window, context=context)
+                context["sheet"] = new_sheet
+                sheet = new_sheet
             _trigger_analytics_refresh(window)
 
         # Customers tab
@@ -905,9 +1501,12 @@ def run_event_loop(window, context):
                     pass
 
         elif event == "-CUST_RELOAD-" or event == "-CUSTOMERS_RELOAD-":
-            new_sheet = _mount_customers(window, context=context)
-            context["customer_sheet"] = new_sheet
-            cust_sheet = new_sheet
+            try:
+                _resync_grid(window, context, "customers", cust_sheet)
+            except Exception:
+                new_sheet = _mount_customers(window, context=context)
+                context["customer_sheet"] = new_sheet
+                cust_sheet = new_sheet
             _trigger_analytics_refresh(window)
 
         elif event == "-CUST_EXPORT-":
@@ -942,9 +1541,12 @@ def run_event_loop(window, context):
             try:
                 append_order_row(company, date_s, amount_s)
                 _save_customers(cust_sheet)
-                new_sheet = _mount_customers(window, context=context)
-                context["customer_sheet"] = new_sheet
-                cust_sheet = new_sheet
+                try:
+                    _resync_grid(window, context, "customers", cust_sheet)
+                except Exception:
+                    new_sheet = _mount_customers(window, context=context)
+                    context["customer_sheet"] = new_sheet
+                    cust_sheet = new_sheet
                 _trigger_analytics_refresh(window)
                 sg.popup_ok("Order added and customers updated.", keep_on_top=True)
             except Exception as e:
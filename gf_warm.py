@@ -17,6 +17,7 @@ from gf_store import (
     update_customer_row_fields_by_company,
     append_order_row,
 )
+from gf_watch import subscribe, note_own_write
 
 # Try analytics helpers (safe fallbacks if not present)
 try:
@@ -51,24 +52,34 @@ except Exception as _e:
     _TKSHEET_OK = False
     print(f"[gf_warm] tksheet import failed: {_e}")
 
-# ---- keep ONLY width persistence helpers from sheet utils ----
+# ---- width persistence + diff sync helpers from sheet utils ----
 try:
     from gf_sheet_utils import (
         load_column_widths,
         apply_column_widths,
         attach_column_width_persistence,
+        sync_sheet_rows,
+        append_sheet_row,
     )
 except Exception:
     def load_column_widths(*_a, **_k): return []
     def apply_column_widths(*_a, **_k): pass
     def attach_column_width_persistence(*_a, **_k): pass
+    def sync_sheet_rows(sheet_obj, rows, ncols, min_rows=0):
+        rows = [list(r) for r in rows]
+        rows += [[""] * ncols for _ in range(max(0, min_rows - len(rows)))]
+        sheet_obj.set_sheet_data(rows)
+        sheet_obj.refresh()
+    def append_sheet_row(sheet_obj, row, ncols):
+        data = sheet_obj.get_sheet_data() or []
+        data.append(list(row))
+        sheet_obj.set_sheet_data(data)
+        sheet_obj.refresh()
 
 _WARM_SHEET: Optional["Sheet"] = None
 _WINDOW = None
 
-# ---- watcher for auto-refresh ----
-_LAST_WARM_MTIME: Optional[float] = None
-_WATCH_INTERVAL_MS = 1500
+# ---- watcher for auto-refresh (gf_watch) ----
 _WATCH_STARTED = False
 
 # ---- UI padding so you always have working room ----
@@ -85,50 +96,13 @@ def _pad_matrix_rows(matrix: List[List[str]], min_rows: int = MIN_WARM_ROWS) ->
     return matrix
 
 
-def _prime_warm_mtime():
-    global _LAST_WARM_MTIME
-    try:
-        _LAST_WARM_MTIME = WARM_LEADS_PATH.stat().st_mtime
-    except Exception:
-        _LAST_WARM_MTIME = None
-
-
-def _warm_csv_changed() -> bool:
-    global _LAST_WARM_MTIME
-    try:
-        mt = WARM_LEADS_PATH.stat().st_mtime
-    except Exception:
-        return False
-    if _LAST_WARM_MTIME is None:
-        _LAST_WARM_MTIME = mt
-        return False
-    if mt != _LAST_WARM_MTIME:
-        _LAST_WARM_MTIME = mt
-        return True
-    return False
-
-
 def _start_warm_file_watch(window):
+    """Reload the grid when warm_leads.csv is changed outside the app (own writes are tagged)."""
     global _WATCH_STARTED
     if _WATCH_STARTED:
         return
     _WATCH_STARTED = True
-    _prime_warm_mtime()
-
-    def _tick():
-        try:
-            if _warm_csv_changed():
-                reload_warm_sheet(window)
-        finally:
-            try:
-                window.TKroot.after(_WATCH_INTERVAL_MS, _tick)
-            except Exception:
-                pass
-
-    try:
-        window.TKroot.after(_WATCH_INTERVAL_MS, _tick)
-    except Exception:
-        pass
+    subscribe(window, [WARM_LEADS_PATH], lambda _changed: reload_warm_sheet(window))
 
 
 # ---------------------------
@@ -169,7 +143,8 @@ def save_warm_leads_matrix_v2(matrix: List[List[str]]) -> None:
             r = (list(row) + [""] * len(WARM_V2_FIELDS))[:len(WARM_V2_FIELDS)]
             w.writerow(r)
     tmp.replace(WARM_LEADS_PATH)
-    _refresh_sheet_from_file_if_mounted()
+    note_own_write(WARM_LEADS_PATH)
+    _refresh_sheet_from_file_if_mounted(matrix)
 
 
 # ---------------------------
@@ -201,13 +176,11 @@ def add_warm_lead_from_dialer(row_dict: Dict[str, str], call1_note: str, ts: Opt
     ordered = [base.get(h, "") for h in WARM_V2_FIELDS]
     with WARM_LEADS_PATH.open("a", encoding="utf-8", newline="") as f:
         csv.writer(f).writerow(ordered)
+    note_own_write(WARM_LEADS_PATH)  # the sheet is updated below; no watcher reload
 
     if _WARM_SHEET is not None:
         try:
-            data = _WARM_SHEET.get_sheet_data() or []
-            data.append(ordered)
-            _WARM_SHEET.set_sheet_data(_pad_matrix_rows(data))
-            _WARM_SHEET.refresh()
+            append_sheet_row(_WARM_SHEET, ordered, len(WARM_V2_FIELDS))
         except Exception:
             pass
 
@@ -917,28 +890,13 @@ def mount_warm_grid(window, start_rows=100, col_width=130):
 
 
 def reload_warm_sheet(window):
-    """Hard reload from file into the mounted sheet (keeps persistence in place)."""
+    """Reload from file into the mounted sheet (diff-applied: only changed rows are touched)."""
     global _WARM_SHEET, _WINDOW, _CTL
     _WINDOW = window
     if _WARM_SHEET is None:
         return mount_warm_grid(window)
     try:
-        try:
-            xv = _WARM_SHEET.MT.xview(); yv = _WARM_SHEET.MT.yview()
-        except Exception:
-            xv = yv = None
-
-        matrix = load_warm_leads_matrix_v2()
-        matrix = _pad_matrix_rows(matrix, min_rows=MIN_WARM_ROWS)
-
-        _WARM_SHEET.set_sheet_data(matrix)
-        _WARM_SHEET.refresh()
-
-        try:
-            if xv: _WARM_SHEET.MT.xview_moveto(xv[0])
-            if yv: _WARM_SHEET.MT.yview_moveto(yv[0])
-        except Exception:
-            pass
+        sync_sheet_rows(_WARM_SHEET, load_warm_leads_matrix_v2(), len(WARM_V2_FIELDS), min_rows=MIN_WARM_ROWS)
     except Exception:
         pass
     try:
@@ -949,27 +907,15 @@ def reload_warm_sheet(window):
     return _WARM_SHEET
 
 
-def _refresh_sheet_from_file_if_mounted():
+def _refresh_sheet_from_file_if_mounted(matrix: Optional[List[List[str]]] = None):
+    """Bring the mounted sheet in line with the file (or with `matrix` that was just written)."""
     global _WARM_SHEET, _CTL
     if _WARM_SHEET is None:
         return
     try:
-        try:
-            xv = _WARM_SHEET.MT.xview(); yv = _WARM_SHEET.MT.yview()
-        except Exception:
-            xv = yv = None
-
-        matrix = load_warm_leads_matrix_v2()
-        matrix = _pad_matrix_rows(matrix, min_rows=MIN_WARM_ROWS)
-
-        _WARM_SHEET.set_sheet_data(matrix)
-        _WARM_SHEET.refresh()
-
-        try:
-            if xv: _WARM_SHEET.MT.xview_moveto(xv[0])
-            if yv: _WARM_SHEET.MT.yview_moveto(yv[0])
-        except Exception:
-            pass
+        if matrix is None:
+            matrix = load_warm_leads_matrix_v2()
+        sync_sheet_rows(_WARM_SHEET, matrix, len(WARM_V2_FIELDS), min_rows=MIN_WARM_ROWS)
     except Exception:
         pass
     try:
@@ -0,0 +1,239 @@
+# gf_watch.py
+# One change-notification service for every file watcher in the app (analytics panels,
+# customers analytics, warm grid auto-reload).
+# - Backend: inotify (Linux, via ctypes; watches the parent folders so atomic
+#   tmp+replace writes are seen) or, anywhere else, ONE coalesced stat loop over the
+#   union of subscribed files -- each file is stat'ed once per tick no matter how many
+#   modules subscribed to it
+# - Debounced: a burst of writes to a file yields one event, DEBOUNCE_MS after the last one
+# - Own writes: gf_store calls note_own_write(path) after it writes a file; a change whose
+#   (mtime, size) matches is delivered only to subscribers with include_own=True
+#   (metrics refresh), not to reload-the-grid subscribers
+# - Callbacks always run on the Tk thread (window.TKroot.after)
+#
+# Usage:
+#   subscribe(window, [WARM_LEADS_PATH], lambda changed: reload_warm_sheet(window))
+#   note_own_write(path)          # right after the app rewrote / appended to `path`
+#
+# Pure stdlib, no app imports.
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import itertools
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+DEBOUNCE_MS = 300
+STAT_POLL_MS = 1000        # fallback backend: one stat pass per tick
+DISPATCH_MS = 200          # inotify backend: how often queued events are delivered
+
+Sig = Optional[Tuple[int, int]]
+
+
+def _sig(path: Path) -> Sig:
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except Exception:
+        return None
+
+
+# ----------------------------
+# inotify (Linux) backend
+# ----------------------------
+_IN_MODIFY, _IN_CLOSE_WRITE, _IN_MOVED_FROM, _IN_MOVED_TO = 0x2, 0x8, 0x40, 0x80
+_IN_CREATE, _IN_DELETE = 0x100, 0x200
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HDR = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Folder watches; the reader thread reports changed paths through on_change(path)."""
+
+    def __init__(self, on_change: Callable[[Path], None]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        self._on_change = on_change
+        threading.Thread(target=self._read_loop, name="gf-watch", daemon=True).start()
+
+    def add_dir(self, folder: Path) -> bool:
+        if folder in self._dirs.values():
+            return True
+        wd = self._add(self.fd, os.fsencode(str(folder)), _IN_MASK)
+        if wd < 0:
+            return False
+        self._dirs[wd] = folder
+        return True
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except OSError:
+                return
+            pos = 0
+            while pos + _EVENT_HDR.size <= len(buf):
+                wd, _mask, _cookie, ln = _EVENT_HDR.unpack_from(buf, pos)
+                name = buf[pos + _EVENT_HDR.size: pos + _EVENT_HDR.size + ln].rstrip(b"\0")
+                pos += _EVENT_HDR.size + ln
+                folder = self._dirs.get(wd)
+                if folder is not None and name:
+                    self._on_change(folder / os.fsdecode(name))
+
+
+# ----------------------------
+# Service
+# ----------------------------
+class FileWatcher:
+    def __init__(self):
+        self._tk = None
+        self._subs: Dict[int, Tuple[Set[Path], Callable[[Set[Path]], None], bool]] = {}
+        self._ids = itertools.count(1)
+        self._sigs: Dict[Path, Sig] = {}          # last delivered signature per file
+        self._own: Dict[Path, Sig] = {}           # signature right after our own last write
+        self._pending: Dict[Path, float] = {}     # path -> monotonic time of the latest change
+        self._lock = threading.Lock()
+        self._inotify: Optional[_Inotify] = None
+        self._polling = False
+        self.backend = "stat"
+
+    # ---- public ----
+    def start(self, tk_root) -> "FileWatcher":
+        if self._tk is not None:
+            return self
+        self._tk = tk_root
+        if sys.platform.startswith("linux") and not os.environ.get("GF_WATCH_POLL"):
+            try:
+                self._inotify = _Inotify(self._on_event)
+                self.backend = "inotify"
+            except Exception:
+                self._inotify = None
+        for path in self._watched():
+            self._watch_dir(path)
+        self._schedule()
+        return self
+
+    def subscribe(self, paths: Iterable[Path], callback: Callable[[Set[Path]], None],
+                  include_own: bool = False) -> int:
+        """callback(changed_paths) once per debounced change; returns a token for unsubscribe()."""
+        paths = {Path(p) for p in paths}
+        token = next(self._ids)
+        with self._lock:
+            for p in paths:
+                self._sigs.setdefault(p, _sig(p))
+            self._subs[token] = (paths, callback, include_own)
+        if self._tk is not None:
+            for p in paths:
+                self._watch_dir(p)
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subs.pop(token, None)
+
+    def note_own_write(self, path: Path) -> None:
+        path = Path(path)
+        with self._lock:
+            self._own[path] = _sig(path)
+
+    # ---- internals ----
+    def _watched(self) -> Set[Path]:
+        with self._lock:
+            return set().union(*(s[0] for s in self._subs.values())) if self._subs else set()
+
+    def _watch_dir(self, path: Path) -> None:
+        if self._inotify is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not self._inotify.add_dir(path.parent):
+                raise OSError("inotify_add_watch failed")
+        except Exception:
+            self._inotify = None        # fall back to polling everything
+            self.backend = "stat"
+
+    def _on_event(self, path: Path) -> None:
+        with self._lock:
+            if path in self._sigs:
+                self._pending[path] = time.monotonic()
+
+    def _schedule(self) -> None:
+        try:
+            self._tk.after(DISPATCH_MS if self._inotify is not None else STAT_POLL_MS, self._tick)
+        except Exception:
+            pass
+
+    def _tick(self) -> None:
+        try:
+            now = time.monotonic()
+            if self._inotify is None:
+                # Coalesced stat loop: one stat per watched file per tick
+                for p in self._watched():
+                    if _sig(p) != self._sigs.get(p):
+                        with self._lock:
+                            self._pending.setdefault(p, now)
+            self._dispatch(now)
+        finally:
+            self._schedule()
+
+    def _dispatch(self, now: float) -> None:
+        ready: Dict[Path, bool] = {}   # path -> change came from our own write
+        with self._lock:
+            for p, t in list(self._pending.items()):
+                if (now - t) * 1000.0 < DEBOUNCE_MS:
+                    continue
+                del self._pending[p]
+                sig = _sig(p)
+                if sig == self._sigs.get(p):
+                    continue
+                self._sigs[p] = sig
+                ready[p] = sig is not None and sig == self._own.get(p)
+            subs = list(self._subs.values())
+        if not ready:
+            return
+        for paths, callback, include_own in subs:
+            hit = {p for p, own in ready.items() if p in paths and (include_own or not own)}
+            if hit:
+                try:
+                    callback(hit)
+                except Exception:
+                    pass
+
+
+_WATCHER = FileWatcher()
+
+
+def subscribe(window, paths: Iterable[Path], callback: Callable[[Set[Path]], None],
+              include_own: bool = False) -> int:
+    """Subscribe to changes of `paths` (starts the shared watcher on the window's Tk root)."""
+    token = _WATCHER.subscribe(paths, callback, include_own)
+    try:
+        _WATCHER.start(window.TKroot)
+    except Exception:
+        pass
+    return token
+
+
+def unsubscribe(token: int) -> None:
+    _WATCHER.unsubscribe(token)
+
+
+def note_own_write(path: Path) -> None:
+    """Tag the current content of `path` as written by the app (no reload for it)."""
+    _WATCHER.note_own_write(path)
+
+
+def backend() -> str:
+    return _WATCHER.backend
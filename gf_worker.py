@@ -0,0 +1,292 @@
+# gf_worker.py
+# Background worker for Outlook COM jobs (draft batches, results sync, due campaign
+# follow-ups) and other long file jobs (bulk lead import, state.txt migration).
+# - One daemon thread with its own COM apartment (pythoncom.CoInitialize / CoUninitialize)
+# - FIFO job queue, one job at a time (Outlook's object model is single-threaded anyway)
+# - Progress / completion posted back to the UI with window.write_event_value(OUTLOOK_EVENT, payload)
+# - Cooperative cancellation: every job gets a JobContext and polls ctx.cancelled()
+#
+# Headless use (scripts / tests): pass post=callable instead of a window, and put a fake
+# object in sys.modules["win32com.client"] -- see _selftest() at the bottom
+# (python gf_worker.py).
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from gf_outlook import com_stats, drop_session
+
+OUTLOOK_EVENT = "-OUTLOOK_JOB-"   # window event key; value is the payload dict below
+#   {"job": int, "name": str, "state": "queued"|"running"|"progress"|"done"|"error"|"cancelled",
+#    "done": int, "total": int, "rate": float, "message": str, "result": Any, "error": str}
+
+
+class JobCancelled(Exception):
+    """Raised by JobContext.check() when the job was cancelled."""
+
+
+class JobContext:
+    def __init__(self, worker: "OutlookWorker", job_id: int, name: str):
+        self.worker = worker
+        self.job_id = job_id
+        self.name = name
+        self._cancel = threading.Event()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set() or self.worker._stopping.is_set()
+
+    def check(self) -> None:
+        if self.cancelled():
+            raise JobCancelled()
+
+    def progress(self, done: int, total: Optional[int] = None, rate: Optional[float] = None, message: str = "") -> None:
+        self.worker._post(self.job_id, self.name, "progress", done=done, total=total, rate=rate, message=message)
+
+
+def _default_com_init():
+    try:
+        import pythoncom  # pywin32
+    except Exception:
+        return None, None
+    return pythoncom.CoInitialize, pythoncom.CoUninitialize
+
+
+class OutlookWorker:
+    """
+    worker = OutlookWorker(window).start()
+    job_id = worker.submit("draft", draft_many_job, rows, seen, tpls, subs, mp)
+    worker.cancel()      # current + queued jobs
+    worker.stop()        # on exit
+    """
+    def __init__(self, window=None, *, post: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 com_init: Optional[tuple] = None):
+        self.window = window
+        self._post_fn = post
+        self._com = com_init if com_init is not None else _default_com_init()
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._current: Optional[JobContext] = None
+        self._queued: Dict[int, JobContext] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- lifecycle ----
+    def start(self) -> "OutlookWorker":
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="gf-outlook-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stopping.set()
+        self._jobs.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ---- jobs ----
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> int:
+        """Queue fn(ctx, *args, **kwargs); returns the job id."""
+        job_id = next(self._ids)
+        ctx = JobContext(self, job_id, name)
+        with self._lock:
+            self._queued[job_id] = ctx
+        self._jobs.put((ctx, fn, args, kwargs))
+        self._post(job_id, name, "queued")
+        return job_id
+
+    def cancel(self, job_id: Optional[int] = None) -> None:
+        """Cancel one job, or (job_id=None) the running job and everything queued."""
+        with self._lock:
+            targets = list(self._queued.values())
+            if self._current is not None:
+                targets.append(self._current)
+        for ctx in targets:
+            if job_id is None or ctx.job_id == job_id:
+                ctx._cancel.set()
+
+    def busy(self) -> bool:
+        with self._lock:
+            return self._current is not None or bool(self._queued)
+
+    # ---- internals ----
+    def _post(self, job_id: int, name: str, state: str, **extra) -> None:
+        payload = {"job": job_id, "name": name, "state": state}
+        payload.update({k: v for k, v in extra.items() if v is not None})
+        try:
+            if self._post_fn is not None:
+                self._post_fn(OUTLOOK_EVENT, payload)
+            elif self.window is not None:
+                self.window.write_event_value(OUTLOOK_EVENT, payload)
+        except Exception:
+            pass
+
+    def _run(self) -> None:
+        init, uninit = self._com
+        if init:
+            try:
+                init()
+            except Exception:
+                init = uninit = None
+        try:
+            while True:
+                item = self._jobs.get()
+                if item is None:
+                    break
+                ctx, fn, args, kwargs = item
+                with self._lock:
+                    self._queued.pop(ctx.job_id, None)
+                    self._current = ctx
+                try:
+                    if ctx.cancelled():
+                        raise JobCancelled()
+                    self._post(ctx.job_id, ctx.name, "running")
+                    t0 = time.perf_counter()
+                    result = fn(ctx, *args, **kwargs)
+                    state = "cancelled" if ctx.cancelled() else "done"
+                    self._post(ctx.job_id, ctx.name, state, result=result,
+                               message=f"{time.perf_counter() - t0:.1f}s")
+                except JobCancelled:
+                    self._post(ctx.job_id, ctx.name, "cancelled")
+                except Exception as e:
+                    self._post(ctx.job_id, ctx.name, "error", error=str(e))
+                finally:
+                    with self._lock:
+                        self._current = None
+        finally:
+            drop_session()  # cached COM handles belong to this thread's apartment
+            if uninit:
+                try:
+                    uninit()
+                except Exception:
+                    pass
+
+
+# ----------------------------
+# Job adapters for the Outlook helpers
+# ----------------------------
+def draft_many_job(ctx: JobContext, rows_matrix, seen_set, templates, subjects, mapping):
+    from gf_helpers import outlook_draft_many
+    return outlook_draft_many(rows_matrix, seen_set, templates, subjects, mapping,
+                              progress=lambda done, total, rate: ctx.progress(done, total, rate),
+                              cancel=ctx.cancelled)
+
+
+def sync_results_job(ctx: JobContext, lookback_days: int = 60):
+    from gf_helpers import outlook_sync_results
+    return outlook_sync_results(lookback_days,
+                                progress=lambda done, total: ctx.progress(done, total),
+                                cancel=ctx.cancelled)
+
+
+def import_leads_job(ctx: JobContext, path):
+    from gf_import import import_leads_file
+    return import_leads_file(path,
+                             progress=lambda st: ctx.progress(st["bytes"], st["total_bytes"],
+                                                              message=f"{st['read']} read, {st['imported']} imported"),
+                             cancel=ctx.cancelled)
+
+
+def migrate_seen_job(ctx: JobContext):
+    from gf_store import SEEN
+    return SEEN.migrate(progress=lambda done, total: ctx.progress(done, total))
+
+
+def campaign_queue_job(ctx: JobContext):
+    from gf_schedule import run_due
+    ctx.check()
+    return run_due(cancel=ctx.cancelled)
+
+
+# ----------------------------
+# Headless self-check with a fake Outlook
+# ----------------------------
+def _selftest() -> None:
+    import os
+    import sys
+    import tempfile
+    import types
+
+    os.environ["APPDATA"] = tempfile.mkdtemp(prefix="gf_worker_")  # keep real data untouched
+
+    class _Obj:
+        def __init__(self, **kw):
+            self.__dict__.update(kw)
+
+    made = []
+    outlook = {"alive": None, "dispatches": 0}   # the running fake Outlook (one per Dispatch)
+
+    def _check(inst):
+        if outlook["alive"] is not inst:
+            raise OSError("The RPC server is unavailable.")
+
+    class _Items:
+        def __init__(self, inst):
+            self.inst = inst
+
+        def Add(self, _kind):
+            _check(self.inst)
+            m = _Obj()
+            m.Save = lambda: (_check(self.inst), time.sleep(0.001))
+            m.Move = lambda _f: (_check(self.inst), made.append(m))
+            return m
+
+    class _Folders(list):
+        Count = property(len)
+
+        def Item(self, i):
+            return self[i - 1]
+
+        def Add(self, name):
+            f = _Obj(Name=name)
+            self.append(f)
+            return f
+
+    def _dispatch(_name):
+        inst = object()
+        outlook["alive"] = inst
+        outlook["dispatches"] += 1
+        drafts = _Obj(Items=_Items(inst), Folders=_Folders())
+        ns = _Obj(DefaultStore=_Obj(GetDefaultFolder=lambda _n: drafts),
+                  Accounts=_Obj(Count=0), Stores=_Obj(Count=0))
+        return _Obj(GetNamespace=lambda _n: ns)
+
+    client = types.ModuleType("win32com.client")
+    client.Dispatch = _dispatch
+    pkg = types.ModuleType("win32com")
+    pkg.client = client
+    sys.modules["win32com"], sys.modules["win32com.client"] = pkg, client
+
+    from gf_store import HEADER_FIELDS
+    events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    worker = OutlookWorker(post=lambda _key, payload: events.put(payload), com_init=(None, None)).start()
+
+    def _draft_batch(first, n):
+        rows = []
+        for i in range(first, first + n):
+            d = {"Email": f"lead{i}@example.com", "First Name": "Pat", "Company": f"Co {i}", "Industry": "Retail"}
+            rows.append([d.get(h, "") for h in HEADER_FIELDS])
+        job = worker.submit("draft", draft_many_job, rows, set(), {"default": "Hi {First Name}"}, {"default": "Hello"}, {})
+        while True:
+            ev = events.get(timeout=30)
+            print(ev)
+            if ev["job"] == job and ev["state"] in ("done", "error", "cancelled"):
+                return ev
+
+    _draft_batch(0, 300)
+    outlook["alive"] = None          # Outlook restarted: every cached handle is now stale
+    ev = _draft_batch(300, 50)
+    worker.stop()
+    print("drafts created:", len(made), "dispatches:", outlook["dispatches"])
+    assert ev["state"] == "done" and len(made) == 350 and outlook["dispatches"] == 2, "no reconnect after restart"
+    for op, st in sorted(com_stats().items()):
+        print(f"  {op:<18} {st}")
+
+
+if __name__ == "__main__":
+    _selftest()